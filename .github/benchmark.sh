@@ -0,0 +1,13 @@
+#!/bin/dash
+
+pip install -e /openedx/requirements/eol_progress_tab
+
+cd /openedx/requirements/eol_progress_tab
+cp /openedx/edx-platform/setup.cfg .
+mkdir -p test_root
+cd test_root/
+ln -sf /openedx/staticfiles .
+
+cd /openedx/requirements/eol_progress_tab
+
+EOL_PROGRESS_TAB_BENCHMARK=1 DJANGO_SETTINGS_MODULE=lms.envs.test EDXAPP_TEST_MONGO_HOST=mongodb pytest -s benchmarks/test_progress_tab_benchmark.py
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+    Micro-benchmark: student_data serialization (bson json_util vs eol_progress_tab.serializers)
+
+    Run inside the LMS container (see .github/):
+        > DJANGO_SETTINGS_MODULE=lms.envs.test python /openedx/requirements/eol_progress_tab/benchmarks/bench_serialization.py [--subsections 500] [--problems 20]
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import timeit
+
+import django
+django.setup()
+
+import numpy
+from bson import json_util
+
+from eol_progress_tab import serializers
+
+
+def build_payload(subsections, problems):
+    """
+        student_data payload of a large course (numpy floats from around())
+    """
+    categories = ['Homework', 'Lab', 'Midterm Exam', 'Final Exam']
+    return {
+        'username'              : 'student',
+        'final_grade_percent'   : 0.71,
+        'final_grade_scaled'    : 5.3,
+        'passed'                : True,
+        'certificate_data'      : {},
+        'category_grades'       : [
+            {
+                'grade_percent' : 0.7,
+                'grade_scaled'  : 4.8,
+                'category'      : category,
+                'weight'        : 0.25,
+                'drop_count'    : 1,
+                'min_count'     : 2,
+                'detail'        : [
+                    {
+                        'subsection_display_name'   : 'Subsection {}'.format(i),
+                        'url'                       : '/courses/course-v1:eol+bench+2021/jump_to/block-v1:eol+bench+2021+type@sequential+block@{}'.format(i),
+                        'total_earned'              : 7.,
+                        'total_possible'            : 10.,
+                        'total_percent'             : numpy.around(7. / 10., decimals=2),
+                        'due'                       : '2021-01-11T00:00:00+0000',
+                        'attempted'                 : True,
+                        'show_problem_scores'       : True,
+                        'problem_scores'            : [{'earned': 1., 'possible': 1.} for __ in range(problems)],
+                    }
+                    for i in range(subsections // len(categories))
+                ]
+            }
+            for category in categories
+        ]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--subsections', type=int, default=500)
+    parser.add_argument('--problems', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    payload = build_payload(args.subsections, args.problems)
+    candidates = [
+        ('json + bson json_util', lambda: json.dumps(payload, default=json_util.default)),
+    ]
+    size = len(serializers.dumps(payload, fast=False))
+    candidates.append(('serializers.dumps (json)', lambda: serializers.dumps(payload, fast=False)))
+    if serializers.orjson is not None:
+        candidates.append(('serializers.dumps (orjson)', lambda: serializers.dumps(payload, fast=True)))
+
+    print('payload: {} subsections x {} problems, {} bytes'.format(args.subsections, args.problems, size))
+    for name, func in candidates:
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print('{:<30} {:>10.2f} ms'.format(name, best * 1000.))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+    Progress tab endpoints benchmark on synthetic courses.
+
+    Records wall time, SQL queries and Mongo calls per endpoint and course size and
+    writes them as json (EOL_PROGRESS_TAB_BENCHMARK_OUTPUT, default: bench_output.json).
+    Only runs when EOL_PROGRESS_TAB_BENCHMARK is set (see .github/benchmark.sh).
+
+    Course sizes: EOL_PROGRESS_TAB_BENCHMARK_SIZES="<graded subsections>x<problems>,..."
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from unittest import skipUnless
+
+from mock import patch
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from util.testing import UrlResetMixin
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+from capa.tests.response_xml_factory import StringResponseXMLFactory
+from student.tests.factories import UserFactory, CourseEnrollmentFactory
+
+from lms.djangoapps.grades.course_grade_factory import CourseGradeFactory
+
+from eol_progress_tab import cache, grades
+from eol_progress_tab.structure import get_course_structure
+
+import json
+import os
+import platform
+import pymongo
+import time
+
+BENCHMARK_ENABLED = bool(os.environ.get('EOL_PROGRESS_TAB_BENCHMARK'))
+DEFAULT_SIZES = '10x1,50x5,100x10,500x50'
+FORMATS = ['Homework', 'Lab', 'Quiz', 'Control', 'Midterm Exam', 'Final Exam']
+REPEAT = int(os.environ.get('EOL_PROGRESS_TAB_BENCHMARK_REPEAT', 5))
+
+
+def _parse_sizes(sizes):
+    return [tuple(int(value) for value in size.split('x')) for size in sizes.split(',') if size]
+
+
+@contextmanager
+def count_mongo_calls():
+    """
+        Count pymongo find/getMore messages (same approach as xmodule check_mongo_calls)
+    """
+    counter = {'calls': 0}
+    patches = [
+        patch.object(pymongo.message, name, wraps=getattr(pymongo.message, name))
+        for name in ('query', 'get_more')
+    ]
+    mocks = [patcher.start() for patcher in patches]
+    try:
+        yield counter
+    finally:
+        counter['calls'] = sum(mock.call_count for mock in mocks)
+        for patcher in patches:
+            patcher.stop()
+
+
+@skipUnless(BENCHMARK_ENABLED, 'Set EOL_PROGRESS_TAB_BENCHMARK=1 to run the benchmark')
+class ProgressTabBenchmark(UrlResetMixin, ModuleStoreTestCase):
+
+    def setUp(self):
+        super(ProgressTabBenchmark, self).setUp()
+        with patch('student.models.cc.User.save'):
+            self.student = UserFactory(username='student', password='test', email='student@edx.org')
+        self.client = Client()
+        self.assertTrue(self.client.login(username='student', password='test'))
+
+    def _create_course(self, subsections, problems):
+        """
+            Course with graded subsections distributed over many formats
+        """
+        course = CourseFactory.create(
+            org='eol', course='bench{}x{}'.format(subsections, problems), display_name='benchmark',
+            grading_policy={
+                'GRADER': [
+                    {'type': fmt, 'min_count': 1, 'drop_count': 0, 'short_label': fmt[:2], 'weight': 1. / len(FORMATS)}
+                    for fmt in FORMATS
+                ],
+                'GRADE_CUTOFFS': {'Pass': .6},
+            }
+        )
+        with self.store.bulk_operations(course.id, emit_signals=False):
+            chapter = ItemFactory.create(parent_location=course.location, category='chapter')
+            for i in range(subsections):
+                section = ItemFactory.create(
+                    parent_location=chapter.location,
+                    category='sequential',
+                    metadata={'graded': True, 'format': FORMATS[i % len(FORMATS)]}
+                )
+                for __ in range(problems):
+                    ItemFactory.create(
+                        parent_location=section.location,
+                        category='problem',
+                        data=StringResponseXMLFactory().build_xml(answer='foo'),
+                    )
+        CourseEnrollmentFactory(user=self.student, course_id=course.id)
+        return self.store.get_course(course.id)
+
+    def _measure(self, func):
+        """
+            Best wall time (ms), SQL queries and Mongo calls of func
+        """
+        results = []
+        for __ in range(REPEAT):
+            with CaptureQueriesContext(connection) as queries, count_mongo_calls() as mongo_calls:
+                start = time.time()
+                func()
+                elapsed = time.time() - start
+            results.append((elapsed * 1000., len(queries), mongo_calls['calls']))
+        best = min(results)
+        return OrderedDict([('wall_time_ms', round(best[0], 2)), ('queries', best[1]), ('mongo_calls', best[2])])
+
+    def _endpoints(self, course):
+        course_info_url = reverse('eol_progress_tab_course_info', kwargs={'course_id': course.id})
+        student_data_url = reverse('eol_progress_tab_student_data', kwargs={'course_id': course.id, 'user_id': self.student.id})
+        course_grade = CourseGradeFactory().read(self.student, course)
+
+        def student_data_cold():
+            cache.get_cache().clear()
+            self._get(student_data_url)
+
+        return OrderedDict([
+            ('course_info', lambda: self._get(course_info_url)),
+            ('student_data_cold', student_data_cold),
+            ('student_data_cached', lambda: self._get(student_data_url)),
+            ('category_scores_detail', lambda: grades.get_category_scores_detail(
+                course_grade, course.id, get_course_structure(course)
+            )),
+        ])
+
+    def _get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    @patch('eol_progress_tab.views._has_page_access', return_value=True)
+    def test_benchmark(self, _has_page_access):
+        results = []
+        for subsections, problems in _parse_sizes(os.environ.get('EOL_PROGRESS_TAB_BENCHMARK_SIZES', DEFAULT_SIZES)):
+            course = self._create_course(subsections, problems)
+            for endpoint, func in self._endpoints(course).items():
+                result = OrderedDict([('endpoint', endpoint), ('subsections', subsections), ('problems', problems)])
+                result.update(self._measure(func))
+                results.append(result)
+                print(json.dumps(result))
+
+        output = os.environ.get('EOL_PROGRESS_TAB_BENCHMARK_OUTPUT', 'bench_output.json')
+        with open(output, 'w') as output_file:
+            json.dump({
+                'python': platform.python_version(),
+                'repeat': REPEAT,
+                'timestamp': int(time.time()),
+                'results': results,
+            }, output_file, indent=2)
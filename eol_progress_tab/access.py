@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+from collections import Counter
+
+from django.contrib.auth.models import User
+from opaque_keys.edx.keys import CourseKey
+
+from courseware.access import has_access
+from courseware.courses import get_course_with_access
+from courseware.entrance_exams import user_can_skip_entrance_exam
+
+from . import visibility
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Request attribute where access contexts are stored (one per course_id)
+REQUEST_ATTRIBUTE = '_eol_progress_tab_access'
+
+
+class ProgressTabAccess(object):
+    """
+        Request-scoped access context.
+        Loads the course descriptor, staff flag, tab visibility, enrollment and
+        entrance exam checks at most once per request and counts modulestore/DB hits.
+    """
+
+    def __init__(self, user, course_id):
+        self.user = user
+        self.course_id = course_id
+        self.course_key = CourseKey.from_string(course_id)
+        self.counters = Counter()
+        self._courses = {}
+        self._staff = {}
+        self._users = {}
+        self._tab_visible = None
+        self._enrolled = None
+        self._can_skip_entrance_exam = None
+
+    def get_course(self, user=None, check_if_enrolled=False):
+        """
+            Course loaded with 'load' access for user (default: request user)
+        """
+        user = user or self.user
+        key = (user.id, check_if_enrolled)
+        if key not in self._courses:
+            self.counters['modulestore'] += 1
+            self._courses[key] = get_course_with_access(
+                user, "load", self.course_key, check_if_enrolled=check_if_enrolled)
+        return self._courses[key]
+
+    @property
+    def course(self):
+        return self.get_course()
+
+    def get_user(self, user_id):
+        """
+            Request user or the user with user_id (masquerade/staff views)
+        """
+        if user_id == self.user.id:
+            return self.user
+        if user_id not in self._users:
+            self.counters['db'] += 1
+            self._users[user_id] = User.objects.get(pk=user_id)
+        return self._users[user_id]
+
+    def is_staff(self, user=None):
+        """
+            Staff access to the course
+        """
+        user = user or self.user
+        if user.id not in self._staff:
+            self.counters['db'] += 1
+            self._staff[user.id] = bool(has_access(user, 'staff', self.course))
+        return self._staff[user.id]
+
+    @property
+    def tab_visible(self):
+        """
+            Check if eol_progress_tab is displayed in the course tabs (site/course level,
+            request user course access is already checked by get_course)
+        """
+        if self._tab_visible is None:
+            self.counters['tabs'] += 1
+            self._tab_visible = visibility.is_tab_visible(self.course)
+        return self._tab_visible
+
+    @property
+    def is_enrolled(self):
+        """
+            Check if request user has an active enrollment
+        """
+        if self._enrolled is None:
+            self.counters['db'] += 1
+            self._enrolled = User.objects.filter(
+                courseenrollment__course_id=self.course_key,
+                courseenrollment__is_active=1,
+                pk=self.user.id
+            ).exists()
+        return self._enrolled
+
+    @property
+    def can_skip_entrance_exam(self):
+        """
+            Check if request user passed (or doesn't need) the course entrance exam, otherwise
+            get_course_tab_list only shows the courseware tab (per user, not cached in tab_visible)
+        """
+        if self._can_skip_entrance_exam is None:
+            self.counters['db'] += 1
+            self._can_skip_entrance_exam = user_can_skip_entrance_exam(self.user, self.course)
+        return self._can_skip_entrance_exam
+
+    def has_page_access(self):
+        """
+            Check if tab is enabled, user is enrolled and can skip the entrance exam
+            (staff always has access)
+        """
+        if self.is_staff():
+            return True  # Allow page access to staff
+        return self.tab_visible and self.is_enrolled and self.can_skip_entrance_exam
+
+    def log_counters(self, view_name):
+        logger.debug(
+            "EolProgressTab - %s %s counters: %s",
+            view_name, self.course_id, dict(self.counters)
+        )
+
+
+def get_access_context(request, course_id):
+    """
+        Get (or create) the access context of the request for course_id
+    """
+    contexts = getattr(request, REQUEST_ATTRIBUTE, None)
+    if contexts is None:
+        contexts = {}
+        setattr(request, REQUEST_ATTRIBUTE, contexts)
+    if course_id not in contexts:
+        contexts[course_id] = ProgressTabAccess(request.user, course_id)
+    return contexts[course_id]
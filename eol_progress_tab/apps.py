@@ -27,4 +27,33 @@ class EolProgressTabConfig(AppConfig):
     }
 
     def ready(self):
-        pass
+        from . import signals  # pylint: disable=unused-import
+        from .instrumentation import register_mongo_listener
+        register_mongo_listener()
+
+
+class EolProgressTabCmsConfig(AppConfig):
+    """
+        Studio: only the receivers that enqueue LMS tasks (cms_signals)
+    """
+    name = 'eol_progress_tab'
+
+    plugin_app = {
+        PluginSettings.CONFIG: {
+            ProjectType.CMS: {
+                SettingsType.COMMON: {PluginSettings.RELATIVE_PATH: 'settings.common'},
+            },
+        }
+    }
+
+    def ready(self):
+        from django.db.models.signals import post_save
+        from openedx.core.djangoapps.site_configuration.models import SiteConfiguration
+        from xmodule.modulestore.django import SignalHandler
+        from .cms_signals import course_published_handler, site_configuration_saved_handler
+        SignalHandler.course_published.connect(course_published_handler, dispatch_uid='eol_progress_tab.course_published')
+        post_save.connect(
+            site_configuration_saved_handler,
+            sender=SiteConfiguration,
+            dispatch_uid='eol_progress_tab.site_configuration_saved'
+        )
@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+from django.utils.http import quote_etag
+from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
+from six import text_type
+
+import hashlib
+import logging
+import math
+import time
+import uuid
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'eol_progress_tab'
+
+
+def get_cache():
+    """
+        Cache backend used by the progress tab (settings.EOL_PROGRESS_TAB_CACHE_NAME).
+        A dedicated cache alias allows bounding the number of entries (MAX_ENTRIES).
+    """
+    return caches[settings.EOL_PROGRESS_TAB_CACHE_NAME]
+
+
+def get_cache_timeout():
+    """
+        Student data TTL in seconds (0 disables the cache)
+    """
+    return configuration_helpers.get_value('EOL_PROGRESS_TAB_CACHE_TIMEOUT', settings.EOL_PROGRESS_TAB_CACHE_TIMEOUT)
+
+
+def _course_generation_key(course_key):
+    return '{}.generation.{}'.format(KEY_PREFIX, text_type(course_key))
+
+
+# student_data payload variants (full payload, summary without categories detail & compact format)
+STUDENT_DATA_VARIANTS = ('full', 'summary', 'compact')
+
+
+# student_data payload format, increased when the payload changes (older cached payloads and snapshots are stale)
+STUDENT_DATA_VERSION = 4
+
+
+def _student_data_key(course_key, user_id, variant='full'):
+    return '{}.student_data.v{}.{}.{}.{}'.format(KEY_PREFIX, STUDENT_DATA_VERSION, variant, text_type(course_key), user_id)
+
+
+def get_course_generation(course_key):
+    """
+        Course generation, increased every time the course is published
+    """
+    return get_cache().get(_course_generation_key(course_key), 0)
+
+
+def bump_course_generation(course_key):
+    """
+        Invalidate every cached value of the course
+    """
+    _bump_generation(_course_generation_key(course_key))
+
+
+def _site_generation_key(site_id):
+    return '{}.site_generation.{}'.format(KEY_PREFIX, site_id)
+
+
+def get_site_generation(site_id):
+    """
+        Site generation, increased every time the site configuration is saved
+    """
+    return get_cache().get(_site_generation_key(site_id), 0)
+
+
+def bump_site_generation(site_id):
+    """
+        Invalidate every cached value resolved from the site configuration
+    """
+    _bump_generation(_site_generation_key(site_id))
+
+
+def _bump_generation(key):
+    cache = get_cache()
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            # key expired between add and incr
+            cache.set(key, 1, None)
+
+
+def get_course_version(course):
+    """
+        Course content version: published version (split modulestore) and generation
+    """
+    return '{}.{}'.format(
+        getattr(course, 'course_version', None),
+        get_course_generation(course.id)
+    )
+
+
+def get_student_data_version(course):
+    """
+        Version of the student_data payloads of the course: payload format and course content version
+    """
+    return '{}.{}'.format(STUDENT_DATA_VERSION, get_course_version(course))
+
+
+def make_etag(*values):
+    """
+        Strong ETag from values
+    """
+    return quote_etag(hashlib.sha1(':'.join(text_type(value) for value in values).encode('utf-8')).hexdigest())
+
+
+def _course_value_key(course_key, name):
+    return '{}.{}.{}'.format(KEY_PREFIX, name, text_type(course_key))
+
+
+def get_course_value(course, name):
+    """
+        Cached course level value (student independent), None if missing or stale
+    """
+    cached = get_cache().get(_course_value_key(course.id, name))
+    if cached is None:
+        return None
+    version, value = cached
+    if version != get_course_version(course):
+        return None
+    return value
+
+
+def set_course_value(course, name, value, timeout):
+    """
+        Store course level value with the current course content version
+    """
+    get_cache().set(_course_value_key(course.id, name), (get_course_version(course), value), timeout)
+
+
+def get_course_values(course, names):
+    """
+        Cached course level values { name: value } in one request (missing or stale values are not included)
+    """
+    keys = {_course_value_key(course.id, name): name for name in names}
+    version = get_course_version(course)
+    values = {}
+    for key, (cached_version, value) in get_cache().get_many(list(keys)).items():
+        if cached_version == version:
+            values[keys[key]] = value
+    return values
+
+
+def set_course_values(course, values, timeout):
+    """
+        Store course level values { name: value } with the current course content version
+    """
+    version = get_course_version(course)
+    get_cache().set_many(
+        {_course_value_key(course.id, name): (version, value) for name, value in values.items()},
+        timeout
+    )
+
+
+def _site_value_key(site_id, name):
+    return '{}.{}.site.{}'.format(KEY_PREFIX, name, site_id)
+
+
+def get_site_value(site_id, name):
+    """
+        Cached site level value, None if missing or stale (site configuration changed)
+    """
+    keys = [_site_generation_key(site_id), _site_value_key(site_id, name)]
+    values = get_cache().get_many(keys)
+    cached = values.get(keys[1])
+    if cached is None:
+        return None
+    generation, value = cached
+    if generation != values.get(keys[0], 0):
+        return None
+    return value
+
+
+def set_site_value(site_id, name, value, timeout):
+    """
+        Store site level value with the current site generation
+    """
+    get_cache().set(_site_value_key(site_id, name), (get_site_generation(site_id), value), timeout)
+
+
+def get_student_data(course, user_id, variant='full'):
+    """
+        Cached student_data json payload, None if missing or stale
+    """
+    return get_student_data_entry(course, user_id, variant)[0]
+
+
+def get_student_data_entry(course, user_id, variant='full', etag=None):
+    """
+        (cached student_data json payload, expires), (None, None) if missing or stale.
+        expires: next problem scores visibility change (None if there is no pending change)
+        etag: current student_data ETag, payloads computed for another ETag (or stored without it) are stale
+    """
+    if not get_cache_timeout():
+        return None, None
+    cached = get_cache().get(_student_data_key(course.id, user_id, variant))
+    if cached is None:
+        return None, None
+    version, data, expires, cached_etag = cached
+    if version != get_course_version(course) or (expires is not None and timezone.now() > expires):
+        return None, None
+    if etag is not None and cached_etag != etag:
+        return None, None
+    return data, expires
+
+
+def set_student_data(course, user_id, data, variant='full', expires=None, etag=None):
+    """
+        Store student_data json payload (skipped when bigger than EOL_PROGRESS_TAB_CACHE_MAX_SIZE)
+        until expires (problem scores visibility change). etag: student_data ETag the payload was computed for
+    """
+    timeout = get_cache_timeout()
+    if not timeout:
+        return
+    if len(data) > settings.EOL_PROGRESS_TAB_CACHE_MAX_SIZE:
+        logger.info(
+            "EolProgressTab - student_data not cached, payload too big: %s bytes (user: %s, course: %s)",
+            len(data), user_id, text_type(course.id)
+        )
+        return
+    if expires is not None:
+        # scores are shown after the due date, keep the payload until then (included)
+        timeout = min(timeout, int(math.ceil((expires - timezone.now()).total_seconds())) + 1)
+    get_cache().set(
+        _student_data_key(course.id, user_id, variant),
+        (get_course_version(course), data, expires, etag),
+        timeout
+    )
+
+
+def invalidate_student_data(course_key, user_id):
+    """
+        Remove student_data payload after a score/grade change
+    """
+    get_cache().delete_many([_student_data_key(course_key, user_id, variant) for variant in STUDENT_DATA_VARIANTS])
+
+
+def _compact_version_key(course_key, user_id, version):
+    return '{}.compact_version.{}.{}.{}'.format(KEY_PREFIX, text_type(course_key), user_id, version)
+
+
+def get_compact_version(course_key, user_id, version):
+    """
+        Subsection hashes of a compact payload version sent to the client, None if unknown
+    """
+    return get_cache().get(_compact_version_key(course_key, user_id, version))
+
+
+def set_compact_version(course_key, user_id, version, value, timeout):
+    get_cache().set(_compact_version_key(course_key, user_id, version), value, timeout)
+
+
+def _flight_keys(name, token=None):
+    key = '{}.flight.{}'.format(KEY_PREFIX, name)
+    return key, '{}.{}'.format(key, token)
+
+
+def single_flight(name, compute):
+    """
+        Request coalescing: concurrent calls with the same name share one computation.
+        The first caller takes the lock (cache.add, expires after EOL_PROGRESS_TAB_COALESCE_LOCK_TIMEOUT),
+        computes and publishes the result under its lock token. The others wait for that result up to
+        EOL_PROGRESS_TAB_COALESCE_WAIT seconds and compute it themselves if the holder fails or times out.
+    """
+    if not settings.EOL_PROGRESS_TAB_COALESCE:
+        return compute()
+    cache = get_cache()
+    token = uuid.uuid4().hex
+    lock_key, result_key = _flight_keys(name, token)
+    if cache.add(lock_key, token, settings.EOL_PROGRESS_TAB_COALESCE_LOCK_TIMEOUT):
+        try:
+            result = compute()
+            # kept only while waiting callers poll it
+            cache.set(result_key, result, settings.EOL_PROGRESS_TAB_COALESCE_WAIT)
+            return result
+        finally:
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+    leader = cache.get(lock_key)
+    if leader is not None:
+        __, result_key = _flight_keys(name, leader)
+        deadline = time.time() + settings.EOL_PROGRESS_TAB_COALESCE_WAIT
+        while time.time() < deadline:
+            time.sleep(settings.EOL_PROGRESS_TAB_COALESCE_POLL)
+            # the result is published before the lock is released
+            finished = cache.get(lock_key) != leader
+            result = cache.get(result_key)
+            if result is not None:
+                return result
+            if finished:
+                break
+        logger.info("EolProgressTab - Coalesced computation not available, computing: %s", name)
+    return compute()
+
+
+def _snapshot_refresh_key(course_key, user_id):
+    return '{}.snapshot_refresh.{}.{}'.format(KEY_PREFIX, text_type(course_key), user_id)
+
+
+def add_snapshot_refresh(course_key, user_id, timeout):
+    """
+        Mark a snapshot refresh of the student as pending for timeout seconds.
+        False if a refresh is already pending (enqueued by another request or signal)
+    """
+    # a timeout of 0 never expires on memcached
+    return get_cache().add(_snapshot_refresh_key(course_key, user_id), 1, max(timeout, 1))
+
+
+def _regrade_key(task_id, name):
+    return '{}.regrade.{}.{}'.format(KEY_PREFIX, task_id, name)
+
+
+def init_regrade_progress(task_id, course_key, user_ids):
+    """
+        Store regrade task info and done/failed counters
+    """
+    cache = get_cache()
+    timeout = settings.EOL_PROGRESS_TAB_REGRADE_TIMEOUT
+    cache.set_many({
+        _regrade_key(task_id, 'info')   : {
+            'course_id' : text_type(course_key),
+            'total'     : len(user_ids),
+            'user_id'   : user_ids[0] if len(user_ids) == 1 else None,  # single student regrade
+        },
+        _regrade_key(task_id, 'done')   : 0,
+        _regrade_key(task_id, 'failed') : 0,
+    }, timeout)
+
+
+def incr_regrade_progress(task_id, name):
+    """
+        Increase done/failed counter (atomic on memcached)
+    """
+    try:
+        get_cache().incr(_regrade_key(task_id, name))
+    except ValueError:
+        logger.warning("EolProgressTab - Regrade progress expired: %s", task_id)
+
+
+def get_regrade_progress(task_id):
+    """
+        Regrade task info with done/failed counters, None if unknown
+    """
+    keys = [_regrade_key(task_id, name) for name in ('info', 'done', 'failed')]
+    values = get_cache().get_many(keys)
+    info = values.get(keys[0])
+    if info is None:
+        return None
+    return dict(info, done=values.get(keys[1], 0), failed=values.get(keys[2], 0))
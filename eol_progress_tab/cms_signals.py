@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+
+from celery import current_app
+from django.conf import settings
+from six import text_type
+
+
+def course_published_handler(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+        Course published on Studio: progress tab caches and snapshots live in the LMS,
+        enqueue the LMS task by name (tasks.course_published) on the LMS queue.
+        Connected by EolProgressTabCmsConfig (Studio only)
+    """
+    current_app.send_task(
+        'eol_progress_tab.tasks.course_published',
+        args=[text_type(course_key)],
+        queue=settings.EOL_PROGRESS_TAB_LMS_QUEUE
+    )
+
+
+def site_configuration_saved_handler(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+        Site configuration saved on the Studio admin: invalidate the LMS tab visibility (tasks.site_configuration_changed)
+    """
+    current_app.send_task(
+        'eol_progress_tab.tasks.site_configuration_changed',
+        args=[instance.site_id],
+        queue=settings.EOL_PROGRESS_TAB_LMS_QUEUE
+    )
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+from django.conf import settings
+from numpy import around
+from six import text_type
+
+from . import cache, serializers
+from .structure import format_date
+
+import hashlib
+
+FORMAT = 'compact'
+
+STRUCTURE_COLUMNS = ('id', 'category', 'display_name', 'url', 'due')
+CATEGORY_COLUMNS = ('category', 'weight', 'drop_count', 'min_count', 'grade_percent', 'grade_scaled')
+# index: position of the subsection in the structure columns, due: only when personalized (extensions)
+SUBSECTION_COLUMNS = (
+    'index', 'earned', 'possible', 'percent', 'attempted', 'due',
+    'show_problem_scores', 'problem_earned', 'problem_possible', 'hash'
+)
+HEADER_KEYS = ('username', 'final_grade_percent', 'final_grade_scaled', 'passed', 'certificate_data')
+
+
+def _columns(names, rows):
+    """
+        Rows (tuples) to column oriented arrays
+    """
+    if not rows:
+        return {name: [] for name in names}
+    return {name: list(values) for name, values in zip(names, zip(*rows))}
+
+
+def _hash(value):
+    return hashlib.sha1(serializers.dumps(value, fast=False).encode('utf-8')).hexdigest()[:12]
+
+
+def build_structure(structure):
+    """
+        Static course structure columns (same for every student of the course version)
+    """
+    return _columns(STRUCTURE_COLUMNS, [
+        (location, subsection['format'], subsection['display_name'], subsection['url'], subsection['due'])
+        for location, subsection in structure.items()
+    ])
+
+
+def build_payload(student_data, course_grade, structure, structure_version, show_problem_scores):
+    """
+        Compact student data: header values, categories and student scores by subsection as
+        column arrays. Subsections are referenced by index on the (separated) course structure.
+        student_data: summary payload (without detail), show_problem_scores(show_correctness, due)
+    """
+    index = {location: position for position, location in enumerate(structure)}
+    rows = []
+    for subsections in course_grade.graded_subsections_by_format.values():
+        for subsection in subsections.values():
+            location = text_type(subsection.location)
+            if location not in index:
+                continue
+            show_problem_scores_value = show_problem_scores(subsection.show_correctness, subsection.due)
+            graded_scores = [
+                score for score in subsection.problem_scores.values() if score.graded
+            ] if show_problem_scores_value else []
+            total = subsection.graded_total
+            row = (
+                index[location],
+                total.earned,
+                total.possible,
+                around(total.earned / total.possible, decimals=2),
+                total.first_attempted is not None,
+                None if subsection.due == structure[location]['due_date'] else format_date(subsection.due),
+                show_problem_scores_value,
+                [score.earned for score in graded_scores],
+                [score.possible for score in graded_scores],
+            )
+            rows.append(row + (_hash(row),))
+    rows.sort(key=lambda row: row[0])
+
+    payload = {key: student_data[key] for key in HEADER_KEYS}
+    payload['categories'] = _columns(CATEGORY_COLUMNS, [
+        tuple(grade[column] for column in CATEGORY_COLUMNS) for grade in student_data['category_grades']
+    ])
+    payload.update({
+        'format'            : FORMAT,
+        'version'           : _hash([structure_version, payload, [row[-1] for row in rows]]),
+        'structure_version' : structure_version,
+        'structure'         : build_structure(structure),
+        'subsections'       : _columns(SUBSECTION_COLUMNS, rows),
+        'delta'             : False,
+    })
+    return payload
+
+
+def save_version(course_key, user_id, payload):
+    """
+        Keep the subsection hashes of the payload version (base of later delta requests)
+    """
+    subsections = payload['subsections']
+    cache.set_compact_version(course_key, user_id, payload['version'], {
+        'structure_version' : payload['structure_version'],
+        'hashes'            : dict(zip(subsections['index'], subsections['hash'])),
+    }, settings.EOL_PROGRESS_TAB_DELTA_TIMEOUT)
+
+
+def client_payload(payload, course_key, user_id, since=None, structure_version=None):
+    """
+        Payload for the client versions:
+            structure omitted when the client has the same structure_version,
+            only changed subsections (delta) when the client version (since) is known.
+    """
+    if structure_version == payload['structure_version']:
+        del payload['structure']
+    if since is None:
+        return payload
+    base = cache.get_compact_version(course_key, user_id, since)
+    if base is None or base['structure_version'] != payload['structure_version']:
+        return payload  # unknown version, full payload
+    hashes = base['hashes']
+    subsections = payload['subsections']
+    changed = [
+        position for position, (index, row_hash) in enumerate(zip(subsections['index'], subsections['hash']))
+        if hashes.get(index) != row_hash
+    ]
+    payload['subsections'] = {name: [values[position] for position in changed] for name, values in subsections.items()}
+    payload['removed'] = sorted(set(hashes) - set(subsections['index']))
+    payload['delta'] = True
+    payload['since'] = since
+    return payload
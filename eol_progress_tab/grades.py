@@ -0,0 +1,461 @@
+# -*- coding: utf-8 -*-
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from lms.djangoapps.certificates.models import CertificateStatuses, GeneratedCertificate
+from lms.djangoapps.courseware.views.views import get_cert_data
+from lms.djangoapps.grades.api import clear_prefetched_course_and_subsection_grades, prefetch_course_and_subsection_grades
+from lms.djangoapps.grades.config import should_persist_grades
+from lms.djangoapps.grades.course_grade_factory import CourseGradeFactory
+from lms.djangoapps.grades.models import PersistentCourseGrade
+from numpy import around
+from openedx.core.djangoapps.course_groups.models import CourseUserGroup
+from six import itervalues, text_type
+from student.models import CourseEnrollment
+
+from . import cache, instrumentation, persisted, serializers
+from .grading import get_grade_scale, grade_percent_scaled, grade_percents_scaled
+from .prefetch import certificate_unavailable, prefetch_students
+from .structure import format_date, get_course_structure, get_subsection_url
+
+import csv
+import json
+import six
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+def get_course_users(course_key, user_ids=None, cohort=None, mode=None):
+    """
+        Active enrollments of the course (ordered by id)
+    """
+    # course, active & mode conditions in the same filter: a single join on the course enrollment
+    enrollment_filter = {
+        'courseenrollment__course_id'   : course_key,
+        'courseenrollment__is_active'   : 1,
+    }
+    if mode:
+        enrollment_filter['courseenrollment__mode'] = mode
+    users = User.objects.filter(**enrollment_filter)
+    if user_ids:
+        users = users.filter(pk__in=user_ids)
+    if cohort:
+        users = users.filter(
+            course_groups__course_id=course_key,
+            course_groups__group_type=CourseUserGroup.COHORT,
+            course_groups__name=cohort
+        )
+    return users.distinct().order_by('id')
+
+
+def iter_batches(iterable, batch_size):
+    """
+        Split iterable in lists of batch_size elements
+    """
+    batch = []
+    for elem in iterable:
+        batch.append(elem)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_course_grades(course, users):
+    """
+        Yield (user, course_grade, error) for a batch of users with prefetched persistent grades
+    """
+    if not users:
+        return
+    prefetch_course_and_subsection_grades(course.id, users)
+    try:
+        for user, course_grade, error in CourseGradeFactory().iter(users, course=course):
+            if error:
+                logger.warning("EolProgressTab - Error reading grade (user: %s, course: %s): %s", user.id, text_type(course.id), error)
+            yield user, course_grade, error
+    finally:
+        clear_prefetched_course_and_subsection_grades(course.id)
+
+
+def get_category_config(course):
+    """
+        Create dict with category weights (% 0. -> 1.) and drop_count
+    """
+    return {
+        assignment_type.upper() : {
+            'weight'    : weight,
+            'drop_count': grader.drop_count,
+            'min_count' : grader.min_count
+        }
+        for grader, assignment_type, weight in course.grader.subgraders
+    }
+
+
+def build_student_data_json(user, course, course_grade=None, summary=False, student=None):
+    """
+        Compute student data json payload (live) and its scores_expire
+    """
+    student_data = get_student_data(user, course, course_grade, summary=summary, student=student)
+    with instrumentation.phase('serialize'):
+        return serializers.dumps(student_data), student_data.get('scores_expire')
+
+
+def get_student_data(user, course, course_grade=None, category_config=None, structure=None, summary=False, student=None, now=None):
+    """
+        Build student data summary (grades, categories detail & certificate)
+        summary: categories without detail, only the number of subsections (detail_count)
+        student: prefetched enrollment & certificate data (multi-student requests, see prefetch.py)
+        now: instant of the problem scores visibility (default: current time), the payload
+            is valid until scores_expire (next visibility change)
+    """
+    course_key = course.id
+    grade_cutoff = min(course.grade_cutoffs.values())
+    scale = get_grade_scale()
+    if category_config is None:
+        category_config = get_category_config(course)
+    # Student grades information
+    if course_grade is None:
+        with instrumentation.phase('grades'):
+            if summary and persisted.is_enabled():
+                # read-only fast path (summary doesn't need subsection grades)
+                course_grade = persisted.read_course_grade(user, course, structure)
+            if course_grade is None:
+                course_grade = CourseGradeFactory().read(user, course)
+
+    # Get category detail and problem scores by subsection
+    with instrumentation.phase('detail'):
+        if summary:
+            category_scores_detail = {
+                key.upper(): len(values) for key, values in course_grade.graded_subsections_by_format.items()
+            }
+        else:
+            if structure is None:
+                structure = get_course_structure(course)
+            now = now or timezone.now()
+            category_scores_detail = get_category_scores_detail(course_grade, course_key, structure, now=now)
+
+    # Certificate
+    with instrumentation.phase('certificate'):
+        if student is None:
+            enrollment_mode, _ = CourseEnrollment.enrollment_mode_for_user(user, course_key)
+        else:
+            enrollment_mode = student.enrollment_mode
+        certificate_data = get_certificate_data(user, course, enrollment_mode, course_grade, student)
+
+    # Student final grade scaled
+    student_grade_scaled = grade_percent_scaled(course_grade.percent, grade_cutoff, scale)
+    # Category average grades
+    student_category_grades = filter(prominent_section_filter, course_grade.summary['section_breakdown'])
+    # Student data summary
+    student_data = {
+        'username'              : user.username,
+        'final_grade_percent'   : course_grade.percent,
+        'final_grade_scaled'    : student_grade_scaled,
+        'passed'                : course_grade.passed,
+        'certificate_data'      : certificate_data,
+        'category_grades'       : [
+            {
+                'grade_percent' : grade['percent'],
+                'grade_scaled'  : grade_percent_scaled(grade['percent'], grade_cutoff, scale),
+                'category'      : grade['category'].title(),
+                'weight'        : category_config[grade['category'].upper()]['weight'],
+                'drop_count'    : category_config[grade['category'].upper()]['drop_count'],
+                'min_count'     : category_config[grade['category'].upper()]['min_count'],
+                'detail'        : category_scores_detail[grade['category'].upper()] if grade['category'].upper() in category_scores_detail else []
+            }
+            for grade in student_category_grades
+        ]
+    }
+    if summary:
+        for category_grade in student_data['category_grades']:
+            category_grade['detail_count'] = category_grade.pop('detail') or 0
+    else:
+        student_data['scores_expire'] = get_scores_expiry(course_grade, now)
+    return student_data
+
+
+def get_category_scores_detail(course_grade, course_key, structure=None, category=None, now=None):
+    """
+        Get subsections by category_grade with their respective problem scores
+        Course data (url, due) is taken from the precomputed course structure when available,
+        only student scores are computed here.
+        category: only subsections of this category (upper case)
+        now: instant of the problem scores visibility (same for every subsection)
+    """
+    graded_subsections_by_format = course_grade.graded_subsections_by_format
+    category_scores_detail = {}
+    structure = structure or {}
+    now = now or timezone.now()
+
+    # subsection by format (category_grades)
+    for key, values in graded_subsections_by_format.items():
+        if category is not None and key.upper() != category:
+            continue
+        # a category_grade can be in more than one subsection
+        for subsection in itervalues(values):
+            show_problem_scores_value = show_problem_scores(subsection.show_correctness, subsection.due, now)
+            subsection_structure = structure.get(text_type(subsection.location))
+            if subsection_structure is not None:
+                url = subsection_structure['url']
+                # due dates could be personalized (extensions)
+                due = subsection_structure['due'] if subsection_structure['due_date'] == subsection.due else format_date(subsection.due)
+            else:
+                url = get_subsection_url(subsection.location, course_key)
+                due = format_date(subsection.due)
+            subsection_data = {
+                'subsection_display_name'   : subsection.display_name,
+                'url'                       : url,
+                'total_earned'              : subsection.graded_total.earned, # only graded scores
+                'total_possible'            : subsection.graded_total.possible, # only graded scores
+                'total_percent'             : around(subsection.graded_total.earned / subsection.graded_total.possible, decimals=2),
+                'due'                       : due,
+                'attempted'                 : subsection.graded_total.first_attempted is not None,
+                'show_problem_scores'       : show_problem_scores_value,
+                'problem_scores'            : [
+                    {
+                        'earned'            : score.earned,
+                        'possible'          : score.possible
+                    }
+                    for score in subsection.problem_scores.values() if score.graded # only graded scores
+                ] if show_problem_scores_value else []
+            }
+            category_scores_detail.setdefault(subsection.format.upper(),[]).append(subsection_data)
+    return category_scores_detail
+
+
+def show_problem_scores(show_correctness, due, now=None):
+    """
+        Show problem scores
+            show_correctness values:
+                'always'
+                'past_due'
+                'never'
+    """
+    if show_correctness == 'always':
+        return True
+    elif show_correctness == 'past_due':
+        return due is None or (now or timezone.now()) > due
+    # show_correctness == 'never'
+    return False
+
+
+def get_scores_expiry(course_grade, now):
+    """
+        Next instant at which the problem scores visibility changes: earliest due date
+        (not passed at now) of the 'past_due' subsections, None if there is no pending change
+    """
+    dues = [
+        subsection.due
+        for subsections in course_grade.graded_subsections_by_format.values()
+        for subsection in itervalues(subsections)
+        if subsection.show_correctness == 'past_due' and subsection.due is not None and subsection.due >= now
+    ]
+    return min(dues) if dues else None
+
+
+def get_student_data_version(user, course):
+    """
+        student_data ETag & Last-Modified: course version, latest persisted grade/certificate update and
+        enrollment mode/is_active (certificate data).
+        None when grades are not persisted (changes can't be detected) or not computed yet
+        (the grade is persisted while building the response)
+    """
+    if not should_persist_grades(course.id):
+        return None, None
+    grade_modified = PersistentCourseGrade.objects.filter(
+        user_id=user.id,
+        course_id=course.id
+    ).values_list('modified', flat=True).first()
+    if grade_modified is None:
+        return None, None
+    certificate_modified = GeneratedCertificate.objects.filter(
+        user_id=user.id,
+        course_id=course.id
+    ).values_list('modified_date', flat=True).first()
+    enrollment = CourseEnrollment.objects.filter(
+        user_id=user.id,
+        course_id=course.id
+    ).values_list('mode', 'is_active').first()
+    last_modified = max(grade_modified, certificate_modified) if certificate_modified else grade_modified
+    etag = cache.make_etag(
+        'student_data', course.id, user.id, cache.get_student_data_version(course), get_grade_scale(),
+        grade_modified, certificate_modified, enrollment, _get_scores_epoch(get_course_structure(course), timezone.now())
+    )
+    return etag, last_modified
+
+
+def _get_scores_epoch(structure, now):
+    """
+        Number of 'past_due' subsections with visible problem scores: changes the ETag when a due date passes
+        (course due dates, personalized due dates only expire the server cache and max-age)
+    """
+    return sum(
+        1 for subsection in structure.values()
+        if subsection['show_correctness'] == 'past_due' and subsection['due_date'] is not None and now > subsection['due_date']
+    )
+
+
+def get_certificate_data(user, course, enrollment_mode, course_grade, student=None):
+    """
+        Get student certificate url and messages.
+        student: prefetched data, skips get_cert_data queries when no certificate can be shown
+        (other students still call get_cert_data, see prefetch.certificate_unavailable)
+    """
+    if student is not None and certificate_unavailable(student, course_grade):
+        return { }
+    certificate_data = get_cert_data(user, course, enrollment_mode, course_grade)
+    if certificate_data:
+        request_method = "GET"
+        if certificate_data.cert_web_view_url:
+            url = certificate_data.cert_web_view_url
+            button_msg = "Ver Certificado"
+        elif certificate_data.cert_status == CertificateStatuses.downloadable and certificate_data.download_url:
+            url = certificate_data.download_url
+            button_msg = "Descargar Certificado"
+        elif certificate_data.cert_status == CertificateStatuses.requesting:
+            url = reverse('generate_user_cert', args=[text_type(course.id)])
+            button_msg = "Solicitar Certificado"
+            request_method = "POST"
+        else:
+            url = "#"
+            button_msg = "Certificado No Disponible"
+        return {
+            'status'        : certificate_data.cert_status,
+            'url'           : url,
+            'title'         : text_type(certificate_data.title),
+            'msg'           : text_type(certificate_data.msg),
+            'button_msg'    : button_msg,
+            'button_method' : request_method
+        }
+    else:
+        return { }
+
+
+def prominent_section_filter(elem):
+    """
+        Filter only average grades
+    """
+    return 'prominent' in elem
+
+
+def iter_student_data(course, users, batch_size=None):
+    """
+        Yield (user, student_data) for each user.
+        Course config is built once and grades are read in batches (prefetched persistent grades).
+        Cached payloads are reused and new ones are stored (with their ETag, see get_student_data_version).
+    """
+    batch_size = batch_size or settings.EOL_PROGRESS_TAB_BULK_BATCH_SIZE
+    category_config = get_category_config(course)
+    structure = get_course_structure(course)
+    for batch in iter_batches(users.iterator(), batch_size):
+        pending = []
+        for user in batch:
+            data = cache.get_student_data(course, user.id)
+            if data is None:
+                pending.append(user)
+            else:
+                yield user, json.loads(data)
+        students = prefetch_students(course.id, pending)
+        for user, course_grade, error in iter_course_grades(course, pending):
+            if error:
+                yield user, {'username': user.username, 'error': text_type(error)}
+                continue
+            student_data = get_student_data(user, course, course_grade, category_config, structure, student=students[user.id])
+            cache.set_student_data(
+                course, user.id, serializers.dumps(student_data), expires=student_data.get('scores_expire'),
+                etag=get_student_data_version(user, course)[0]
+            )
+            yield user, student_data
+
+
+def iter_scaled_grades(course, users, batch_size=None):
+    """
+        Yield final and category scaled grades of each user (ordered by user id).
+        Percents of each batch are scaled at once (vectorized).
+    """
+    batch_size = batch_size or settings.EOL_PROGRESS_TAB_BULK_BATCH_SIZE
+    grade_cutoff = min(course.grade_cutoffs.values())
+    scale = get_grade_scale()
+    category_config = get_category_config(course)
+    for batch in iter_batches(users.iterator(), batch_size):
+        rows = []
+        percents = []
+        for user, course_grade, error in iter_course_grades(course, batch):
+            row = {
+                'user_id'               : user.id,
+                'username'              : user.username,
+                'final_grade_percent'   : None,
+                'final_grade_scaled'    : None,
+                'passed'                : None,
+                'error'                 : text_type(error) if error else None,
+                'category_grades'       : [],
+            }
+            if not error:
+                row.update({
+                    'final_grade_percent'   : course_grade.percent,
+                    'passed'                : course_grade.passed,
+                    'category_grades'       : [
+                        dict(
+                            category_config[grade['category'].upper()],
+                            category=grade['category'].title(),
+                            grade_percent=grade['percent']
+                        )
+                        for grade in filter(prominent_section_filter, course_grade.summary['section_breakdown'])
+                    ],
+                })
+                percents.append(course_grade.percent)
+                percents.extend(grade['grade_percent'] for grade in row['category_grades'])
+            rows.append(row)
+        scaled = iter(grade_percents_scaled(percents, grade_cutoff, scale).tolist())
+        for row in rows:
+            if not row['error']:
+                row['final_grade_scaled'] = next(scaled)
+                for grade in row['category_grades']:
+                    grade['grade_scaled'] = next(scaled)
+            yield row
+
+
+def _scaled_grades_csv(rows, course):
+    """
+        CSV lines: one column group (scaled, percent, weight, drop_count, min_count) per category
+    """
+    categories = list(get_category_config(course).keys())
+    category_fields = ['grade_scaled', 'grade_percent', 'weight', 'drop_count', 'min_count']
+    buffer = six.StringIO()
+    writer = csv.writer(buffer)
+
+    def _line(values):
+        writer.writerow(values)
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return line
+
+    yield _line(
+        ['user_id', 'username', 'final_grade_percent', 'final_grade_scaled', 'passed', 'error'] +
+        ['{} {}'.format(category.title(), field) for category in categories for field in category_fields]
+    )
+    for row in rows:
+        category_grades = {grade['category'].upper(): grade for grade in row['category_grades']}
+        yield _line(
+            [row['user_id'], row['username'], row['final_grade_percent'], row['final_grade_scaled'], row['passed'], row['error']] +
+            [category_grades.get(category, {}).get(field) for category in categories for field in category_fields]
+        )
+
+
+def _scaled_grades_ndjson(rows, course):  # pylint: disable=unused-argument
+    """
+        NDJSON lines: one json object per user
+    """
+    for row in rows:
+        yield serializers.dumps(row) + '\n'
+
+
+SCALED_GRADES_FORMATS = {
+    'csv'   : ('text/csv', _scaled_grades_csv),
+    'ndjson': ('application/x-ndjson', _scaled_grades_ndjson),
+}
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+from collections import namedtuple
+
+from django.conf import settings
+from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
+from openedx.core.lib.grade_utils import round_away_from_zero
+
+import numpy
+
+# Scaled grade definition: min_grade (0%), pass_grade (grade cutoff) and max_grade (100%)
+GradeScale = namedtuple('GradeScale', ['min_grade', 'max_grade', 'pass_grade'])
+
+DEFAULT_GRADE_SCALE = GradeScale(min_grade=1., max_grade=7., pass_grade=4.)
+
+
+def get_grade_scale():
+    """
+        Grade scale of the current site (EOL_PROGRESS_TAB_GRADE_SCALE)
+    """
+    scale = configuration_helpers.get_value('EOL_PROGRESS_TAB_GRADE_SCALE', settings.EOL_PROGRESS_TAB_GRADE_SCALE)
+    if not scale:
+        return DEFAULT_GRADE_SCALE
+    return GradeScale(**dict(DEFAULT_GRADE_SCALE._asdict(), **scale))
+
+
+def _fail_max_grade(scale):
+    """
+        Highest failing grade (one decimal below pass_grade, ex: 3.9)
+    """
+    return round(scale.pass_grade * 10. - 1.) / 10.
+
+
+def grade_percent_scaled(grade_percent, grade_cutoff, scale=DEFAULT_GRADE_SCALE):
+    """
+        Scale grade percent by grade cutoff. Grade between min_grade - max_grade (1.0 - 7.0)
+    """
+    if grade_percent == 0.:
+        return scale.min_grade
+    if grade_percent < grade_cutoff:
+        return min(
+            round(10. * ((scale.pass_grade - scale.min_grade) / grade_cutoff * grade_percent + scale.min_grade)) / 10.,
+            _fail_max_grade(scale)
+        )
+    slope = (scale.max_grade - scale.pass_grade) / (1. - grade_cutoff)
+    return round((slope * grade_percent + (scale.max_grade - slope)) * 10.) / 10.
+
+
+def grade_percents_scaled(grade_percents, grade_cutoff, scale=DEFAULT_GRADE_SCALE):
+    """
+        Vectorized grade_percent_scaled.
+        grade_percents: array-like of any shape (students x categories),
+        grade_cutoff: scalar or array broadcastable to grade_percents.
+        Same rounding (half to even) and failing clamp as the scalar version.
+    """
+    percents = numpy.asarray(grade_percents, dtype=float)
+    cutoff = numpy.asarray(grade_cutoff, dtype=float)
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        below = numpy.minimum(
+            numpy.round(10. * ((scale.pass_grade - scale.min_grade) / cutoff * percents + scale.min_grade)) / 10.,
+            _fail_max_grade(scale)
+        )
+        slope = (scale.max_grade - scale.pass_grade) / (1. - cutoff)
+        above = numpy.round((slope * percents + (scale.max_grade - slope)) * 10.) / 10.
+    scaled = numpy.where(percents < cutoff, below, above)
+    return numpy.where(percents == 0., scale.min_grade, scaled)
+
+
+def subsection_percent(earned, possible):
+    """
+        Subsection graded percent rounded to 2 decimals (xmodule.graders.compute_percent)
+    """
+    if possible > 0:
+        return float(numpy.around(earned / possible, decimals=2))
+    return 0.
+
+
+def category_percent(subsection_percents, drop_count, min_count):
+    """
+        Category (assignment type) average like xmodule AssignmentFormatGrader:
+        missing subsections up to min_count count as 0 and the lowest drop_count are dropped.
+        Subsection percents must be in course order (same float sum as the grader).
+    """
+    percents = list(subsection_percents)
+    percents.extend([0.] * (min_count - len(percents)))
+    dropped = set(sorted(range(len(percents)), key=lambda i: percents[i])[:drop_count]) if drop_count > 0 else set()
+    total = 0.
+    for index, percent in enumerate(percents):
+        if index not in dropped:
+            total += percent
+    if len(percents) - drop_count > 0:
+        total /= len(percents) - drop_count
+    return total
+
+
+def course_percent(weighted_percent):
+    """
+        Course grade percent from the weighted sum of category percents (lms CourseGrade._compute_percent)
+    """
+    return round_away_from_zero(weighted_percent * 100 + 0.05) / 100
+
+
+def is_passing(grade_cutoffs, percent):
+    """
+        Course grade reaches the lowest non zero cutoff (lms CourseGrade._compute_passed)
+    """
+    nonzero_cutoffs = [cutoff for cutoff in grade_cutoffs.values() if cutoff > 0]
+    return bool(nonzero_cutoffs) and percent >= min(nonzero_cutoffs)
+
+
+def build_grading_policy(course, subsections_by_format, scale=DEFAULT_GRADE_SCALE):
+    """
+        Everything needed to reproduce the course grade (grading_policy endpoint):
+        grader categories (weight, drop_count, min_count and graded subsections in course order),
+        grade cutoffs and the scaled grade parameters (grade_percent_scaled).
+        subsections_by_format: { format: [subsection locations] } (structure.get_subsections_by_format)
+    """
+    return {
+        'categories'    : [
+            {
+                'category'      : assignment_type,
+                'weight'        : weight,
+                'drop_count'    : grader.drop_count,
+                'min_count'     : grader.min_count,
+                'subsections'   : list(subsections_by_format.get(assignment_type, [])),
+            }
+            for grader, assignment_type, weight in course.grader.subgraders
+        ],
+        'grade_cutoffs' : course.grade_cutoffs,
+        'grade_cutoff'  : min(course.grade_cutoffs.values()),
+        'scale'         : dict(scale._asdict(), fail_max_grade=_fail_max_grade(scale)),
+    }
+
+
+def compute_course_grade(policy, subsection_scores):
+    """
+        Reference what-if engine (the frontend runs the same steps): course and category grades
+        of hypothetical subsection scores with an exported grading policy (build_grading_policy).
+        subsection_scores: { subsection location: (earned, possible) }, missing subsections count as 0.
+    """
+    grade_cutoff = policy['grade_cutoff']
+    scale = GradeScale(**{name: policy['scale'][name] for name in GradeScale._fields})
+    percents = {
+        location: subsection_percent(earned, possible) for location, (earned, possible) in subsection_scores.items()
+    }
+    categories = []
+    weighted_percent = 0.
+    for category in policy['categories']:
+        percent = category_percent(
+            [percents.get(location, 0.) for location in category['subsections']],
+            category['drop_count'],
+            category['min_count']
+        )
+        weighted_percent += percent * category['weight']
+        categories.append({
+            'category'      : category['category'],
+            'grade_percent' : percent,
+            'grade_scaled'  : grade_percent_scaled(percent, grade_cutoff, scale),
+        })
+    percent = course_percent(weighted_percent)
+    return {
+        'final_grade_percent'   : percent,
+        'final_grade_scaled'    : grade_percent_scaled(percent, grade_cutoff, scale),
+        'passed'                : is_passing(policy['grade_cutoffs'], percent),
+        'category_grades'       : categories,
+    }
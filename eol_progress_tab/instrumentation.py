@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import connection
+from django.http.response import HttpResponseBase
+from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
+from pymongo import monitoring
+
+from .access import REQUEST_ATTRIBUTE
+
+import threading
+import time
+
+import logging
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+class Recorder(object):
+    """
+        Per request timings, SQL queries and Mongo commands by phase
+    """
+
+    def __init__(self, view_name):
+        self.view_name = view_name
+        self.start = time.time()
+        self.total = None
+        self.queries = 0
+        self.mongo_calls = 0
+        self.phases = OrderedDict()
+
+    def count_query(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def phase(self, name):
+        start, queries, mongo_calls = time.time(), self.queries, self.mongo_calls
+        try:
+            yield
+        finally:
+            duration, phase_queries, phase_mongo_calls = self.phases.get(name, (0., 0, 0))
+            self.phases[name] = (
+                duration + (time.time() - start) * 1000.,
+                phase_queries + self.queries - queries,
+                phase_mongo_calls + self.mongo_calls - mongo_calls,
+            )
+
+    def stop(self):
+        self.total = (time.time() - self.start) * 1000.
+
+    def server_timing(self):
+        """
+            Server-Timing header value (durations in ms)
+        """
+        metrics = [
+            '{};dur={:.1f};desc="sql={} mongo={}"'.format(name, duration, queries, mongo_calls)
+            for name, (duration, queries, mongo_calls) in self.phases.items()
+        ]
+        metrics.append('total;dur={:.1f};desc="sql={} mongo={}"'.format(self.total, self.queries, self.mongo_calls))
+        return ', '.join(metrics)
+
+    def log(self, counters=None):
+        """
+            One structured (statsd style) line per request
+        """
+        metrics = [
+            'eol_progress_tab.{}.{}:{:.1f}|ms sql={} mongo={}'.format(self.view_name, name, duration, queries, mongo_calls)
+            for name, (duration, queries, mongo_calls) in self.phases.items()
+        ]
+        metrics.append('eol_progress_tab.{}.total:{:.1f}|ms sql={} mongo={}'.format(self.view_name, self.total, self.queries, self.mongo_calls))
+        logger.info("EolProgressTab - timings %s counters=%s", ' '.join(metrics), dict(counters or {}))
+
+
+class MongoCommandCounter(monitoring.CommandListener):
+    """
+        Count Mongo commands of the active recorder (registered only if EOL_PROGRESS_TAB_MONGO_MONITORING)
+    """
+
+    def started(self, event):
+        recorder = getattr(_local, 'recorder', None)
+        if recorder is not None:
+            recorder.mongo_calls += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def register_mongo_listener():
+    if settings.EOL_PROGRESS_TAB_MONGO_MONITORING:
+        monitoring.register(MongoCommandCounter())
+
+
+def is_enabled():
+    return configuration_helpers.get_value('EOL_PROGRESS_TAB_INSTRUMENTATION', settings.EOL_PROGRESS_TAB_INSTRUMENTATION)
+
+
+@contextmanager
+def _null_phase():
+    yield
+
+
+def phase(name):
+    """
+        Time a block of code of the current request (no-op when instrumentation is off)
+    """
+    recorder = getattr(_local, 'recorder', None)
+    if recorder is None:
+        return _null_phase()
+    return recorder.phase(name)
+
+
+@contextmanager
+def record(view_name):
+    """
+        Record the current request (yields None when instrumentation is off)
+    """
+    if not is_enabled():
+        yield None
+        return
+    recorder = Recorder(view_name)
+    _local.recorder = recorder
+    try:
+        with connection.execute_wrapper(recorder.count_query):
+            yield recorder
+    finally:
+        _local.recorder = None
+        recorder.stop()
+
+
+def instrumented(view_name):
+    """
+        View decorator: timings log line and, for staff, Server-Timing response header
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            with record(view_name) as recorder:
+                response = view(request, *args, **kwargs)
+            if recorder is not None:
+                access = _get_access(request, kwargs.get('course_id'))
+                recorder.log(access.counters if access else None)
+                # fragments (tab rendering) are only logged
+                if isinstance(response, HttpResponseBase) and access is not None and access.is_staff():
+                    response['Server-Timing'] = recorder.server_timing()
+            return response
+        return wrapper
+    return decorator
+
+
+def _get_access(request, course_id):
+    """
+        Access context already created by the view
+    """
+    return getattr(request, REQUEST_ATTRIBUTE, {}).get(course_id)
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+from six import text_type
+
+from courseware.courses import get_course_by_id
+from eol_progress_tab.persisted import compare_course_grades, read_course_grade
+from eol_progress_tab.structure import get_course_structure
+from eol_progress_tab.grades import get_course_users, iter_batches, iter_course_grades
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+        Consistency check of the read-only fast path: compares the grades built from persisted
+        subsection grades with CourseGradeFactory for the active enrollments of a course.
+
+        Example:
+            ./manage.py lms check_persisted_grades course-v1:eol+test+2021 --limit 500
+    """
+    help = 'Compare persisted grades fast path with CourseGradeFactory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id')
+        parser.add_argument('--limit', type=int, default=0, help='Max students to check (0: all)')
+        parser.add_argument('--batch-size', type=int, default=settings.EOL_PROGRESS_TAB_BULK_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            course_key = CourseKey.from_string(options['course_id'])
+        except InvalidKeyError:
+            raise CommandError('Invalid course_id: {}'.format(options['course_id']))
+        course = get_course_by_id(course_key)
+        structure = get_course_structure(course)
+        users = get_course_users(course_key)
+        if options['limit'] > 0:
+            users = users[:options['limit']]
+        checked, missing, mismatches = 0, 0, 0
+        for batch in iter_batches(users.iterator(), options['batch_size']):
+            for user, course_grade, error in iter_course_grades(course, batch):
+                if error:
+                    continue
+                persisted_grade = read_course_grade(user, course, structure)
+                if persisted_grade is None:
+                    missing += 1  # fallback to CourseGradeFactory
+                    continue
+                checked += 1
+                differences = compare_course_grades(persisted_grade, course_grade)
+                if differences:
+                    mismatches += 1
+                    self.stdout.write('{} {}: {}\n'.format(
+                        user.id, user.username,
+                        ', '.join('{} persisted={} computed={}'.format(*difference) for difference in differences)
+                    ))
+        self.stdout.write('{} students checked, {} without persisted grade, {} mismatches\n'.format(
+            checked, missing, mismatches))
+        logger.info(
+            "EolProgressTab - Persisted grades check %s: %s checked, %s missing, %s mismatches",
+            text_type(course_key), checked, missing, mismatches
+        )
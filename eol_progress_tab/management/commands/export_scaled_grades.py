@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+from xmodule.modulestore.django import modulestore
+
+from eol_progress_tab.grades import SCALED_GRADES_FORMATS, get_course_users, iter_scaled_grades
+
+import io
+import json
+import os
+import sys
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+        Export final and category scaled grades (1.0 - 7.0) of all active enrollments.
+
+        Example:
+            ./manage.py lms export_scaled_grades course-v1:eol+test+2021 --output grades.csv --checkpoint grades.checkpoint
+            (run again with --resume to continue an interrupted export)
+    """
+    help = 'Export scaled grades of a course as CSV or NDJSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id')
+        parser.add_argument('--format', choices=sorted(SCALED_GRADES_FORMATS.keys()), default='csv')
+        parser.add_argument('--output', help='Output file (default: stdout)')
+        parser.add_argument('--batch-size', type=int, default=settings.EOL_PROGRESS_TAB_BULK_BATCH_SIZE)
+        parser.add_argument('--checkpoint', help='File where the last exported user id is saved after each batch')
+        parser.add_argument('--resume', action='store_true', help='Continue after the user id saved in --checkpoint')
+
+    def handle(self, *args, **options):
+        try:
+            course_key = CourseKey.from_string(options['course_id'])
+        except InvalidKeyError:
+            raise CommandError('Invalid course_id: {}'.format(options['course_id']))
+        course = modulestore().get_course(course_key)
+        if course is None:
+            raise CommandError('Course not found: {}'.format(options['course_id']))
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+        if options['resume'] and not options['checkpoint']:
+            raise CommandError('--resume requires --checkpoint')
+
+        after, exported = 0, 0
+        if options['resume'] and os.path.exists(options['checkpoint']):
+            with open(options['checkpoint']) as checkpoint_file:
+                checkpoint = json.load(checkpoint_file)
+            if checkpoint['course_id'] != options['course_id']:
+                raise CommandError('Checkpoint belongs to {}'.format(checkpoint['course_id']))
+            after, exported = checkpoint['last_user_id'], checkpoint['exported']
+
+        users = get_course_users(course_key).filter(pk__gt=after)
+        rows = iter_scaled_grades(course, users, options['batch_size'])
+        __, serializer = SCALED_GRADES_FORMATS[options['format']]
+        self.last_row, self.count = None, 0
+        output = self._open_output(options['output'], append=after > 0)
+        try:
+            for index, line in enumerate(serializer(self._track(rows), course)):
+                # resumed CSV exports don't repeat the header
+                if after > 0 and index == 0 and options['format'] == 'csv':
+                    continue
+                output.write(line)
+                if self.last_row is not None and (exported + self.count) % options['batch_size'] == 0:
+                    self._save_checkpoint(output, options, exported)
+            self._save_checkpoint(output, options, exported)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        logger.info("EolProgressTab - Exported %s users of %s", exported + self.count, options['course_id'])
+
+    def _track(self, rows):
+        """
+            Keep last exported row and count
+        """
+        for row in rows:
+            self.last_row = row
+            self.count += 1
+            yield row
+
+    def _open_output(self, path, append):
+        if not path:
+            return sys.stdout
+        return io.open(path, 'a' if append else 'w', newline='', encoding='utf-8')
+
+    def _save_checkpoint(self, output, options, exported):
+        if not options['checkpoint'] or self.last_row is None:
+            return
+        output.flush()
+        with open(options['checkpoint'], 'w') as checkpoint_file:
+            json.dump({
+                'course_id': options['course_id'],
+                'last_user_id': self.last_row['user_id'],
+                'exported': exported + self.count,
+            }, checkpoint_file)
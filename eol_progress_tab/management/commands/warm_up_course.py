@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from eol_progress_tab.warmup import warm_up_course
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+        Pre-populate the progress tab caches of a course (course, structure and recent students payloads).
+
+        Example:
+            ./manage.py lms warm_up_course course-v1:eol+test+2021 --students 500 --rate 20
+    """
+    help = 'Warm up the progress tab caches of a course'
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id')
+        parser.add_argument('--students', type=int, default=settings.EOL_PROGRESS_TAB_WARMUP_STUDENTS,
+                            help='Number of most recently active students to precompute')
+        parser.add_argument('--rate', type=float, default=settings.EOL_PROGRESS_TAB_WARMUP_RATE,
+                            help='Max students per second (0: no limit)')
+        parser.add_argument('--batch-size', type=int, default=settings.EOL_PROGRESS_TAB_BULK_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            course_key = CourseKey.from_string(options['course_id'])
+        except InvalidKeyError:
+            raise CommandError('Invalid course_id: {}'.format(options['course_id']))
+        if options['students'] < 0 or options['rate'] < 0 or options['batch_size'] < 1:
+            raise CommandError('--students/--rate must be positive and --batch-size greater than 0')
+        warmed = warm_up_course(course_key, options['students'], options['rate'], options['batch_size'])
+        self.stdout.write('{} students warmed up\n'.format(warmed))
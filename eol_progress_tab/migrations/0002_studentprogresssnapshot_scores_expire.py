@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eol_progress_tab', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentprogresssnapshot',
+            name='scores_expire',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
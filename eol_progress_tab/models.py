@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+
+from django.contrib.auth.models import User
+from django.db import models
+from opaque_keys.edx.django.models import CourseKeyField
+
+
+class StudentProgressSnapshot(models.Model):
+    """
+        Precomputed student_data payload (refreshed in background after score changes/course publish)
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    payload = models.TextField()  # student_data json
+    course_version = models.CharField(max_length=255)
+    computed_at = models.DateTimeField(auto_now=True)
+    scores_expire = models.DateTimeField(null=True, blank=True)  # next problem scores visibility change
+
+    class Meta:
+        unique_together = (('user', 'course_id'),)
+
+    def __str__(self):
+        return '{} - {}'.format(self.user_id, self.course_id)
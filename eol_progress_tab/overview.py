@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from crum import get_current_request, set_current_request
+from django.conf import settings
+from django.db import close_old_connections, connections
+from six import text_type
+
+import time
+
+import logging
+logger = logging.getLogger(__name__)
+
+OK = 'ok'
+ERROR = 'error'
+TIMEOUT = 'timeout'
+
+
+def _run_in_thread(request, function, course_key, started, index):
+    """
+        Worker thread: current request of the view (site configuration) and own DB connections.
+        The start time of the course (its deadline) is stored in started[index]
+    """
+    started[index] = time.time()
+    set_current_request(request)
+    close_old_connections()
+    try:
+        return function(course_key)
+    finally:
+        set_current_request(None)
+        connections.close_all()
+
+
+def map_courses(function, course_keys, max_workers=None, timeout=None):
+    """
+        Run function(course_key) for each course concurrently in a bounded thread pool
+        (EOL_PROGRESS_TAB_OVERVIEW_WORKERS), each course with its own deadline
+        (EOL_PROGRESS_TAB_OVERVIEW_TIMEOUT seconds since a worker started it).
+        Returns [(course_key, status, result)] in course_keys order, status: 'ok', 'error' or 'timeout'.
+        Courses past their deadline finish in background (and fill the caches), queued courses are
+        cancelled when every worker is busy with a timed out course.
+        Zero workers runs the courses sequentially in the current thread (without deadline).
+    """
+    max_workers = settings.EOL_PROGRESS_TAB_OVERVIEW_WORKERS if max_workers is None else max_workers
+    timeout = settings.EOL_PROGRESS_TAB_OVERVIEW_TIMEOUT if timeout is None else timeout
+    course_keys = list(course_keys)
+    if max_workers < 1 or not course_keys:
+        return [_call(function, course_key) for course_key in course_keys]
+
+    request = get_current_request()
+    workers = min(max_workers, len(course_keys))
+    executor = ThreadPoolExecutor(max_workers=workers)
+    started = {}
+    futures = [
+        executor.submit(_run_in_thread, request, function, course_key, started, index)
+        for index, course_key in enumerate(course_keys)
+    ]
+    timed_out = {}
+    not_done = set(range(len(futures)))
+    while True:
+        now = time.time()
+        for index in list(not_done):
+            if futures[index].done():
+                not_done.discard(index)
+            elif index in started and now - started[index] >= timeout:
+                timed_out[index] = now - started[index]
+                not_done.discard(index)
+        busy = [index for index in timed_out if not futures[index].done()]
+        if len(busy) >= workers:
+            # no worker left for queued courses
+            for index in list(not_done):
+                if futures[index].cancel():
+                    timed_out[index] = 0.
+                    not_done.discard(index)
+        if not not_done:
+            break
+        deadlines = [started[index] + timeout for index in not_done if index in started]
+        wait(
+            [futures[index] for index in not_done] + [futures[index] for index in busy],
+            timeout=max(min(deadlines) - now, 0) if deadlines else timeout,
+            return_when=FIRST_COMPLETED
+        )
+    results = []
+    for index, (course_key, future) in enumerate(zip(course_keys, futures)):
+        if index in timed_out:
+            logger.info("EolProgressTab - Course overview timeout: %s (%.1fs)", text_type(course_key), timed_out[index])
+            results.append((course_key, TIMEOUT, None))
+        elif future.exception() is not None:
+            logger.error("EolProgressTab - Course overview failed: %s", text_type(course_key), exc_info=future.exception())
+            results.append((course_key, ERROR, None))
+        else:
+            results.append((course_key, OK, future.result()))
+    executor.shutdown(wait=False)
+    return results
+
+
+def _call(function, course_key):
+    try:
+        return course_key, OK, function(course_key)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("EolProgressTab - Course overview failed: %s", text_type(course_key))
+        return course_key, ERROR, None
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+from collections import namedtuple
+
+from django.conf import settings
+from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
+from six import text_type
+
+from lms.djangoapps.grades.config import should_persist_grades
+from lms.djangoapps.grades.models import PersistentCourseGrade, PersistentSubsectionGrade
+
+from .grading import category_percent, course_percent, is_passing, subsection_percent
+from .structure import get_course_structure, get_subsections_by_format
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Course grade summary read from persisted grades (what the summary payload uses from CourseGrade).
+# graded_subsections_by_format: { format: [subsection locations] } (no subsection grades)
+PersistedCourseGrade = namedtuple('PersistedCourseGrade', ['percent', 'passed', 'summary', 'graded_subsections_by_format'])
+
+
+def is_enabled():
+    """
+        Read-only fast path (EOL_PROGRESS_TAB_FAST_PATH on site configuration)
+    """
+    return configuration_helpers.get_value('EOL_PROGRESS_TAB_FAST_PATH', settings.EOL_PROGRESS_TAB_FAST_PATH)
+
+
+def get_subsection_percents(course_key, user_ids):
+    """
+        Persisted subsection grades of the users (overrides included)
+            { user_id: { subsection location: percent } }
+    """
+    subsection_percents = {user_id: {} for user_id in user_ids}
+    subsection_grades = PersistentSubsectionGrade.objects.filter(
+        course_id=course_key,
+        user_id__in=user_ids
+    ).values_list(
+        'user_id', 'usage_key', 'earned_graded', 'possible_graded',
+        'override__earned_graded_override', 'override__possible_graded_override'
+    )
+    for user_id, usage_key, earned, possible, earned_override, possible_override in subsection_grades.iterator():
+        subsection_percents[user_id][text_type(usage_key)] = subsection_percent(
+            earned if earned_override is None else earned_override,
+            possible if possible_override is None else possible_override
+        )
+    return subsection_percents
+
+
+def read_course_grade(user, course, structure=None):
+    """
+        Category breakdown and final percent from persisted subsection grades (overrides included)
+        and the course grader configuration, without the course block structure.
+        Subsections without a persisted grade were never attempted (0%, like the grader).
+        None when the student grade was never persisted or the course has content group
+        subsections (CourseGradeFactory must compute it).
+    """
+    if not should_persist_grades(course.id):
+        return None
+    if not PersistentCourseGrade.objects.filter(user_id=user.id, course_id=course.id).exists():
+        return None
+    structure = structure if structure is not None else get_course_structure(course)
+    if any(subsection['restricted'] for subsection in structure.values()):
+        # content group subsections are graded only for the students of the group
+        return None
+    subsection_percents = get_subsection_percents(course.id, [user.id])[user.id]
+    subsections_by_format = get_subsections_by_format(structure)
+    section_breakdown = []
+    weighted_percent = 0.
+    for grader, assignment_type, weight in course.grader.subgraders:
+        percent = category_percent(
+            [subsection_percents.get(location, 0.) for location in subsections_by_format.get(assignment_type, [])],
+            grader.drop_count,
+            grader.min_count
+        )
+        weighted_percent += percent * weight
+        section_breakdown.append({
+            'category'  : getattr(grader, 'category', None) or assignment_type,
+            'label'     : getattr(grader, 'short_label', None) or assignment_type,
+            'percent'   : percent,
+            'detail'    : '',
+            'prominent' : True,
+        })
+    percent = course_percent(weighted_percent)
+    return PersistedCourseGrade(
+        percent,
+        is_passing(course.grade_cutoffs, percent),
+        {'percent': percent, 'section_breakdown': section_breakdown},
+        subsections_by_format
+    )
+
+
+def compare_course_grades(persisted_grade, course_grade):
+    """
+        Differences between the fast path and CourseGradeFactory: [(name, persisted, computed)]
+    """
+    differences = []
+    if persisted_grade.percent != course_grade.percent:
+        differences.append(('percent', persisted_grade.percent, course_grade.percent))
+    if persisted_grade.passed != course_grade.passed:
+        differences.append(('passed', persisted_grade.passed, course_grade.passed))
+    computed = {
+        grade['category']: grade['percent']
+        for grade in course_grade.summary['section_breakdown'] if 'prominent' in grade
+    }
+    for grade in persisted_grade.summary['section_breakdown']:
+        if abs(computed.get(grade['category'], 0.) - grade['percent']) > 1e-9:
+            differences.append((grade['category'], grade['percent'], computed.get(grade['category'])))
+    return differences
@@ -1,5 +1,4 @@
 from django.conf import settings
-from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
 from django.utils.translation import ugettext_noop
 
 from courseware.tabs import EnrolledTab
@@ -38,4 +37,5 @@ class EolProgressTab(TabFragmentViewMixin, EnrolledTab):
         """
         if not super(EolProgressTab, cls).is_enabled(course, user):
             return False
-        return configuration_helpers.get_value('EOL_PROGRESS_TAB_ENABLED', False)
+        from .visibility import is_site_enabled  # tabs are loaded before the apps
+        return is_site_enabled()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+from collections import namedtuple
+
+from django.contrib.auth.models import User
+
+from course_modes.models import CourseMode
+from lms.djangoapps.certificates.models import CertificateWhitelist, GeneratedCertificate
+from student.models import CourseEnrollment
+
+# Per student data of multi-student requests (enrollment_mode/certificate are None when missing).
+# certificate & whitelisted only decide if get_cert_data can be skipped (see certificate_unavailable)
+StudentRecord = namedtuple('StudentRecord', ['user', 'enrollment_mode', 'certificate', 'whitelisted'])
+
+
+def prefetch_students(course_key, users):
+    """
+        {user_id: StudentRecord} of users (User objects or user ids) in a constant number of queries:
+        users (only when ids are given), enrollments, generated certificates and certificate whitelist.
+    """
+    users = list(users)
+    if users and not isinstance(users[0], User):
+        users = list(User.objects.filter(pk__in=users).order_by('id'))
+    if not users:
+        return {}
+    user_ids = [user.id for user in users]
+    enrollments = dict(CourseEnrollment.objects.filter(
+        course_id=course_key,
+        user_id__in=user_ids
+    ).values_list('user_id', 'mode'))
+    certificates = {
+        certificate.user_id: certificate
+        for certificate in GeneratedCertificate.objects.filter(course_id=course_key, user_id__in=user_ids)
+    }
+    whitelisted = set(CertificateWhitelist.objects.filter(
+        course_id=course_key,
+        user_id__in=user_ids,
+        whitelist=True
+    ).values_list('user_id', flat=True))
+    return {
+        user.id: StudentRecord(
+            user,
+            enrollments.get(user.id),
+            certificates.get(user.id),
+            user.id in whitelisted
+        )
+        for user in users
+    }
+
+
+def certificate_unavailable(student, course_grade):
+    """
+        True when get_cert_data has nothing to show, decided from prefetched data:
+        certificate eligible enrollment, no generated certificate, not whitelisted and not passing.
+        Any other case needs get_cert_data (one student at a time: status, messages and urls depend on
+        the certificate and the course certificates configuration), the prefetch only avoids it for
+        students who can't get a certificate.
+    """
+    return (
+        student.enrollment_mode is not None
+        and CourseMode.is_eligible_for_certificate(student.enrollment_mode)
+        and student.certificate is None
+        and not student.whitelisted
+        and not course_grade.passed
+    )
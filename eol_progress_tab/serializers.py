@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.utils.functional import Promise
+from six import string_types, text_type
+
+import datetime
+import json
+import numpy
+
+try:
+    import orjson
+except ImportError:  # optional faster backend
+    orjson = None
+
+
+def _default(obj):
+    """
+        Types not supported by json: NumPy scalars/arrays, datetimes (progress tab format)
+        and lazy translation strings
+    """
+    if isinstance(obj, numpy.generic):
+        return obj.item()
+    if isinstance(obj, numpy.ndarray):
+        return obj.tolist()
+    if isinstance(obj, datetime.datetime):
+        return obj.strftime('%Y-%m-%dT%H:%M:%S%z')
+    if isinstance(obj, Promise):
+        return text_type(obj)
+    raise TypeError('Object of type {} is not JSON serializable'.format(type(obj).__name__))
+
+
+class ProgressTabJSONEncoder(DjangoJSONEncoder):
+    def default(self, o):  # pylint: disable=method-hidden
+        try:
+            return _default(o)
+        except TypeError:
+            return super(ProgressTabJSONEncoder, self).default(o)
+
+
+def dumps(data, fast=None):
+    """
+        Serialize a progress tab payload (compact json str).
+        Uses orjson when installed and fast (default: EOL_PROGRESS_TAB_FAST_JSON) is enabled.
+    """
+    if fast is None:
+        fast = settings.EOL_PROGRESS_TAB_FAST_JSON
+    if orjson is not None and fast:
+        return orjson.dumps(
+            data,
+            default=_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        ).decode('utf-8')
+    return json.dumps(data, cls=ProgressTabJSONEncoder, separators=(',', ':'))
+
+
+class JsonPayloadResponse(HttpResponse):
+    """
+        application/json response from a payload (dict/list) or an already serialized json str
+    """
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        if not isinstance(data, (string_types, bytes)):
+            data = dumps(data)
+        super(JsonPayloadResponse, self).__init__(content=data, **kwargs)
@@ -3,3 +3,60 @@
 
 def plugin_settings(settings):
     settings.EOL_PROGRESS_TAB_DEV_URL = None
+    # student_data payload cache
+    settings.EOL_PROGRESS_TAB_CACHE_NAME = 'default'
+    settings.EOL_PROGRESS_TAB_CACHE_TIMEOUT = 60 * 60  # seconds, 0 disables the cache
+    settings.EOL_PROGRESS_TAB_CACHE_MAX_SIZE = 512 * 1024  # bytes, bigger payloads are not cached
+    # multi-student requests: users per grade batch
+    settings.EOL_PROGRESS_TAB_BULK_BATCH_SIZE = 100
+    # course structure index (keyed by course version)
+    settings.EOL_PROGRESS_TAB_STRUCTURE_TIMEOUT = 60 * 60 * 24
+    # scaled grade definition (site configuration overrides it)
+    settings.EOL_PROGRESS_TAB_GRADE_SCALE = {'min_grade': 1., 'max_grade': 7., 'pass_grade': 4.}
+    # grade statistics
+    settings.EOL_PROGRESS_TAB_STATS_REFRESH = 60 * 5  # seconds between incremental refreshes
+    settings.EOL_PROGRESS_TAB_STATS_TIMEOUT = 60 * 60 * 24
+    settings.EOL_PROGRESS_TAB_STATS_BIN_SIZE = 0.5  # histogram bucket size (scaled grade)
+    settings.EOL_PROGRESS_TAB_STATS_STUDENT_VISIBLE = False  # site configuration overrides it
+    settings.EOL_PROGRESS_TAB_STATS_MIN_STUDENTS = 5  # students don't see distributions of smaller courses
+    settings.EOL_PROGRESS_TAB_STATS_CHUNK_SIZE = 2000  # users per cached chunk (memcached 1 MB item limit)
+    # embed course_info & student_data in the rendered tab
+    settings.EOL_PROGRESS_TAB_EMBED_BOOTSTRAP = False
+    # serialize payloads with orjson when installed
+    settings.EOL_PROGRESS_TAB_FAST_JSON = True
+    # per phase timings (Server-Timing header for staff & log lines), site configuration overrides it
+    settings.EOL_PROGRESS_TAB_INSTRUMENTATION = False
+    # count Mongo commands (process wide pymongo listener, registered at startup)
+    settings.EOL_PROGRESS_TAB_MONGO_MONITORING = False
+    # precomputed student_data snapshots (site configuration overrides EOL_PROGRESS_TAB_SNAPSHOTS)
+    settings.EOL_PROGRESS_TAB_SNAPSHOTS = False
+    settings.EOL_PROGRESS_TAB_SNAPSHOT_SERVE_STALE = True  # serve stale snapshot while it is refreshed
+    settings.EOL_PROGRESS_TAB_SNAPSHOT_COUNTDOWN = 30  # seconds before refreshing after a change
+    # LMS celery queue of the tasks enqueued by Studio (course publish)
+    settings.EOL_PROGRESS_TAB_LMS_QUEUE = 'edx.lms.core.default'
+    # regrade on demand progress (seconds)
+    settings.EOL_PROGRESS_TAB_REGRADE_TIMEOUT = 60 * 60 * 24
+    # category detail pagination (subsections per page)
+    settings.EOL_PROGRESS_TAB_DETAIL_PAGE_SIZE = 20
+    settings.EOL_PROGRESS_TAB_DETAIL_MAX_PAGE_SIZE = 100
+    # tab visibility resolution TTL (invalidated on course publish & site configuration save)
+    settings.EOL_PROGRESS_TAB_VISIBILITY_TIMEOUT = 86400
+    # compact student_data versions kept for delta requests (seconds)
+    settings.EOL_PROGRESS_TAB_DELTA_TIMEOUT = 86400
+    # cache warm up after course publish (students: most recently active payloads, rate: students per second)
+    settings.EOL_PROGRESS_TAB_WARMUP = False
+    settings.EOL_PROGRESS_TAB_WARMUP_COUNTDOWN = 60
+    settings.EOL_PROGRESS_TAB_WARMUP_STUDENTS = 0
+    settings.EOL_PROGRESS_TAB_WARMUP_RATE = 10
+    # summary student_data from persisted subsection grades (site configuration overrides it)
+    settings.EOL_PROGRESS_TAB_FAST_PATH = False
+    # concurrent identical student_data computations (seconds): lock expiry, max wait and poll interval
+    settings.EOL_PROGRESS_TAB_COALESCE = True
+    settings.EOL_PROGRESS_TAB_COALESCE_LOCK_TIMEOUT = 30
+    settings.EOL_PROGRESS_TAB_COALESCE_WAIT = 10
+    settings.EOL_PROGRESS_TAB_COALESCE_POLL = 0.05
+    # browser reuse of student_data responses (seconds, bounded by the next problem scores visibility change)
+    settings.EOL_PROGRESS_TAB_MAX_AGE = 0
+    # multi-course overview: concurrent courses (threads, 0: sequential without deadline) and deadline of each course (seconds)
+    settings.EOL_PROGRESS_TAB_OVERVIEW_WORKERS = 4
+    settings.EOL_PROGRESS_TAB_OVERVIEW_TIMEOUT = 10
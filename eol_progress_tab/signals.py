@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from opaque_keys.edx.keys import CourseKey
+
+from lms.djangoapps.certificates.models import GeneratedCertificate
+from lms.djangoapps.grades.signals.signals import (
+    PROBLEM_WEIGHTED_SCORE_CHANGED,
+    SUBSECTION_OVERRIDE_CHANGED,
+    SUBSECTION_SCORE_CHANGED,
+)
+from openedx.core.djangoapps.signals.signals import COURSE_GRADE_CHANGED
+from openedx.core.djangoapps.site_configuration.models import SiteConfiguration
+from student.models import CourseEnrollment
+
+from . import cache, snapshots, tasks
+
+
+def _course_key(course_id):
+    if isinstance(course_id, CourseKey):
+        return course_id
+    return CourseKey.from_string(course_id)
+
+
+@receiver(PROBLEM_WEIGHTED_SCORE_CHANGED)
+@receiver(SUBSECTION_OVERRIDE_CHANGED)
+def score_changed_handler(sender, user_id, course_id, **kwargs):  # pylint: disable=unused-argument
+    """
+        Problem score or subsection override changed
+    """
+    cache.invalidate_student_data(_course_key(course_id), user_id)
+
+
+@receiver(SUBSECTION_SCORE_CHANGED)
+def subsection_score_changed_handler(sender, course, user, **kwargs):  # pylint: disable=unused-argument
+    """
+        Subsection grade recalculated
+    """
+    cache.invalidate_student_data(course.id, user.id)
+
+
+@receiver(COURSE_GRADE_CHANGED)
+def course_grade_changed_handler(sender, user, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+        Course grade recalculated
+    """
+    cache.invalidate_student_data(course_key, user.id)
+    if snapshots.is_enabled():
+        tasks.enqueue_student_snapshot(course_key, user.id)
+
+
+@receiver(post_save, sender=GeneratedCertificate)
+def certificate_saved_handler(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+        Certificate generated or status changed (certificate_data)
+    """
+    cache.invalidate_student_data(instance.course_id, instance.user_id)
+    if snapshots.is_enabled():
+        tasks.enqueue_student_snapshot(instance.course_id, instance.user_id)
+
+
+@receiver(post_save, sender=CourseEnrollment)
+def enrollment_saved_handler(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+        Enrollment mode (certificate_data) or active status changed
+    """
+    cache.invalidate_student_data(instance.course_id, instance.user_id)
+    if snapshots.is_enabled():
+        if instance.is_active:
+            tasks.enqueue_student_snapshot(instance.course_id, instance.user_id)
+        else:
+            snapshots.delete_snapshot(instance.course_id, instance.user_id)
+
+
+@receiver(post_save, sender=SiteConfiguration)
+def site_configuration_saved_handler(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+        Site configuration changed, invalidate values resolved from it (tab visibility)
+    """
+    cache.bump_site_generation(instance.site_id)
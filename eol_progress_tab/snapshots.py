@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+from django.conf import settings
+from django.utils import timezone
+from lms.djangoapps.certificates.models import GeneratedCertificate
+from lms.djangoapps.grades.models import PersistentCourseGrade
+from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
+
+from . import cache, serializers
+from .models import StudentProgressSnapshot
+
+import json
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+def is_enabled():
+    return configuration_helpers.get_value('EOL_PROGRESS_TAB_SNAPSHOTS', settings.EOL_PROGRESS_TAB_SNAPSHOTS)
+
+
+def get_snapshot(course, user_id):
+    """
+        (snapshot, stale) of the user, (None, None) if there is no snapshot.
+        Stale when the course changed, a due date changed the problem scores visibility
+        or the grade or the certificate was updated after the snapshot.
+    """
+    snapshot = StudentProgressSnapshot.objects.filter(user_id=user_id, course_id=course.id).first()
+    if snapshot is None:
+        return None, None
+    stale = snapshot.course_version != cache.get_student_data_version(course) or (
+        snapshot.scores_expire is not None and timezone.now() > snapshot.scores_expire
+    ) or PersistentCourseGrade.objects.filter(
+        user_id=user_id,
+        course_id=course.id,
+        modified__gt=snapshot.computed_at
+    ).exists() or GeneratedCertificate.objects.filter(
+        user_id=user_id,
+        course_id=course.id,
+        modified_date__gt=snapshot.computed_at
+    ).exists()
+    return snapshot, stale
+
+
+def save_snapshot(course, user_id, data, scores_expire=None):
+    """
+        Store student_data json payload (valid until scores_expire)
+    """
+    StudentProgressSnapshot.objects.update_or_create(
+        user_id=user_id,
+        course_id=course.id,
+        defaults={
+            'payload'       : data,
+            'course_version': cache.get_student_data_version(course),
+            'scores_expire' : scores_expire,
+        }
+    )
+
+
+def delete_snapshot(course_key, user_id):
+    """
+        Remove the snapshot of the user (enrollment deactivated)
+    """
+    StudentProgressSnapshot.objects.filter(user_id=user_id, course_id=course_key).delete()
+
+
+def snapshot_payload(snapshot, stale, summary=False):
+    """
+        Snapshot payload with staleness indicator
+    """
+    student_data = json.loads(snapshot.payload)
+    if summary:
+        for category_grade in student_data['category_grades']:
+            category_grade['detail_count'] = len(category_grade.pop('detail'))
+    student_data['snapshot'] = {
+        'computed_at'   : snapshot.computed_at,
+        'stale'         : stale,
+    }
+    return serializers.dumps(student_data)
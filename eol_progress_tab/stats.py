@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+from django.conf import settings
+from lms.djangoapps.grades.models import PersistentCourseGrade
+from six import text_type
+from student.models import CourseEnrollment
+
+from . import cache, persisted
+from .grading import category_percent, get_grade_scale, grade_percents_scaled
+from .structure import get_course_structure, get_subsections_by_format
+
+import numpy
+import time
+
+import logging
+logger = logging.getLogger(__name__)
+
+CACHE_NAME = 'statistics'
+PERCENTILES = [10, 25, 50, 75, 90]
+
+
+def get_grade_statistics(course):
+    """
+        Distribution of final and category scaled grades of the course.
+        Computed from persisted grades and refreshed incrementally (only users with
+        grades modified since last refresh) every EOL_PROGRESS_TAB_STATS_REFRESH seconds.
+        Users grades are cached in chunks of EOL_PROGRESS_TAB_STATS_CHUNK_SIZE users (cache item size limit).
+    """
+    state = cache.get_course_value(course, CACHE_NAME)
+    if state is not None and time.time() - state['refreshed_at'] < settings.EOL_PROGRESS_TAB_STATS_REFRESH:
+        return state['statistics']
+    users = _get_cached_users(course, state) if state is not None else None
+    if users is None:
+        # first refresh or evicted chunk: read every grade again
+        state, users = None, {}
+    state, users = _refresh_state(course, state, users)
+    state['chunks'] = _set_cached_users(course, users)
+    cache.set_course_value(course, CACHE_NAME, state, settings.EOL_PROGRESS_TAB_STATS_TIMEOUT)
+    return state['statistics']
+
+
+def _chunk_name(index):
+    return '{}.users.{}'.format(CACHE_NAME, index)
+
+
+def _get_cached_users(course, state):
+    """
+        Users grades of the last refresh, None if a chunk is missing or stale
+    """
+    names = [_chunk_name(index) for index in range(state['chunks'])]
+    chunks = cache.get_course_values(course, names)
+    if len(chunks) != len(names):
+        return None
+    users = {}
+    for chunk in chunks.values():
+        users.update(chunk)
+    return users
+
+
+def _set_cached_users(course, users):
+    """
+        Store users grades in chunks (ordered by user id), returns the number of chunks
+    """
+    user_ids = sorted(users)
+    chunk_size = settings.EOL_PROGRESS_TAB_STATS_CHUNK_SIZE
+    chunks = {
+        _chunk_name(index): {user_id: users[user_id] for user_id in user_ids[start:start + chunk_size]}
+        for index, start in enumerate(range(0, len(user_ids), chunk_size))
+    }
+    cache.set_course_values(course, chunks, settings.EOL_PROGRESS_TAB_STATS_TIMEOUT)
+    return len(chunks)
+
+
+def _refresh_state(course, state, users):
+    """
+        Update users grades modified after the last refresh and recompute statistics
+    """
+    refreshed_at = time.time()
+    users = dict(users)
+    last_modified = state['last_modified'] if state else None
+
+    course_grades = PersistentCourseGrade.objects.filter(course_id=course.id)
+    if last_modified is not None:
+        # gte: grades saved on the same instant as the last refresh are read again
+        course_grades = course_grades.filter(modified__gte=last_modified)
+    changed = {}
+    for user_id, percent, modified in course_grades.values_list('user_id', 'percent_grade', 'modified').iterator():
+        changed[user_id] = percent
+        if last_modified is None or modified > last_modified:
+            last_modified = modified
+    users.update(_get_users_grades(course, changed))
+
+    enrolled = set(
+        CourseEnrollment.objects.filter(course_id=course.id, is_active=True).values_list('user_id', flat=True)
+    )
+    users = {user_id: grades for user_id, grades in users.items() if user_id in enrolled}
+    logger.info(
+        "EolProgressTab - Statistics refreshed: %s (%s changed, %s users)",
+        text_type(course.id), len(changed), len(users)
+    )
+    state = {
+        'last_modified' : last_modified,
+        'refreshed_at'  : refreshed_at,
+        'statistics'    : _compute_statistics(course, users),
+    }
+    return state, users
+
+
+def _get_users_grades(course, final_percents):
+    """
+        Final and category percents (course.grader.subgraders order) of users from persisted
+        subsection grades (overrides included) of the graded subsections index (staff only and orphan
+        subsections are not counted, see structure.build_course_structure)
+            { user_id: (final percent, (category percents)) }
+    """
+    subsections_by_format = get_subsections_by_format(get_course_structure(course))
+    users = {}
+    user_ids = list(final_percents.keys())
+    for start in range(0, len(user_ids), settings.EOL_PROGRESS_TAB_BULK_BATCH_SIZE):
+        batch = user_ids[start:start + settings.EOL_PROGRESS_TAB_BULK_BATCH_SIZE]
+        subsection_percents = persisted.get_subsection_percents(course.id, batch)
+        for user_id in batch:
+            users[user_id] = (
+                final_percents[user_id],
+                tuple(
+                    category_percent(
+                        [
+                            subsection_percents[user_id].get(location, 0.)
+                            for location in subsections_by_format.get(assignment_type, [])
+                        ],
+                        grader.drop_count,
+                        grader.min_count
+                    )
+                    for grader, assignment_type, __ in course.grader.subgraders
+                )
+            )
+    return users
+
+
+def _compute_statistics(course, users):
+    """
+        Statistics of final and category scaled grades
+    """
+    grade_cutoff = min(course.grade_cutoffs.values())
+    scale = get_grade_scale()
+    finals = [final for final, __ in users.values()]
+    statistics = {
+        'count'         : len(finals),
+        'grade_cutoff'  : grade_cutoff,
+        'final_grade'   : _distribution(finals, grade_cutoff, scale),
+        'category_grades': [
+            dict(
+                _distribution([categories[index] for __, categories in users.values()], grade_cutoff, scale),
+                category=assignment_type.title()
+            )
+            for index, (__, assignment_type, ___) in enumerate(course.grader.subgraders)
+        ]
+    }
+    return statistics
+
+
+def _distribution(percents, grade_cutoff, scale):
+    """
+        Histogram (scaled grades), mean, median, percentiles and pass rate
+    """
+    if not percents:
+        return {'histogram': [], 'mean': None, 'median': None, 'percentiles': {}, 'pass_rate': None}
+    percents = numpy.asarray(percents, dtype=float)
+    scaled = grade_percents_scaled(percents, grade_cutoff, scale)
+    bin_size = settings.EOL_PROGRESS_TAB_STATS_BIN_SIZE
+    edges = numpy.arange(scale.min_grade, scale.max_grade + bin_size, bin_size)
+    edges[-1] = scale.max_grade
+    counts, edges = numpy.histogram(scaled, bins=edges)
+    return {
+        'histogram'     : [
+            {'from': round(float(edges[i]), 2), 'to': round(float(edges[i + 1]), 2), 'count': int(count)}
+            for i, count in enumerate(counts)
+        ],
+        'mean'          : round(float(numpy.mean(scaled)), 2),
+        'median'        : round(float(numpy.median(scaled)), 2),
+        'percentiles'   : {
+            text_type(percentile): round(float(value), 2)
+            for percentile, value in zip(PERCENTILES, numpy.percentile(scaled, PERCENTILES))
+        },
+        'pass_rate'     : round(float(numpy.mean(percents >= grade_cutoff)), 4),
+    }
+
+
+def anonymize(statistics):
+    """
+        Student visible statistics. Distributions are hidden when there are too few students.
+    """
+    if statistics['count'] < settings.EOL_PROGRESS_TAB_STATS_MIN_STUDENTS:
+        return {'count': None, 'grade_cutoff': statistics['grade_cutoff'], 'final_grade': None, 'category_grades': []}
+    return statistics
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+from django.conf import settings
+from django.urls import reverse
+from six import string_types, text_type
+from xmodule.block_metadata_utils import display_name_with_default
+from xmodule.modulestore.django import modulestore
+
+from . import cache
+
+import logging
+logger = logging.getLogger(__name__)
+
+# versioned with the index format (v2: display names not html escaped, v3: course order without hidden subsections)
+CACHE_NAME = 'structure.v3'
+
+
+def get_course_structure(course):
+    """
+        Graded subsections index of the course (student independent), built once per course version.
+            { subsection location: { url, due, due_date, format, display_name, show_correctness, restricted } }
+        in course order
+    """
+    structure = cache.get_course_value(course, CACHE_NAME)
+    if structure is None:
+        structure = build_course_structure(course.id)
+        cache.set_course_value(course, CACHE_NAME, structure, settings.EOL_PROGRESS_TAB_STRUCTURE_TIMEOUT)
+    return structure
+
+
+def build_course_structure(course_key):
+    """
+        Walk the course tree in course order (section -> subsection) like the grades block structure:
+        orphan and staff only (visible_to_staff_only on the section or the subsection) subsections
+        are not graded for students. restricted: content group access (student dependent)
+    """
+    structure = {}
+    course = modulestore().get_course(course_key, depth=2)
+    for chapter in course.get_children():
+        if chapter.visible_to_staff_only:
+            continue
+        for subsection in chapter.get_children():
+            if subsection.visible_to_staff_only or not subsection.graded:
+                continue
+            # version/branch agnostic key (same as persisted grades and block structure locations)
+            location = course_key.make_usage_key(subsection.location.block_type, subsection.location.block_id)
+            structure[text_type(location)] = {
+                'url'               : get_subsection_url(location, course_key),
+                'due'               : format_date(subsection.due),
+                'due_date'          : subsection.due,
+                'format'            : subsection.format,
+                'display_name'      : display_name_with_default(subsection),
+                'show_correctness'  : subsection.show_correctness,
+                'restricted'        : _has_group_access(chapter) or _has_group_access(subsection),
+            }
+    logger.info("EolProgressTab - Course structure built: %s (%s graded subsections)", text_type(course_key), len(structure))
+    return structure
+
+
+def _has_group_access(block):
+    """
+        Content group restriction: group_access { partition id: [group ids] }
+    """
+    return any((getattr(block, 'group_access', None) or {}).values())
+
+
+def get_subsection_url(location, course_key):
+    """
+        URL Redirect to specific location in the course
+    """
+    return reverse(
+        'jump_to', 
+        kwargs=dict(
+            course_id=text_type(course_key),
+            location=text_type(location)
+        )
+    )
+
+
+def format_date(date):
+    if not isinstance(date, string_types) and date is not None:
+        date = date.strftime('%Y-%m-%dT%H:%M:%S%z')
+    return date
+
+
+def get_subsections_by_format(structure):
+    """
+        Graded subsection locations grouped by format (course order)
+    """
+    subsections_by_format = {}
+    for location, subsection in structure.items():
+        subsections_by_format.setdefault(subsection['format'], []).append(location)
+    return subsections_by_format
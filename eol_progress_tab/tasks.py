@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+from celery import shared_task
+from courseware.courses import get_course_by_id
+from django.conf import settings
+from lms.djangoapps.grades.course_grade_factory import CourseGradeFactory
+from opaque_keys.edx.keys import CourseKey
+from student.models import CourseEnrollment
+
+from . import cache, snapshots
+from .grades import build_student_data_json, get_student_data_version, iter_course_grades
+from .prefetch import prefetch_students
+
+import uuid
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='eol_progress_tab.tasks.course_published')
+def course_published(course_id):
+    """
+        Course content changed (enqueued by cms_signals on Studio publish): invalidate
+        all course payloads, refresh snapshots and warm up the course caches
+    """
+    cache.bump_course_generation(CourseKey.from_string(course_id))
+    if snapshots.is_enabled():
+        refresh_course_snapshots.apply_async(
+            args=[course_id],
+            countdown=settings.EOL_PROGRESS_TAB_SNAPSHOT_COUNTDOWN
+        )
+    if settings.EOL_PROGRESS_TAB_WARMUP:
+        warm_up_course.apply_async(
+            args=[course_id],
+            countdown=settings.EOL_PROGRESS_TAB_WARMUP_COUNTDOWN
+        )
+
+
+@shared_task(name='eol_progress_tab.tasks.site_configuration_changed')
+def site_configuration_changed(site_id):
+    """
+        Site configuration saved on Studio (enqueued by cms_signals): invalidate the tab visibility
+    """
+    cache.bump_site_generation(site_id)
+
+
+@shared_task(name='eol_progress_tab.tasks.refresh_student_snapshots')
+def refresh_student_snapshots(course_id, user_ids):
+    """
+        Compute and store student_data snapshots of a chunk of users
+    """
+    course_key = CourseKey.from_string(course_id)
+    course = get_course_by_id(course_key)
+    students = prefetch_students(course_key, user_ids)
+    users = [student.user for student in students.values()]
+    refreshed = 0
+    for user, course_grade, error in iter_course_grades(course, users):
+        if error:
+            continue
+        data, expires = build_student_data_json(user, course, course_grade, student=students[user.id])
+        snapshots.save_snapshot(course, user.id, data, expires)
+        refreshed += 1
+    logger.info("EolProgressTab - Snapshots refreshed: %s (%s/%s users)", course_id, refreshed, len(users))
+    return refreshed
+
+
+@shared_task(name='eol_progress_tab.tasks.refresh_course_snapshots')
+def refresh_course_snapshots(course_id):
+    """
+        Split active enrollments in chunks (one task per chunk)
+    """
+    user_ids = list(
+        CourseEnrollment.objects.filter(
+            course_id=CourseKey.from_string(course_id),
+            is_active=True
+        ).order_by('user_id').values_list('user_id', flat=True)
+    )
+    chunk_size = settings.EOL_PROGRESS_TAB_BULK_BATCH_SIZE
+    for start in range(0, len(user_ids), chunk_size):
+        refresh_student_snapshots.delay(course_id, user_ids[start:start + chunk_size])
+    return len(user_ids)
+
+
+def enqueue_student_snapshot(course_key, user_id):
+    """
+        Refresh one student snapshot after EOL_PROGRESS_TAB_SNAPSHOT_COUNTDOWN (groups score bursts),
+        at most one pending refresh per student (stale snapshot hits and signals)
+    """
+    if not cache.add_snapshot_refresh(course_key, user_id, settings.EOL_PROGRESS_TAB_SNAPSHOT_COUNTDOWN):
+        return
+    refresh_student_snapshots.apply_async(
+        args=[str(course_key), [user_id]],
+        countdown=settings.EOL_PROGRESS_TAB_SNAPSHOT_COUNTDOWN
+    )
+
+
+@shared_task(name='eol_progress_tab.tasks.regrade_students')
+def regrade_students(task_id, course_id, user_ids):
+    """
+        Recompute (force update) grades of a chunk of users and store fresh payloads
+        in cache and snapshots. Progress is counted in cache (task_id).
+    """
+    course_key = CourseKey.from_string(course_id)
+    course = get_course_by_id(course_key)
+    for student in prefetch_students(course_key, user_ids).values():
+        user = student.user
+        try:
+            course_grade = CourseGradeFactory().update(user, course=course, force_update_subsections=True)
+            data, expires = build_student_data_json(user, course, course_grade, student=student)
+            cache.set_student_data(course, user.id, data, expires=expires, etag=get_student_data_version(user, course)[0])
+            if snapshots.is_enabled():
+                snapshots.save_snapshot(course, user.id, data, expires)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("EolProgressTab - Regrade failed (user: %s, course: %s)", user.id, course_id)
+            cache.incr_regrade_progress(task_id, 'failed')
+        else:
+            cache.incr_regrade_progress(task_id, 'done')
+
+
+def start_regrade(course_key, user_ids):
+    """
+        Enqueue regrade of users split in chunks (EOL_PROGRESS_TAB_BULK_BATCH_SIZE) for the worker pool.
+        Returns task id for progress polling.
+    """
+    task_id = uuid.uuid4().hex
+    cache.init_regrade_progress(task_id, course_key, user_ids)
+    chunk_size = settings.EOL_PROGRESS_TAB_BULK_BATCH_SIZE
+    for start in range(0, len(user_ids), chunk_size):
+        regrade_students.delay(task_id, str(course_key), user_ids[start:start + chunk_size])
+    return task_id
+
+
+@shared_task(name='eol_progress_tab.tasks.warm_up_course')
+def warm_up_course(course_id):
+    """
+        Warm up the course caches after a publish (see warmup.py)
+    """
+    from .warmup import warm_up_course as _warm_up_course
+    return _warm_up_course(
+        CourseKey.from_string(course_id),
+        students=settings.EOL_PROGRESS_TAB_WARMUP_STUDENTS,
+        rate=settings.EOL_PROGRESS_TAB_WARMUP_RATE
+    )
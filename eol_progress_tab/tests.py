@@ -3,7 +3,9 @@
 
 from mock import patch, Mock
 
-from django.test import TestCase, Client
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import Client
 from django.urls import reverse
 
 from util.testing import UrlResetMixin
@@ -14,14 +16,33 @@ from capa.tests.response_xml_factory import StringResponseXMLFactory
 from student.tests.factories import UserFactory, CourseEnrollmentFactory
 from student.roles import CourseStaffRole
 
+from lms.djangoapps.certificates.models import GeneratedCertificate
+from lms.djangoapps.certificates.tests.factories import GeneratedCertificateFactory
+from lms.djangoapps.courseware.tests.factories import StudentModuleFactory
 from lms.djangoapps.grades.course_grade_factory import CourseGradeFactory
+from lms.djangoapps.grades.models import PersistentCourseGrade
+from openedx.core.djangoapps.course_groups.models import CourseUserGroup
+from student.models import CourseEnrollment
 
-from . import views
+from . import (
+    cache, cms_signals, grades, grading, instrumentation, overview, persisted, prefetch, serializers, signals, stats, structure,
+    tasks, views, visibility, warmup
+)
+from .models import StudentProgressSnapshot
+from .plugins import EolProgressTab
 
 import datetime
-from six import text_type
+import json
+import os
+import tempfile
+import threading
+import time
+from six import StringIO, text_type
 
 from django.utils import timezone
+from django.utils.translation import ugettext_lazy
+from numpy import around
+import numpy
 from datetime import timedelta
 
 class TestEolProgressTabView(UrlResetMixin, ModuleStoreTestCase):
@@ -104,17 +125,44 @@ class TestEolProgressTabView(UrlResetMixin, ModuleStoreTestCase):
                 for __ in range(5)
             ]
 
+    def _create_hidden_subsections(self):
+        """
+            Graded Homework subsections never graded for students: staff only and orphan
+        """
+        chapter_location = self.store.get_course(self.course.id).children[0]
+        with self.store.bulk_operations(self.course.id, emit_signals=False):
+            staff_only = ItemFactory.create(
+                parent_location=chapter_location,
+                category="sequential",
+                metadata={'graded': True, 'format': 'Homework', 'visible_to_staff_only': True}
+            )
+            ItemFactory.create(
+                parent_location=staff_only.location,
+                category="problem",
+                data=StringResponseXMLFactory().build_xml(answer='foo')
+            )
+            orphan = self.store.create_item(
+                self.staff_user.id, self.course.id, 'sequential', fields={'graded': True, 'format': 'Homework'}
+            )
+        cache.get_cache().clear()
+        return staff_only, orphan
+
     @patch("eol_progress_tab.views._has_page_access")
     def test_render_page(self, has_page_access):
         """
             Test correct render page with an IFrame
         """
-        has_page_access.side_effect = [True]
+        has_page_access.return_value = True
         url = reverse('eol_progress_tab_view',
                       kwargs={'course_id': self.course.id})
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
         self.assertIn( 'id="reactIframe"', response.content.decode("utf-8"))
+        self.assertNotIn( 'id="eol-progress-tab-bootstrap"', response.content.decode("utf-8"))
+
+        with self.settings(EOL_PROGRESS_TAB_EMBED_BOOTSTRAP=True):
+            response = self.client.get(url)
+        self.assertIn( 'id="eol-progress-tab-bootstrap"', response.content.decode("utf-8"))
 
     def test_grade_percent_scaled(self):
         """
@@ -213,10 +261,10 @@ class TestEolProgressTabView(UrlResetMixin, ModuleStoreTestCase):
                 "percent":0.0
             }
         ]
-        student_category_grades = filter(views._prominent_section_filter, section_breakdown)
+        student_category_grades = filter(grades.prominent_section_filter, section_breakdown)
         self.assertEqual(len(list(student_category_grades)), 3) # new length should be 3.
 
-    @patch("eol_progress_tab.views.get_cert_data")
+    @patch("eol_progress_tab.grades.get_cert_data")
     def test_get_certificate_data(self, get_cert_data):
         """
             Test get certificate data.
@@ -228,7 +276,7 @@ class TestEolProgressTabView(UrlResetMixin, ModuleStoreTestCase):
         cert_data.msg = 'msg'
         get_cert_data.side_effect = [cert_data]
 
-        certificate_data = views._get_certificate_data(self.student, self.course, 'honor', {} )
+        certificate_data = grades.get_certificate_data(self.student, self.course, 'honor', {} )
         self.assertNotEqual(certificate_data, {}) # validate is not empty
         self.assertEqual(certificate_data['url'], 'url') # validate url
 
@@ -236,7 +284,7 @@ class TestEolProgressTabView(UrlResetMixin, ModuleStoreTestCase):
         """
             Test get subsection url with edX jump_to
         """
-        url = views._get_subsection_url('location', self.course.id)
+        url = structure.get_subsection_url('location', self.course.id)
         self.assertIn(text_type(self.course.id), url)
         self.assertIn('location', url)
         self.assertIn('jump_to', url)
@@ -247,7 +295,7 @@ class TestEolProgressTabView(UrlResetMixin, ModuleStoreTestCase):
             On test setup we create the course w/ some content (Homework & Homework_2).
         """
         course_grade = CourseGradeFactory().read(self.user, self.course)
-        category_scores_detail = views._get_category_scores_detail(course_grade, self.course.id)
+        category_scores_detail = grades.get_category_scores_detail(course_grade, self.course.id)
         self.assertTrue('HOMEWORK' in category_scores_detail)
         self.assertTrue('HOMEWORK_2' in category_scores_detail)
         self.assertEqual(len(category_scores_detail['HOMEWORK']), 1) # Homework has one section
@@ -259,23 +307,23 @@ class TestEolProgressTabView(UrlResetMixin, ModuleStoreTestCase):
         """
         show_correctness = 'always'
         due = None
-        show = views._show_problem_scores(show_correctness, due)
+        show = grades.show_problem_scores(show_correctness, due)
         self.assertTrue(show)
 
         show_correctness = 'never'
-        show = views._show_problem_scores(show_correctness, due)
+        show = grades.show_problem_scores(show_correctness, due)
         self.assertTrue(not show)
 
         show_correctness = 'past_due'
-        show = views._show_problem_scores(show_correctness, due)
+        show = grades.show_problem_scores(show_correctness, due)
         self.assertTrue(show)
 
         due = timezone.now() + timedelta(days=1)
-        show = views._show_problem_scores(show_correctness, due)
+        show = grades.show_problem_scores(show_correctness, due)
         self.assertTrue(not show)
 
         due = timezone.now() - timedelta(days=1)
-        show = views._show_problem_scores(show_correctness, due)
+        show = grades.show_problem_scores(show_correctness, due)
         self.assertTrue(show)
     
     @patch("eol_progress_tab.views._has_page_access")
@@ -315,4 +363,1173 @@ class TestEolProgressTabView(UrlResetMixin, ModuleStoreTestCase):
         self.assertTrue( 'final_grade_scaled' in data )
         self.assertTrue( 'passed' in data )
         self.assertTrue( 'certificate_data' in data )
-        self.assertTrue( 'category_grades' in data )
\ No newline at end of file
+        self.assertTrue( 'category_grades' in data )
+
+    @patch("eol_progress_tab.access.visibility.is_tab_visible")
+    @patch("eol_progress_tab.access.get_course_with_access")
+    def test_access_context_memoization(self, get_course_with_access, is_tab_visible):
+        """
+            Test access context loads course, staff flag, tabs, enrollment and entrance exam once
+        """
+        get_course_with_access.return_value = self.course
+        is_tab_visible.return_value = True
+        request = Mock(user=self.student, spec=['user'])
+
+        access = views.get_access_context(request, text_type(self.course.id))
+        self.assertIs(access, views.get_access_context(request, text_type(self.course.id)))
+        for __ in range(3):
+            self.assertTrue(views._has_page_access(access))
+            self.assertEqual(access.course, self.course)
+        self.assertEqual(get_course_with_access.call_count, 1)
+        self.assertEqual(is_tab_visible.call_count, 1)
+        self.assertEqual(access.counters['modulestore'], 1)
+        self.assertEqual(access.counters['tabs'], 1)
+        self.assertEqual(access.counters['db'], 3) # staff flag, enrollment & entrance exam
+
+    @patch("eol_progress_tab.access.visibility.is_tab_visible")
+    def test_access_context_not_enrolled(self, is_tab_visible):
+        """
+            Test access context denies users without an active enrollment
+        """
+        is_tab_visible.return_value = True
+        with patch('student.models.cc.User.save'):
+            user = UserFactory(username='not_enrolled', password='test', email='not_enrolled@edx.org')
+        request = Mock(user=user, spec=['user'])
+        access = views.get_access_context(request, text_type(self.course.id))
+        self.assertFalse(views._has_page_access(access))
+
+    @patch("eol_progress_tab.access.user_can_skip_entrance_exam")
+    @patch("eol_progress_tab.access.visibility.is_tab_visible")
+    def test_access_context_entrance_exam(self, is_tab_visible, user_can_skip_entrance_exam):
+        """
+            Test access context denies students who must complete the entrance exam (tab visibility stays cached)
+        """
+        is_tab_visible.return_value = True
+        user_can_skip_entrance_exam.return_value = False
+        for user, page_access in ((self.student, False), (self.staff_user, True)):
+            access = views.get_access_context(Mock(user=user, spec=['user']), text_type(self.course.id))
+            self.assertEqual(views._has_page_access(access), page_access)
+        self.assertEqual(user_can_skip_entrance_exam.call_count, 1)
+        self.assertEqual(user_can_skip_entrance_exam.call_args[0][0], self.student)
+
+        user_can_skip_entrance_exam.return_value = True
+        access = views.get_access_context(Mock(user=self.student, spec=['user']), text_type(self.course.id))
+        self.assertTrue(views._has_page_access(access))
+        self.assertEqual(is_tab_visible.call_count, 2)
+
+    @patch("eol_progress_tab.grades.get_student_data")
+    @patch("eol_progress_tab.views._has_page_access")
+    def test_get_student_data_cache(self, has_page_access, get_student_data):
+        """
+            Test student data payload is cached and invalidated on score changes
+        """
+        cache.get_cache().clear()
+        has_page_access.return_value = True
+        get_student_data.return_value = {'username': self.student.username}
+        url = reverse('eol_progress_tab_student_data',
+                      kwargs={'course_id': self.course.id, 'user_id': self.student.id})
+        for __ in range(3):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('username', response.content.decode("utf-8"))
+        self.assertEqual(get_student_data.call_count, 1)
+
+        # score changed
+        signals.score_changed_handler(None, user_id=self.student.id, course_id=text_type(self.course.id))
+        self.client.get(url)
+        self.assertEqual(get_student_data.call_count, 2)
+
+        # course published
+        tasks.course_published(text_type(self.course.id))
+        self.client.get(url)
+        self.assertEqual(get_student_data.call_count, 3)
+
+    @patch("eol_progress_tab.grades.get_student_data")
+    @patch("eol_progress_tab.views._has_page_access")
+    def test_get_student_data_cache_certificate_enrollment(self, has_page_access, get_student_data):
+        """
+            Test student data payload is invalidated on certificate and enrollment changes,
+            snapshots are refreshed or removed
+        """
+        cache.get_cache().clear()
+        has_page_access.return_value = True
+        get_student_data.return_value = {'username': self.student.username}
+        url = reverse('eol_progress_tab_student_data',
+                      kwargs={'course_id': self.course.id, 'user_id': self.student.id})
+        self.client.get(url)
+        self.client.get(url)
+        self.assertEqual(get_student_data.call_count, 1)
+
+        # certificate generated
+        certificate = GeneratedCertificateFactory(user=self.student, course_id=self.course.id, status='downloadable')
+        self.client.get(url)
+        self.assertEqual(get_student_data.call_count, 2)
+
+        # enrollment mode changed
+        enrollment = CourseEnrollment.objects.get(user=self.student, course_id=self.course.id)
+        enrollment.mode = 'verified'
+        enrollment.save()
+        self.client.get(url)
+        self.assertEqual(get_student_data.call_count, 3)
+
+        with self.settings(EOL_PROGRESS_TAB_SNAPSHOTS=True):
+            with patch("eol_progress_tab.signals.tasks.enqueue_student_snapshot") as enqueue_student_snapshot:
+                certificate.status = 'notpassing'
+                certificate.save()
+                enqueue_student_snapshot.assert_called_once_with(self.course.id, self.student.id)
+            views.snapshots.save_snapshot(self.course, self.student.id, '{}')
+            enrollment.is_active = False
+            enrollment.save()
+            self.assertFalse(StudentProgressSnapshot.objects.filter(user=self.student, course_id=self.course.id).exists())
+
+    @patch("eol_progress_tab.grades.get_student_data")
+    @patch("eol_progress_tab.views._has_page_access")
+    def test_get_student_data_cache_disabled(self, has_page_access, get_student_data):
+        """
+            Test student data is not cached when timeout is 0 or payload is too big
+        """
+        cache.get_cache().clear()
+        has_page_access.return_value = True
+        get_student_data.return_value = {'username': self.student.username}
+        url = reverse('eol_progress_tab_student_data',
+                      kwargs={'course_id': self.course.id, 'user_id': self.student.id})
+        with self.settings(EOL_PROGRESS_TAB_CACHE_TIMEOUT=0):
+            self.client.get(url)
+            self.client.get(url)
+        self.assertEqual(get_student_data.call_count, 2)
+        with self.settings(EOL_PROGRESS_TAB_CACHE_MAX_SIZE=1):
+            self.client.get(url)
+            self.client.get(url)
+        self.assertEqual(get_student_data.call_count, 4)
+
+    def test_get_bulk_student_data(self):
+        """
+            Test bulk student data streams one json line per enrolled student
+        """
+        cache.get_cache().clear()
+        url = reverse('eol_progress_tab_bulk_student_data',
+                      kwargs={'course_id': self.course.id})
+        # students can't access
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
+
+        response = self.staff_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = [json.loads(line) for line in b''.join(response.streaming_content).decode("utf-8").splitlines()]
+        self.assertEqual([line['username'] for line in lines], ['student', 'staff_user'])
+        for line in lines:
+            self.assertTrue( 'final_grade_scaled' in line )
+            self.assertTrue( 'category_grades' in line )
+
+        # filter by user ids
+        response = self.staff_client.get(url, {'user_ids': '{}'.format(self.student.id)})
+        lines = b''.join(response.streaming_content).decode("utf-8").splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])['username'], 'student')
+
+        response = self.staff_client.get(url, {'user_ids': 'abc'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_bulk_student_data_filters(self):
+        """
+            Test bulk student data filtered by enrollment mode and cohort of the course
+        """
+        cache.get_cache().clear()
+        url = reverse('eol_progress_tab_bulk_student_data',
+                      kwargs={'course_id': self.course.id})
+        # verified only in another course
+        other_course = CourseFactory.create(org='mss', course='998', display_name='other course')
+        CourseEnrollmentFactory(user=self.student, course_id=other_course.id, mode='verified')
+        CourseEnrollmentFactory(user=self.staff_user, course_id=other_course.id, mode='verified')
+        CourseEnrollment.objects.filter(user=self.staff_user, course_id=self.course.id).update(mode='verified')
+        response = self.staff_client.get(url, {'mode': 'verified'})
+        lines = [json.loads(line) for line in b''.join(response.streaming_content).decode("utf-8").splitlines()]
+        self.assertEqual([line['username'] for line in lines], ['staff_user'])
+
+        cohort = CourseUserGroup.objects.create(name='A', course_id=self.course.id, group_type=CourseUserGroup.COHORT)
+        cohort.users.add(self.student)
+        other_cohort = CourseUserGroup.objects.create(name='A', course_id=other_course.id, group_type=CourseUserGroup.COHORT)
+        other_cohort.users.add(self.student, self.staff_user)
+        response = self.staff_client.get(url, {'cohort': 'A'})
+        lines = [json.loads(line) for line in b''.join(response.streaming_content).decode("utf-8").splitlines()]
+        self.assertEqual([line['username'] for line in lines], ['student'])
+        response = self.staff_client.get(url, {'cohort': 'A', 'mode': 'verified'})
+        self.assertEqual(b''.join(response.streaming_content), b'')
+
+    def test_export_scaled_grades(self):
+        """
+            Test export scaled grades as csv and ndjson (with resume)
+        """
+        url = reverse('eol_progress_tab_export_scaled_grades',
+                      kwargs={'course_id': self.course.id})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
+
+        response = self.staff_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        lines = b''.join(response.streaming_content).decode("utf-8").splitlines()
+        self.assertEqual(len(lines), 3) # header + 2 users
+        self.assertTrue(lines[0].startswith('user_id,username,final_grade_percent,final_grade_scaled,passed,error'))
+        self.assertTrue(lines[1].startswith('{},student,0.0,1.0,False'.format(self.student.id)))
+
+        response = self.staff_client.get(url, {'format': 'ndjson', 'after': self.student.id})
+        lines = [json.loads(line) for line in b''.join(response.streaming_content).decode("utf-8").splitlines()]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]['username'], 'staff_user')
+        self.assertEqual(lines[0]['final_grade_scaled'], 1.)
+
+        response = self.staff_client.get(url, {'format': 'xml'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_scaled_grades_command(self):
+        """
+            Test export command writes checkpoint and resumes without repeating rows
+        """
+        output = tempfile.NamedTemporaryFile(suffix='.csv', delete=False).name
+        checkpoint = tempfile.NamedTemporaryFile(suffix='.json', delete=False).name
+        os.remove(checkpoint)
+        self.addCleanup(os.remove, output)
+        self.addCleanup(os.remove, checkpoint)
+
+        call_command('export_scaled_grades', text_type(self.course.id), '--output', output, '--checkpoint', checkpoint, '--batch-size', '1')
+        with open(output) as output_file:
+            self.assertEqual(len(output_file.read().splitlines()), 3)
+        with open(checkpoint) as checkpoint_file:
+            self.assertEqual(json.load(checkpoint_file)['last_user_id'], self.staff_user.id)
+
+        # simulate interrupted export after first user
+        with open(checkpoint, 'w') as checkpoint_file:
+            json.dump({'course_id': text_type(self.course.id), 'last_user_id': self.student.id, 'exported': 1}, checkpoint_file)
+        with open(output, 'w') as output_file:
+            output_file.write('header\nstudent\n')
+        call_command('export_scaled_grades', text_type(self.course.id), '--output', output, '--checkpoint', checkpoint, '--resume')
+        with open(output) as output_file:
+            lines = output_file.read().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn('staff_user', lines[2])
+
+    def test_get_course_structure(self):
+        """
+            Test course structure index is built once and reused by category scores detail
+        """
+        cache.get_cache().clear()
+        with patch("eol_progress_tab.structure.build_course_structure", wraps=structure.build_course_structure) as build:
+            course_structure = structure.get_course_structure(self.course)
+            self.assertEqual(structure.get_course_structure(self.course), course_structure)
+            self.assertEqual(build.call_count, 1)
+        self.assertEqual(len(course_structure), 3) # 3 graded subsections
+        self.assertEqual(
+            sorted(subsection['format'] for subsection in course_structure.values()),
+            ['Homework', 'Homework_2', 'Homework_2']
+        )
+        for subsection in course_structure.values():
+            self.assertIn('jump_to', subsection['url'])
+
+        course_grade = CourseGradeFactory().read(self.student, self.course)
+        with patch("eol_progress_tab.grades.get_subsection_url") as get_subsection_url:
+            category_scores_detail = grades.get_category_scores_detail(course_grade, self.course.id, course_structure)
+            self.assertFalse(get_subsection_url.called)
+        self.assertEqual(len(category_scores_detail['HOMEWORK_2']), 2)
+        for subsection in category_scores_detail['HOMEWORK_2']:
+            self.assertIn('jump_to', subsection['url'])
+
+    def test_grade_percents_scaled(self):
+        """
+            Test vectorized scale is identical to the scalar version (rounding & 3.9 clamp)
+        """
+        percents = [i / 1000. for i in range(1001)]
+        for grade_cutoff in [.03, .4, .5, .6, .8, .97]:
+            scaled = grading.grade_percents_scaled(percents, grade_cutoff)
+            self.assertEqual(
+                scaled.tolist(),
+                [views._grade_percent_scaled(percent, grade_cutoff) for percent in percents]
+            )
+        # students x categories, one cutoff per row
+        scaled = grading.grade_percents_scaled([[0., .79], [.7, .3]], [[.8], [.6]])
+        self.assertEqual(scaled.tolist(), [[1., 3.9], [4.8, 2.5]])
+
+    def test_grade_scale_config(self):
+        """
+            Test alternative grade scales (scalar and vectorized)
+        """
+        scale = grading.GradeScale(min_grade=0., max_grade=10., pass_grade=5.)
+        test_cases = [[.0, .6, 0.], [.3, .6, 2.5], [.6, .6, 5.], [1., .6, 10.], [.59, .6, 4.9]]  # [grade_percent, grade_cutoff, grade_scaled]
+        for tc in test_cases:
+            self.assertEqual(views._grade_percent_scaled(tc[0], tc[1], scale), tc[2])
+            self.assertEqual(grading.grade_percents_scaled([tc[0]], tc[1], scale).tolist(), [tc[2]])
+
+        with self.settings(EOL_PROGRESS_TAB_GRADE_SCALE={'max_grade': 100., 'pass_grade': 60.}):
+            self.assertEqual(grading.get_grade_scale(), grading.GradeScale(1., 100., 60.))
+            self.assertEqual(views._grade_percent_scaled(1., .6), 100.)
+
+    def test_category_percent(self):
+        """
+            Test category average with min_count and drop_count (AssignmentFormatGrader rules)
+        """
+        self.assertEqual(grading.category_percent([1., .5], 0, 1), .75)
+        self.assertEqual(grading.category_percent([1., .5], 1, 1), 1.)
+        self.assertEqual(grading.category_percent([1., .5], 0, 4), .375) # 2 missing subsections
+        self.assertEqual(grading.category_percent([1.], 1, 1), 0.) # all dropped
+        self.assertEqual(grading.subsection_percent(1, 3), .33)
+        self.assertEqual(grading.subsection_percent(0, 0), 0.)
+
+    @patch("eol_progress_tab.views._has_page_access")
+    def test_get_grade_statistics(self, has_page_access):
+        """
+            Test grade statistics from persisted grades (staff and student visibility)
+        """
+        cache.get_cache().clear()
+        has_page_access.return_value = True
+        PersistentCourseGrade.update_or_create(
+            user_id=self.student.id, course_id=self.course.id, percent_grade=.7,
+            grading_policy_hash='hash', letter_grade='Pass', passed=True
+        )
+        PersistentCourseGrade.update_or_create(
+            user_id=self.staff_user.id, course_id=self.course.id, percent_grade=.3,
+            grading_policy_hash='hash', letter_grade='', passed=False
+        )
+        url = reverse('eol_progress_tab_grade_statistics',
+                      kwargs={'course_id': self.course.id})
+        response = self.staff_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content.decode("utf-8"))
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(data['final_grade']['pass_rate'], .5)
+        self.assertEqual(data['final_grade']['mean'], 4.) # (5.2 + 2.8) / 2, cutoff 0.5
+        self.assertEqual(sum(bucket['count'] for bucket in data['final_grade']['histogram']), 2)
+
+        # students only if enabled and anonymized
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
+        with self.settings(EOL_PROGRESS_TAB_STATS_STUDENT_VISIBLE=True):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(json.loads(response.content.decode("utf-8"))['final_grade'], None) # less than 5 students
+            with self.settings(EOL_PROGRESS_TAB_STATS_MIN_STUDENTS=2):
+                response = self.client.get(url)
+                self.assertEqual(json.loads(response.content.decode("utf-8"))['final_grade']['mean'], 4.)
+
+    def test_grade_statistics_incremental(self):
+        """
+            Test statistics are cached and only changed grades are read again
+        """
+        cache.get_cache().clear()
+        PersistentCourseGrade.update_or_create(
+            user_id=self.student.id, course_id=self.course.id, percent_grade=.7,
+            grading_policy_hash='hash', letter_grade='Pass', passed=True
+        )
+        statistics = stats.get_grade_statistics(self.course)
+        self.assertEqual(statistics['count'], 1)
+        PersistentCourseGrade.update_or_create(
+            user_id=self.staff_user.id, course_id=self.course.id, percent_grade=.3,
+            grading_policy_hash='hash', letter_grade='', passed=False
+        )
+        # refresh interval not reached
+        self.assertEqual(stats.get_grade_statistics(self.course)['count'], 1)
+        with self.settings(EOL_PROGRESS_TAB_STATS_REFRESH=0):
+            with patch("eol_progress_tab.stats._get_users_grades", wraps=stats._get_users_grades) as get_users_grades:
+                self.assertEqual(stats.get_grade_statistics(self.course)['count'], 2)
+                # only the modified grade (and grades saved on the same instant as the last refresh)
+                self.assertLessEqual(len(get_users_grades.call_args[0][1]), 2)
+                self.assertIn(self.staff_user.id, get_users_grades.call_args[0][1])
+
+        # users grades cached in chunks, an evicted chunk reads every grade again
+        with self.settings(EOL_PROGRESS_TAB_STATS_REFRESH=0, EOL_PROGRESS_TAB_STATS_CHUNK_SIZE=1):
+            self.assertEqual(stats.get_grade_statistics(self.course)['count'], 2)
+            self.assertEqual(cache.get_course_value(self.course, stats.CACHE_NAME)['chunks'], 2)
+            self.assertEqual(len(cache.get_course_values(self.course, ['statistics.users.0', 'statistics.users.1'])), 2)
+            cache.get_cache().delete(cache._course_value_key(self.course.id, 'statistics.users.1'))
+            with patch("eol_progress_tab.stats._get_users_grades", wraps=stats._get_users_grades) as get_users_grades:
+                self.assertEqual(stats.get_grade_statistics(self.course)['count'], 2)
+                self.assertEqual(len(get_users_grades.call_args[0][1]), 2)
+
+    def test_grade_statistics_hidden_subsections(self):
+        """
+            Test category percents of the statistics match CourseGradeFactory with staff only and orphan subsections
+        """
+        self._create_hidden_subsections()
+        for index, item in enumerate(self.items):
+            StudentModuleFactory(
+                student=self.student, course_id=self.course.id, module_state_key=item.location,
+                grade=int(index > 0), max_grade=1, state='{}'
+            )
+        course_grade = CourseGradeFactory().update(self.student, self.course, force_update_subsections=True)
+        computed = {
+            breakdown['category']: breakdown['percent']
+            for breakdown in course_grade.summary['section_breakdown'] if 'prominent' in breakdown
+        }
+        final, categories = stats._get_users_grades(self.course, {self.student.id: course_grade.percent})[self.student.id]
+        self.assertEqual(final, course_grade.percent)
+        for (__, assignment_type, ___), percent in zip(self.course.grader.subgraders, categories):
+            self.assertAlmostEqual(percent, computed[assignment_type])
+
+    @patch("eol_progress_tab.views._has_page_access")
+    def test_get_bootstrap_data(self, has_page_access):
+        """
+            Test course info and student data in a single request
+        """
+        has_page_access.side_effect = [True]
+        url = reverse('eol_progress_tab_bootstrap',
+                      kwargs={'course_id': self.course.id, 'user_id': self.student.id})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content.decode("utf-8"))
+        self.assertEqual(data['course_info']['display_name'], 'eol progress tab')
+        self.assertEqual(data['student_data']['username'], 'student')
+
+        # students can't see other students data
+        has_page_access.side_effect = [True]
+        url = reverse('eol_progress_tab_bootstrap',
+                      kwargs={'course_id': self.course.id, 'user_id': self.staff_user.id})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
+
+    @patch("eol_progress_tab.views._has_page_access")
+    def test_course_info_conditional(self, has_page_access):
+        """
+            Test course info ETag/Last-Modified headers and 304 responses
+        """
+        has_page_access.return_value = True
+        url = reverse('eol_progress_tab_course_info',
+                      kwargs={'course_id': self.course.id})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+        etag = response['ETag']
+
+        with patch("eol_progress_tab.views._get_course_info_json") as get_course_info_json:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+            self.assertFalse(get_course_info_json.called)
+
+    @patch("eol_progress_tab.views._has_page_access")
+    def test_student_data_conditional(self, has_page_access):
+        """
+            Test student data ETag changes when the persisted grade changes
+        """
+        has_page_access.return_value = True
+        PersistentCourseGrade.update_or_create(
+            user_id=self.student.id, course_id=self.course.id, percent_grade=.3,
+            grading_policy_hash='hash', letter_grade='', passed=False
+        )
+        url = reverse('eol_progress_tab_student_data',
+                      kwargs={'course_id': self.course.id, 'user_id': self.student.id})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        with patch("eol_progress_tab.views._get_student_data_entry") as get_student_data_entry:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+            self.assertFalse(get_student_data_entry.called)
+
+        PersistentCourseGrade.update_or_create(
+            user_id=self.student.id, course_id=self.course.id, percent_grade=.7,
+            grading_policy_hash='new_hash', letter_grade='Pass', passed=True
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertIn('Last-Modified', response)
+
+    @patch("eol_progress_tab.views._has_page_access")
+    def test_student_data_conditional_cache(self, has_page_access):
+        """
+            Test cached payloads are not served with a new ETag (persisted grade, certificate or
+            enrollment updated without invalidation signals)
+        """
+        cache.get_cache().clear()
+        has_page_access.return_value = True
+        PersistentCourseGrade.update_or_create(
+            user_id=self.student.id, course_id=self.course.id, percent_grade=.3,
+            grading_policy_hash='hash', letter_grade='', passed=False
+        )
+        GeneratedCertificateFactory(user=self.student, course_id=self.course.id, status='notpassing')
+        url = reverse('eol_progress_tab_student_data',
+                      kwargs={'course_id': self.course.id, 'user_id': self.student.id})
+        etag = self.client.get(url)['ETag']
+        with patch("eol_progress_tab.grades.build_student_data_json") as build_student_data_json:
+            build_student_data_json.return_value = ('{}', None)
+            self.assertEqual(self.client.get(url)['ETag'], etag)
+            self.assertFalse(build_student_data_json.called)
+
+            # queryset update, post_save receivers are not called
+            GeneratedCertificate.objects.filter(user=self.student, course_id=self.course.id).update(
+                status='downloadable', modified_date=timezone.now() + timedelta(seconds=1)
+            )
+            response = self.client.get(url)
+            self.assertNotEqual(response['ETag'], etag)
+            self.assertEqual(build_student_data_json.call_count, 1)
+
+            # enrollment mode change (certificate data) without invalidation signals
+            etag = response['ETag']
+            CourseEnrollment.objects.filter(user=self.student, course_id=self.course.id).update(mode='verified')
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+            self.assertEqual(build_student_data_json.call_count, 2)
+
+        # payloads stored without ETag are stale for requests with an ETag
+        cache.set_student_data(self.course, self.student.id, '{}')
+        self.assertIsNone(cache.get_student_data_entry(self.course, self.student.id, etag=response['ETag'])[0])
+        self.assertEqual(cache.get_student_data(self.course, self.student.id), '{}')
+
+    def test_serializers_dumps(self):
+        """
+            Test payload serialization of numpy scalars, datetimes and lazy strings (json and orjson)
+        """
+        data = {
+            'percent': around(.123, decimals=2),
+            'count': numpy.int64(3),
+            'due': datetime.datetime(2021, 1, 11),
+            'title': ugettext_lazy('Calificaciones'),
+        }
+        expected = {'percent': .12, 'count': 3, 'due': '2021-01-11T00:00:00', 'title': 'Calificaciones'}
+        self.assertEqual(json.loads(serializers.dumps(data, fast=False)), expected)
+        self.assertEqual(json.loads(serializers.dumps(data, fast=True)), expected)
+
+        response = serializers.JsonPayloadResponse(data)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content.decode("utf-8")), expected)
+
+    def test_instrumentation(self):
+        """
+            Test Server-Timing header for staff when instrumentation is enabled
+        """
+        url = reverse('eol_progress_tab_student_data',
+                      kwargs={'course_id': self.course.id, 'user_id': self.student.id})
+        response = self.staff_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Server-Timing', response)
+
+        cache.get_cache().clear()
+        with self.settings(EOL_PROGRESS_TAB_INSTRUMENTATION=True):
+            with patch("eol_progress_tab.instrumentation.logger") as logger:
+                response = self.staff_client.get(url)
+                self.assertTrue(logger.info.called)
+            self.assertEqual(response.status_code, 200)
+            server_timing = response['Server-Timing']
+            for phase in ['access', 'grades', 'detail', 'certificate', 'serialize', 'total']:
+                self.assertIn('{};dur='.format(phase), server_timing)
+
+            # students only get log lines
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('Server-Timing', response)
+
+    def test_instrumentation_phase_disabled(self):
+        """
+            Test phases are no-op when no request is recorded
+        """
+        with instrumentation.phase('grades'):
+            pass
+        with instrumentation.record('student_data') as recorder:
+            self.assertIsNone(recorder)
+        with self.settings(EOL_PROGRESS_TAB_INSTRUMENTATION=True):
+            with instrumentation.record('student_data') as recorder:
+                with instrumentation.phase('grades'):
+                    User.objects.count()
+            self.assertEqual(recorder.phases['grades'][1], 1) # one query
+
+    @patch("eol_progress_tab.views._has_page_access")
+    def test_student_data_snapshot(self, has_page_access):
+        """
+            Test student data served from snapshot (fresh and stale) with fallback to live computation
+        """
+        cache.get_cache().clear()
+        has_page_access.return_value = True
+        url = reverse('eol_progress_tab_student_data',
+                      kwargs={'course_id': self.course.id, 'user_id': self.student.id})
+        with self.settings(EOL_PROGRESS_TAB_SNAPSHOTS=True):
+            # no snapshot: live computation creates it
+            response = self.client.get(url)
+            self.assertNotIn('snapshot', json.loads(response.content.decode("utf-8")))
+            self.assertTrue(StudentProgressSnapshot.objects.filter(user=self.student, course_id=self.course.id).exists())
+
+            cache.get_cache().clear()
+            with patch("eol_progress_tab.grades.get_student_data") as get_student_data:
+                response = self.client.get(url)
+                self.assertFalse(get_student_data.called)
+            data = json.loads(response.content.decode("utf-8"))
+            self.assertEqual(data['username'], 'student')
+            self.assertFalse(data['snapshot']['stale'])
+            fresh_etag = response['ETag']
+
+            # grade updated after the snapshot: stale snapshot served and refresh enqueued
+            cache.get_cache().clear()
+            PersistentCourseGrade.update_or_create(
+                user_id=self.student.id, course_id=self.course.id, percent_grade=.7,
+                grading_policy_hash='new_hash', letter_grade='Pass', passed=True
+            )
+            with patch("eol_progress_tab.views.tasks.enqueue_student_snapshot") as enqueue_student_snapshot:
+                response = self.client.get(url)
+                enqueue_student_snapshot.assert_called_once_with(self.course.id, self.student.id)
+            self.assertTrue(json.loads(response.content.decode("utf-8"))['snapshot']['stale'])
+            # stale payload without validators (the client keeps its previous ETag)
+            self.assertNotIn('ETag', response)
+            self.assertNotIn('Last-Modified', response)
+            with patch("eol_progress_tab.views.tasks.enqueue_student_snapshot"):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=fresh_etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(json.loads(response.content.decode("utf-8"))['snapshot']['stale'])
+            self.assertNotIn('ETag', response)
+
+            # snapshot refreshed: revalidation gets the fresh payload and its ETag
+            tasks.refresh_student_snapshots(text_type(self.course.id), [self.student.id])
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=fresh_etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(json.loads(response.content.decode("utf-8"))['snapshot']['stale'])
+            etag = response['ETag']
+            self.assertNotEqual(etag, fresh_etag)
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_refresh_snapshots_tasks(self):
+        """
+            Test course snapshots refresh (chunks of users)
+        """
+        with self.settings(EOL_PROGRESS_TAB_BULK_BATCH_SIZE=1):
+            tasks.refresh_course_snapshots.delay(text_type(self.course.id))
+        snapshots_list = StudentProgressSnapshot.objects.filter(course_id=self.course.id)
+        self.assertEqual(snapshots_list.count(), 2)
+        for snapshot in snapshots_list:
+            self.assertIn('final_grade_scaled', json.loads(snapshot.payload))
+
+    def test_enqueue_student_snapshot(self):
+        """
+            Test a single pending snapshot refresh per student and certificate staleness
+        """
+        cache.get_cache().clear()
+        with patch("eol_progress_tab.tasks.refresh_student_snapshots.apply_async") as apply_async:
+            tasks.enqueue_student_snapshot(self.course.id, self.student.id)
+            tasks.enqueue_student_snapshot(self.course.id, self.student.id)
+            tasks.enqueue_student_snapshot(self.course.id, self.staff_user.id)
+            self.assertEqual(apply_async.call_count, 2)
+            cache.get_cache().clear()  # pending refresh expired
+            tasks.enqueue_student_snapshot(self.course.id, self.student.id)
+            self.assertEqual(apply_async.call_count, 3)
+
+        views.snapshots.save_snapshot(self.course, self.student.id, '{}')
+        self.assertFalse(views.snapshots.get_snapshot(self.course, self.student.id)[1])
+        GeneratedCertificateFactory(user=self.student, course_id=self.course.id, status='downloadable')
+        self.assertTrue(views.snapshots.get_snapshot(self.course, self.student.id)[1])
+
+    def test_regrade(self):
+        """
+            Test regrade on demand (one student & whole course) with progress polling
+        """
+        url = reverse('eol_progress_tab_regrade', kwargs={'course_id': self.course.id})
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 404) # staff only
+        response = self.staff_client.get(url)
+        self.assertEqual(response.status_code, 405)
+
+        # invalid or not enrolled user
+        self.assertEqual(self.staff_client.post(url, {'user_id': 'abc'}).status_code, 400)
+        other_user = UserFactory(username='other_student', password='test', email='other_student@edx.org')
+        self.assertEqual(self.staff_client.post(url, {'user_id': other_user.id}).status_code, 400)
+        CourseEnrollmentFactory(user=other_user, course_id=self.course.id, is_active=False)
+        self.assertEqual(self.staff_client.post(url, {'user_id': other_user.id}).status_code, 400)
+
+        # one student (celery eager on tests)
+        response = self.staff_client.post(url, {'user_id': self.student.id})
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content.decode("utf-8"))
+        self.assertEqual(data['total'], 1)
+        status_url = reverse('eol_progress_tab_regrade_status',
+                             kwargs={'course_id': self.course.id, 'task_id': data['task_id']})
+        response = self.staff_client.get(status_url)
+        status = json.loads(response.content.decode("utf-8"))
+        self.assertEqual(status['status'], 'finished')
+        self.assertEqual(status['done'], 1)
+        self.assertEqual(status['student_data']['username'], 'student')
+
+        # whole course in chunks
+        with self.settings(EOL_PROGRESS_TAB_BULK_BATCH_SIZE=1):
+            response = self.staff_client.post(url)
+        data = json.loads(response.content.decode("utf-8"))
+        self.assertEqual(data['total'], 2)
+        status_url = reverse('eol_progress_tab_regrade_status',
+                             kwargs={'course_id': self.course.id, 'task_id': data['task_id']})
+        status = json.loads(self.staff_client.get(status_url).content.decode("utf-8"))
+        self.assertEqual((status['status'], status['done'], status['failed']), ('finished', 2, 0))
+        self.assertNotIn('student_data', status)
+
+        # unknown task
+        status_url = reverse('eol_progress_tab_regrade_status',
+                             kwargs={'course_id': self.course.id, 'task_id': 'abc123'})
+        self.assertEqual(self.staff_client.get(status_url).status_code, 404)
+
+    @patch("eol_progress_tab.views._has_page_access")
+    def test_student_data_summary_and_category_detail(self, has_page_access):
+        """
+            Test student data summary (without detail) and paginated category detail
+        """
+        cache.get_cache().clear()
+        has_page_access.return_value = True
+        url = reverse('eol_progress_tab_student_data',
+                      kwargs={'course_id': self.course.id, 'user_id': self.student.id})
+        response = self.client.get(url, {'summary': '1'})
+        self.assertEqual(response.status_code, 200)
+        categories = {
+            grade['category']: grade for grade in json.loads(response.content.decode("utf-8"))['category_grades']
+        }
+        self.assertNotIn('detail', categories['Homework'])
+        self.assertEqual(categories['Homework']['detail_count'], 1)
+        self.assertEqual(categories['Lab']['detail_count'], 0)
+        # full payload is cached apart from the summary
+        response = self.client.get(url)
+        self.assertIn('detail', json.loads(response.content.decode("utf-8"))['category_grades'][0])
+
+        # grader category from the cached payload
+        detail_url = reverse('eol_progress_tab_category_detail',
+                             kwargs={'course_id': self.course.id, 'user_id': self.student.id, 'category': 'Homework'})
+        with patch("eol_progress_tab.views.CourseGradeFactory") as course_grade_factory:
+            data = json.loads(self.client.get(detail_url).content.decode("utf-8"))
+            self.assertFalse(course_grade_factory.called)
+        self.assertEqual((data['category'], data['count'], data['num_pages']), ('Homework', 1, 1))
+
+        # Homework_2 is not a grader category (default grading policy): computed
+        detail_url = reverse('eol_progress_tab_category_detail',
+                             kwargs={'course_id': self.course.id, 'user_id': self.student.id, 'category': 'Homework_2'})
+        response = self.client.get(detail_url, {'page': 2, 'page_size': 1})
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content.decode("utf-8"))
+        self.assertEqual((data['count'], data['page'], data['num_pages']), (2, 2, 2))
+        self.assertEqual(len(data['results']), 1)
+        self.assertIn('problem_scores', data['results'][0])
+        self.assertEqual(self.client.get(detail_url, {'page': 3, 'page_size': 1}).status_code, 404)
+        self.assertEqual(self.client.get(detail_url, {'page': 'x'}).status_code, 400)
+
+    @patch("eol_progress_tab.visibility.configuration_helpers.get_value")
+    def test_tab_visibility_cache(self, get_value):
+        """
+            Test tab visibility resolved once per site/course version and invalidated
+            on course publish (tab hidden) and site configuration change
+        """
+        cache.get_cache().clear()
+        get_value.return_value = True
+        with patch("eol_progress_tab.visibility.get_current_site", return_value=None):
+            tab = EolProgressTab({'type': 'eol_progress_tab', 'eol_visible': False})
+            self.course.tabs = [tab]
+            for __ in range(3):
+                self.assertTrue(visibility.is_tab_visible(self.course))
+            self.assertEqual(get_value.call_count, 1)
+
+            # tab hidden on studio (course published)
+            tab.is_hidden = True
+            self.assertTrue(visibility.is_tab_visible(self.course))
+            tasks.course_published(text_type(self.course.id))
+            self.assertFalse(visibility.is_tab_visible(self.course))
+
+            # site configuration changed
+            tab.is_hidden = False
+            get_value.return_value = False
+            self.assertTrue(visibility.is_tab_visible(self.course))
+            signals.site_configuration_saved_handler(None, instance=Mock(site_id=None))
+            self.assertFalse(visibility.is_tab_visible(self.course))
+            self.assertFalse(visibility.is_site_enabled())
+
+    @patch("eol_progress_tab.views._has_page_access")
+    def test_student_data_compact(self, has_page_access):
+        """
+            Test compact student data (column arrays) and delta updates
+        """
+        cache.get_cache().clear()
+        has_page_access.return_value = True
+        url = reverse('eol_progress_tab_student_data',
+                      kwargs={'course_id': self.course.id, 'user_id': self.student.id})
+        response = self.client.get(url, {'format': 'compact'})
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content.decode("utf-8"))
+        self.assertEqual(data['format'], 'compact')
+        self.assertEqual(len(data['structure']['id']), 3)
+        self.assertEqual(data['subsections']['index'], [0, 1, 2])
+        self.assertEqual(data['subsections']['possible'], [5.0, 5.0, 5.0])
+        self.assertEqual(sorted(data['categories']['category']), ['Final Exam', 'Homework', 'Lab', 'Midterm Exam'])
+        self.assertFalse(data['delta'])
+
+        # client up to date: no structure and no subsections
+        params = {'format': 'compact', 'since': data['version'], 'structure_version': data['structure_version']}
+        delta = json.loads(self.client.get(url, params).content.decode("utf-8"))
+        self.assertTrue(delta['delta'])
+        self.assertNotIn('structure', delta)
+        self.assertEqual(delta['subsections']['index'], [])
+        self.assertEqual(delta['version'], data['version'])
+
+        # one subsection changed since the client version
+        hashes = dict(zip(data['subsections']['index'], data['subsections']['hash']))
+        hashes[1] = 'changed'
+        cache.set_compact_version(self.course.id, self.student.id, 'old', {
+            'structure_version': data['structure_version'], 'hashes': hashes}, 60)
+        params['since'] = 'old'
+        delta = json.loads(self.client.get(url, params).content.decode("utf-8"))
+        self.assertEqual(delta['subsections']['index'], [1])
+        self.assertEqual(delta['removed'], [])
+
+        # unknown version: full subsections
+        params['since'] = 'unknown'
+        delta = json.loads(self.client.get(url, params).content.decode("utf-8"))
+        self.assertFalse(delta['delta'])
+        self.assertEqual(len(delta['subsections']['index']), 3)
+
+    @patch("eol_progress_tab.grades.get_cert_data")
+    def test_prefetch_students(self, get_cert_data):
+        """
+            Test users, enrollments and certificates prefetched in a constant number of queries
+            and certificate data resolved without get_cert_data when nothing can be shown
+        """
+        with self.assertNumQueries(4):
+            students = prefetch.prefetch_students(self.course.id, [self.student.id, self.staff_user.id])
+        student = students[self.student.id]
+        self.assertEqual(student.user, self.student)
+        self.assertEqual(student.enrollment_mode, 'audit')
+        self.assertIsNone(student.certificate)
+        self.assertFalse(student.whitelisted)
+        with self.assertNumQueries(3):
+            self.assertEqual(len(prefetch.prefetch_students(self.course.id, [self.student, self.staff_user])), 2)
+
+        not_passed = Mock(passed=False)
+        honor = student._replace(enrollment_mode='honor')
+        self.assertEqual(grades.get_certificate_data(self.student, self.course, 'honor', not_passed, honor), {})
+        self.assertFalse(get_cert_data.called)
+        get_cert_data.return_value = None
+        grades.get_certificate_data(self.student, self.course, 'honor', Mock(passed=True), honor)
+        grades.get_certificate_data(self.student, self.course, 'honor', not_passed, honor._replace(whitelisted=True))
+        self.assertEqual(get_cert_data.call_count, 2)
+
+    def test_warm_up_course(self):
+        """
+            Test warm up of course structure and most recently active students payloads (command & publish hook)
+        """
+        cache.get_cache().clear()
+        for user, percent in ((self.student, .3), (self.staff_user, .5)):
+            PersistentCourseGrade.update_or_create(
+                user_id=user.id, course_id=self.course.id, percent_grade=percent,
+                grading_policy_hash='hash', letter_grade='', passed=False
+            )
+        # staff_user has the latest grade
+        self.assertEqual(warmup.get_recent_students(self.course.id, 1), [self.staff_user.id])
+
+        with patch("eol_progress_tab.warmup.time.sleep") as sleep:
+            call_command('warm_up_course', text_type(self.course.id), '--students', '2', '--rate', '1', '--batch-size', '1')
+        self.assertEqual(sleep.call_count, 2)
+        self.assertIsNotNone(cache.get_course_value(self.course, structure.CACHE_NAME))
+        for user in (self.student, self.staff_user):
+            self.assertIsNotNone(cache.get_student_data(self.course, user.id))
+            # stored with the ETag: served to conditional requests
+            etag = grades.get_student_data_version(user, self.course)[0]
+            self.assertIsNotNone(cache.get_student_data_entry(self.course, user.id, etag=etag)[0])
+
+        with patch("eol_progress_tab.tasks.warm_up_course.apply_async") as apply_async:
+            tasks.course_published(text_type(self.course.id))
+            self.assertFalse(apply_async.called)
+            with self.settings(EOL_PROGRESS_TAB_WARMUP=True):
+                tasks.course_published(text_type(self.course.id))
+            apply_async.assert_called_once_with(args=[text_type(self.course.id)], countdown=60)
+
+    def test_cms_course_published(self):
+        """
+            Test Studio publish and site configuration saves enqueue the LMS tasks on the LMS queue
+        """
+        with patch("eol_progress_tab.cms_signals.current_app.send_task") as send_task:
+            cms_signals.course_published_handler(None, course_key=self.course.id)
+        send_task.assert_called_once_with(
+            'eol_progress_tab.tasks.course_published', args=[text_type(self.course.id)], queue='edx.lms.core.default'
+        )
+        with patch("eol_progress_tab.cms_signals.current_app.send_task") as send_task:
+            cms_signals.site_configuration_saved_handler(None, instance=Mock(site_id=1))
+        send_task.assert_called_once_with(
+            'eol_progress_tab.tasks.site_configuration_changed', args=[1], queue='edx.lms.core.default'
+        )
+
+    @patch("eol_progress_tab.views._has_page_access")
+    def test_persisted_fast_path(self, has_page_access):
+        """
+            Test summary grades from persisted subsection grades (same result as CourseGradeFactory)
+            with fallback when the grade was never persisted
+        """
+        cache.get_cache().clear()
+        has_page_access.return_value = True
+        self.assertIsNone(persisted.read_course_grade(self.student, self.course))
+        course_grade = CourseGradeFactory().read(self.student, self.course)
+        persisted_grade = persisted.read_course_grade(self.student, self.course)
+        self.assertEqual(persisted.compare_course_grades(persisted_grade, course_grade), [])
+        self.assertEqual(len(persisted_grade.graded_subsections_by_format['Homework_2']), 2)
+
+        # Homework: 4/5 (+ 11 missing subsections, 2 dropped) overridden to 5/5
+        location = structure.get_subsections_by_format(structure.get_course_structure(self.course))['Homework'][0]
+        with patch("eol_progress_tab.persisted.PersistentSubsectionGrade") as subsection_grade:
+            subsection_grades = subsection_grade.objects.filter.return_value.values_list.return_value
+            subsection_grades.iterator.return_value = [(self.student.id, location, 4., 5., None, None)]
+            persisted_grade = persisted.read_course_grade(self.student, self.course)
+            self.assertEqual(persisted_grade.percent, .01) # .8 / 10 * .15
+            subsection_grades.iterator.return_value = [(self.student.id, location, 4., 5., 5., None)]
+            persisted_grade = persisted.read_course_grade(self.student, self.course)
+            self.assertEqual(persisted_grade.percent, .02) # 1. / 10 * .15 = .015
+            self.assertFalse(persisted_grade.passed)
+            self.assertEqual(persisted_grade.summary['section_breakdown'][0]['percent'], .1)
+
+        url = reverse('eol_progress_tab_student_data',
+                      kwargs={'course_id': self.course.id, 'user_id': self.student.id})
+        with self.settings(EOL_PROGRESS_TAB_FAST_PATH=True):
+            with patch("eol_progress_tab.grades.CourseGradeFactory") as course_grade_factory:
+                response = self.client.get(url, {'summary': '1'})
+                self.assertFalse(course_grade_factory.called)
+        data = json.loads(response.content.decode("utf-8"))
+        self.assertEqual(data['final_grade_percent'], 0.)
+        self.assertEqual({grade['category']: grade['detail_count'] for grade in data['category_grades']}['Homework'], 1)
+
+    def test_check_persisted_grades_command(self):
+        """
+            Test consistency check command (students without persisted grade are counted apart)
+            on a course with hidden graded subsections
+        """
+        CourseGradeFactory().read(self.student, self.course)
+        with patch("eol_progress_tab.management.commands.check_persisted_grades.read_course_grade") as read_course_grade:
+            read_course_grade.side_effect = lambda user, course, structure: None
+            output = StringIO()
+            call_command('check_persisted_grades', text_type(self.course.id), stdout=output)
+        self.assertIn('0 students checked, 2 without persisted grade, 0 mismatches', output.getvalue())
+        output = StringIO()
+        call_command('check_persisted_grades', text_type(self.course.id), stdout=output)
+        self.assertIn('2 students checked, 0 without persisted grade, 0 mismatches', output.getvalue())
+
+        # staff only and orphan Homework subsections are not graded for students
+        self._create_hidden_subsections()
+        for index, item in enumerate(self.items):
+            StudentModuleFactory(
+                student=self.student, course_id=self.course.id, module_state_key=item.location,
+                grade=int(index > 0), max_grade=1, state='{}'
+            )
+        CourseGradeFactory().update(self.student, self.course, force_update_subsections=True)
+        output = StringIO()
+        call_command('check_persisted_grades', text_type(self.course.id), stdout=output)
+        self.assertIn('2 students checked, 0 without persisted grade, 0 mismatches', output.getvalue())
+        self.assertEqual(persisted.read_course_grade(self.student, self.course).percent, .01) # .8 / 10 * .15
+
+        # content group subsections: fallback to CourseGradeFactory
+        restricted = {
+            location: dict(subsection, restricted=True)
+            for location, subsection in structure.get_course_structure(self.course).items()
+        }
+        self.assertIsNone(persisted.read_course_grade(self.student, self.course, restricted))
+
+    def test_single_flight(self):
+        """
+            Test concurrent identical computations run once, waiting callers get the shared result
+        """
+        cache.get_cache().clear()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.3)
+            return 'data'
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.single_flight('test', compute)))
+            for __ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ['data'] * 3)
+        self.assertEqual(len(calls), 1)
+
+        # lock held by a finished computation: result is shared
+        lock_key, result_key = cache._flight_keys('test', 'leader')
+        cache.get_cache().set(lock_key, 'leader')
+        cache.get_cache().set(result_key, 'shared')
+        self.assertEqual(cache.single_flight('test', compute), 'shared')
+        self.assertEqual(len(calls), 1)
+
+        # abandoned lock: compute after waiting
+        cache.get_cache().delete(result_key)
+        with self.settings(EOL_PROGRESS_TAB_COALESCE_WAIT=0.1):
+            self.assertEqual(cache.single_flight('test', compute), 'data')
+        self.assertEqual(len(calls), 2)
+
+        # disabled
+        with self.settings(EOL_PROGRESS_TAB_COALESCE=False):
+            cache.single_flight('test', compute)
+        self.assertEqual(len(calls), 3)
+
+    @patch("eol_progress_tab.views._has_page_access")
+    def test_scores_expiry(self, has_page_access):
+        """
+            Test payloads expire when a due date changes the problem scores visibility (cache, snapshot and max-age)
+        """
+        now = timezone.now()
+        subsection = lambda show_correctness, due: Mock(show_correctness=show_correctness, due=due)
+        course_grade = Mock(graded_subsections_by_format={
+            'Homework': {
+                'a': subsection('past_due', now - timedelta(days=1)),
+                'b': subsection('past_due', now + timedelta(days=2)),
+                'c': subsection('always', now + timedelta(hours=1)),
+            },
+            'Exam': {'d': subsection('past_due', now + timedelta(days=1)), 'e': subsection('past_due', None)},
+        })
+        self.assertEqual(grades.get_scores_expiry(course_grade, now), now + timedelta(days=1))
+        self.assertIsNone(grades.get_scores_expiry(course_grade, now + timedelta(days=3)))
+
+        # cache entry valid until the visibility change
+        cache.get_cache().clear()
+        cache.set_student_data(self.course, self.student.id, 'data', expires=now + timedelta(hours=1))
+        self.assertEqual(cache.get_student_data_entry(self.course, self.student.id), ('data', now + timedelta(hours=1)))
+        cache.set_student_data(self.course, self.student.id, 'data', expires=now - timedelta(seconds=1))
+        self.assertIsNone(cache.get_student_data(self.course, self.student.id))
+
+        # browser max-age bounded by the visibility change
+        has_page_access.return_value = True
+        url = reverse('eol_progress_tab_student_data',
+                      kwargs={'course_id': self.course.id, 'user_id': self.student.id})
+        with patch("eol_progress_tab.views._get_student_data_entry") as get_student_data_entry:
+            get_student_data_entry.return_value = ('{}', timezone.now() + timedelta(seconds=120))
+            with self.settings(EOL_PROGRESS_TAB_MAX_AGE=3600):
+                response = self.client.get(url)
+                self.assertIn('max-age=119', response['Cache-Control'])
+                get_student_data_entry.return_value = ('{}', None)
+                response = self.client.get(url)
+                self.assertIn('max-age=3600', response['Cache-Control'])
+
+        # snapshot stale after the visibility change
+        views.snapshots.save_snapshot(self.course, self.student.id, '{}', now + timedelta(hours=1))
+        self.assertFalse(views.snapshots.get_snapshot(self.course, self.student.id)[1])
+        views.snapshots.save_snapshot(self.course, self.student.id, '{}', now - timedelta(hours=1))
+        self.assertTrue(views.snapshots.get_snapshot(self.course, self.student.id)[1])
+
+    @patch("eol_progress_tab.views._has_page_access")
+    def test_grading_policy(self, has_page_access):
+        """
+            Test grading policy export and the what-if engine against CourseGradeFactory
+        """
+        has_page_access.return_value = True
+        hidden = [
+            text_type(self.course.id.make_usage_key('sequential', subsection.location.block_id))
+            for subsection in self._create_hidden_subsections()
+        ]
+        url = reverse('eol_progress_tab_grading_policy', kwargs={'course_id': self.course.id})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        policy = json.loads(response.content.decode("utf-8"))
+        homework = policy['categories'][0]
+        self.assertEqual((homework['category'], homework['weight'], homework['drop_count'], homework['min_count']), ('Homework', .15, 2, 12))
+        # staff only and orphan subsections are not graded
+        self.assertEqual(len(homework['subsections']), 1)
+        self.assertFalse(set(hidden) & set(structure.get_course_structure(self.course)))
+        # course order
+        chapter = self.store.get_item(self.store.get_course(self.course.id).children[0])
+        self.assertEqual(
+            list(structure.get_course_structure(self.course)),
+            [
+                location for location in (
+                    text_type(self.course.id.make_usage_key('sequential', child.block_id)) for child in chapter.children
+                ) if location not in hidden
+            ]
+        )
+        self.assertEqual(policy['scale'], {'min_grade': 1., 'max_grade': 7., 'pass_grade': 4., 'fail_max_grade': 3.9})
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+        # Homework: 4/5 problems
+        for index, item in enumerate(self.items):
+            StudentModuleFactory(
+                student=self.student, course_id=self.course.id, module_state_key=item.location,
+                grade=int(index > 0), max_grade=1, state='{}'
+            )
+        course_grade = CourseGradeFactory().update(self.student, self.course, force_update_subsections=True)
+        scores = {
+            text_type(subsection.location): (subsection.graded_total.earned, subsection.graded_total.possible)
+            for subsections in course_grade.graded_subsections_by_format.values() for subsection in subsections.values()
+        }
+        grade = grading.compute_course_grade(policy, scores)
+        self.assertEqual(grade['final_grade_percent'], course_grade.percent)
+        self.assertEqual(grade['final_grade_percent'], .01) # .8 / 10 * .15
+        self.assertEqual(grade['passed'], course_grade.passed)
+        self.assertEqual(grade['final_grade_scaled'], views._grade_percent_scaled(course_grade.percent, .5))
+        computed = {
+            breakdown['category']: breakdown['percent']
+            for breakdown in course_grade.summary['section_breakdown'] if 'prominent' in breakdown
+        }
+        for category_grade in grade['category_grades']:
+            self.assertAlmostEqual(category_grade['grade_percent'], computed[category_grade['category']])
+
+        # what-if: full score on Homework
+        scores[homework['subsections'][0]] = (5., 5.)
+        grade = grading.compute_course_grade(policy, scores)
+        self.assertEqual(grade['final_grade_percent'], .02) # 1. / 10 * .15 = .015
+        self.assertEqual(grade['category_grades'][0]['grade_percent'], .1)
+        self.assertFalse(grade['passed'])
+
+    @patch("eol_progress_tab.views.EolProgressTab.is_enabled")
+    def test_progress_overview(self, is_enabled):
+        """
+            Test multi-course overview of the request user (only courses with the tab enabled)
+        """
+        cache.get_cache().clear()
+        is_enabled.return_value = True
+        url = reverse('eol_progress_tab_overview')
+        with self.settings(EOL_PROGRESS_TAB_OVERVIEW_WORKERS=0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        courses = json.loads(response.content.decode("utf-8"))['courses']
+        self.assertEqual(len(courses), 1)
+        self.assertEqual(courses[0]['course_id'], text_type(self.course.id))
+        self.assertEqual(courses[0]['status'], overview.OK)
+        self.assertEqual(courses[0]['final_grade_scaled'], 1.)
+        self.assertFalse(courses[0]['passed'])
+
+        is_enabled.return_value = False
+        with self.settings(EOL_PROGRESS_TAB_OVERVIEW_WORKERS=0):
+            response = self.client.get(url)
+        self.assertEqual(json.loads(response.content.decode("utf-8"))['courses'], [])
+
+    def test_map_courses(self):
+        """
+            Test concurrent course computations with a deadline per course and partial results
+        """
+        def compute(course_key):
+            if course_key == 'slow':
+                time.sleep(1)
+            if course_key.startswith('queued'):
+                time.sleep(.2)
+            if course_key == 'error':
+                raise ValueError(course_key)
+            return course_key.upper()
+        started = time.time()
+        results = overview.map_courses(compute, ['a', 'slow', 'error', 'b'], max_workers=4, timeout=.3)
+        self.assertLess(time.time() - started, 1)
+        self.assertEqual(results, [
+            ('a', overview.OK, 'A'),
+            ('slow', overview.TIMEOUT, None),
+            ('error', overview.ERROR, None),
+            ('b', overview.OK, 'B'),
+        ])
+        # deadline since each course started: the third course ends after .4s
+        results = overview.map_courses(compute, ['queued_a', 'queued_b', 'queued_c'], max_workers=2, timeout=.3)
+        self.assertEqual([status for __, status, ___ in results], [overview.OK] * 3)
+        # single worker busy with a timed out course: queued courses time out
+        started = time.time()
+        results = overview.map_courses(compute, ['slow', 'a'], max_workers=1, timeout=.3)
+        self.assertLess(time.time() - started, 1)
+        self.assertEqual(results, [('slow', overview.TIMEOUT, None), ('a', overview.TIMEOUT, None)])
+        started = time.time()
+        self.assertEqual(overview.map_courses(compute, ['slow'], timeout=.3), [('slow', overview.TIMEOUT, None)])
+        self.assertLess(time.time() - started, 1)
+        # sequential
+        self.assertEqual(overview.map_courses(compute, ['a', 'error'], max_workers=0), [
+            ('a', overview.OK, 'A'),
+            ('error', overview.ERROR, None),
+        ])
+
+    def test_student_data_version(self):
+        """
+            Test payloads and snapshots of a previous payload format are stale
+        """
+        views.snapshots.save_snapshot(self.course, self.student.id, '{}')
+        self.assertFalse(views.snapshots.get_snapshot(self.course, self.student.id)[1])
+        StudentProgressSnapshot.objects.filter(user=self.student).update(course_version=cache.get_course_version(self.course))
+        self.assertTrue(views.snapshots.get_snapshot(self.course, self.student.id)[1])
+        with patch("eol_progress_tab.cache.STUDENT_DATA_VERSION", 1):
+            cache.set_student_data(self.course, self.student.id, '{}')
+        self.assertIsNone(cache.get_student_data(self.course, self.student.id))
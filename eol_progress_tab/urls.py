@@ -3,7 +3,20 @@
 from django.conf.urls import url
 from django.conf import settings
 
-from .views import EolProgressTabFragmentView, get_course_info, get_student_data
+from .views import (
+    EolProgressTabFragmentView,
+    export_scaled_grades,
+    get_bootstrap_data,
+    get_category_detail,
+    get_bulk_student_data,
+    get_course_info,
+    get_grade_statistics,
+    get_grading_policy,
+    get_progress_overview,
+    get_regrade_status,
+    get_student_data,
+    start_regrade,
+)
 from django.contrib.auth.decorators import login_required
 
 
@@ -29,4 +42,65 @@ urlpatterns = (
         login_required(get_student_data),
         name='eol_progress_tab_student_data',
     ),
+    url(
+        r'courses/{}/eol_progress_tab/bulk_student_data$'.format(
+            settings.COURSE_ID_PATTERN,
+        ),
+        login_required(get_bulk_student_data),
+        name='eol_progress_tab_bulk_student_data',
+    ),
+    url(
+        r'courses/{}/eol_progress_tab/export_scaled_grades$'.format(
+            settings.COURSE_ID_PATTERN,
+        ),
+        login_required(export_scaled_grades),
+        name='eol_progress_tab_export_scaled_grades',
+    ),
+    url(
+        r'courses/{}/eol_progress_tab/grade_statistics$'.format(
+            settings.COURSE_ID_PATTERN,
+        ),
+        login_required(get_grade_statistics),
+        name='eol_progress_tab_grade_statistics',
+    ),
+    url(
+        r'courses/{}/eol_progress_tab/bootstrap/(?P<user_id>\d+)/'.format(
+            settings.COURSE_ID_PATTERN,
+        ),
+        login_required(get_bootstrap_data),
+        name='eol_progress_tab_bootstrap',
+    ),
+    url(
+        r'courses/{}/eol_progress_tab/regrade$'.format(
+            settings.COURSE_ID_PATTERN,
+        ),
+        login_required(start_regrade),
+        name='eol_progress_tab_regrade',
+    ),
+    url(
+        r'courses/{}/eol_progress_tab/regrade/(?P<task_id>[0-9a-f]+)$'.format(
+            settings.COURSE_ID_PATTERN,
+        ),
+        login_required(get_regrade_status),
+        name='eol_progress_tab_regrade_status',
+    ),
+    url(
+        r'courses/{}/eol_progress_tab/category_detail/(?P<user_id>\d+)/(?P<category>[^/]+)$'.format(
+            settings.COURSE_ID_PATTERN,
+        ),
+        login_required(get_category_detail),
+        name='eol_progress_tab_category_detail',
+    ),
+    url(
+        r'courses/{}/eol_progress_tab/grading_policy$'.format(
+            settings.COURSE_ID_PATTERN,
+        ),
+        login_required(get_grading_policy),
+        name='eol_progress_tab_grading_policy',
+    ),
+    url(
+        r'eol_progress_tab/overview$',
+        login_required(get_progress_overview),
+        name='eol_progress_tab_overview',
+    ),
 )
@@ -2,55 +2,62 @@
 
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
 from django.conf import settings
-from lms.djangoapps.courseware.tabs import get_course_tab_list
-from lms.djangoapps.courseware.courses import get_course_about_section, get_studio_url
+from lms.djangoapps.courseware.courses import get_course_about_section, get_course_by_id, get_studio_url
 
-from lms.djangoapps.courseware.views.views import get_cert_data 
-from lms.djangoapps.certificates.models import CertificateStatuses
 
 from lms.djangoapps.grades.course_grade_factory import CourseGradeFactory
 from student.models import CourseEnrollment
 
 from django.template.loader import render_to_string
 from web_fragments.fragment import Fragment
-from courseware.courses import get_course_with_access
 from openedx.core.djangoapps.plugin_api.views import EdxFragmentView
-from opaque_keys.edx.keys import CourseKey
-from django.contrib.auth.models import User
-from django.http import Http404, HttpResponse
-from django.urls import reverse
+from django.core.paginator import Paginator
+from django.http import Http404, HttpResponseBadRequest, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 
-from courseware.access import has_access
 from courseware.masquerade import setup_masquerade
 from django.db.models import prefetch_related_objects
 
 from lms.djangoapps.courseware.permissions import MASQUERADE_AS_STUDENT
 
+from . import cache, compact, grades, instrumentation, overview, serializers, snapshots, stats, tasks
+from .access import get_access_context
+from .plugins import EolProgressTab
+from .grading import build_grading_policy, get_grade_scale, grade_percent_scaled
+from .serializers import JsonPayloadResponse
+from .structure import format_date as _format_date, get_course_structure, get_subsections_by_format
 
+
+import calendar
 import json
-from bson import json_util
-from six import string_types, itervalues, text_type
-from numpy import around
+from six import text_type
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import require_POST
 
 import logging
 logger = logging.getLogger(__name__)
 
 class EolProgressTabFragmentView(EdxFragmentView):
+    @method_decorator(instrumentation.instrumented('fragment'))
     def render_to_fragment(self, request, course_id, **kwargs):
-        if(not _has_page_access(request.user, course_id)):
-            raise Http404()
+        access = get_access_context(request, course_id)
+        with instrumentation.phase('access'):
+            if(not _has_page_access(access)):
+                raise Http404()
 
-        course_key = CourseKey.from_string(course_id)
-        course = get_course_with_access(request.user, "load", course_key)
+        course_key = access.course_key
+        course = access.course
 
         # masquerade and student required for preview_menu (admin)
-        staff_access = bool(has_access(request.user, 'staff', course))
+        staff_access = access.is_staff()
         can_masquerade = request.user.has_perm(MASQUERADE_AS_STUDENT, course)
-        masquerade, student = setup_masquerade(request, course_key, staff_access, reset_masquerade_data=True)
-        prefetch_related_objects([student], 'groups')
-        if request.user.id != student.id:
-            course = get_course_with_access(student, 'load', course_key, check_if_enrolled=True)
+        with instrumentation.phase('masquerade'):
+            masquerade, student = setup_masquerade(request, course_key, staff_access, reset_masquerade_data=True)
+            prefetch_related_objects([student], 'groups')
+            if request.user.id != student.id:
+                course = access.get_course(student, check_if_enrolled=True)
 
         context = {
             "course": course,
@@ -60,84 +67,416 @@ class EolProgressTabFragmentView(EdxFragmentView):
             "can_masquerade": can_masquerade,
             "masquerade": masquerade,
             'studio_url': get_studio_url(course, 'settings/grading'),
-            "DEV_URL": configuration_helpers.get_value('EOL_PROGRESS_TAB_DEV_URL', settings.EOL_PROGRESS_TAB_DEV_URL)
+            "DEV_URL": configuration_helpers.get_value('EOL_PROGRESS_TAB_DEV_URL', settings.EOL_PROGRESS_TAB_DEV_URL),
+            # initial data embedded in the page, the frontend doesn't need to request it
+            "bootstrap_data": _get_bootstrap_json(request, access, student) if settings.EOL_PROGRESS_TAB_EMBED_BOOTSTRAP else None
         }
-        html = render_to_string('eol_progress_tab/eol_progress_tab_fragment.html', context)
+        with instrumentation.phase('render'):
+            html = render_to_string('eol_progress_tab/eol_progress_tab_fragment.html', context)
         fragment = Fragment(html)
+        access.log_counters('fragment')
         return fragment
             
+@instrumentation.instrumented('student_data')
 def get_student_data(request, course_id, user_id):
     """
         Get student grades in two formats: percents and scaled (1. -> 7.)
         List of categories with respective weight, grades & problem scores.
     """
     user_id = int(user_id)
-    # if 'view course as' is active then user_id could be different than request.user
-    user = request.user if user_id == request.user.id else User.objects.get(pk=user_id)
-    course_key = CourseKey.from_string(course_id)
-    course = get_course_with_access(user, "load", course_key)
-
-    # check if user has access. If masquerade view, check if user is staff
-    if( not _has_page_access(request.user, course_id)
-        or (user_id != request.user.id and not bool(has_access(request.user, 'staff', course))) ):
+    access = get_access_context(request, course_id)
+    with instrumentation.phase('access'):
+        # if 'view course as' is active then user_id could be different than request.user
+        user = access.get_user(user_id)
+        course = access.get_course(user)
+
+        # check if user has access. If masquerade view, check if user is staff
+        if( not _has_page_access(access)
+            or (user_id != request.user.id and not access.is_staff()) ):
+            raise Http404()
+
+    summary = request.GET.get('summary') in ('1', 'true')
+    with instrumentation.phase('version'):
+        etag, last_modified = grades.get_student_data_version(user, course)
+    # cached payloads are bound to the ETag they were computed for (see cache.get_student_data_entry)
+    data_etag = etag
+    if request.GET.get('format') == compact.FORMAT:
+        # compact format: client structure version & payload version (delta)
+        since = request.GET.get('since')
+        structure_version = request.GET.get('structure_version')
+        if etag is not None:
+            etag = cache.make_etag(compact.FORMAT, etag, since, structure_version)
+        get_data = lambda: _get_student_data_compact_json(user, course, since, structure_version, data_etag)
+    else:
+        if etag is not None and summary:
+            etag = cache.make_etag('summary', etag)
+        get_data = lambda: _get_student_data_entry(user, course, summary, data_etag)
+    response = _conditional_response(request, etag, last_modified, get_data)
+    access.log_counters('student_data')
+    return response
+
+@instrumentation.instrumented('bootstrap')
+def get_bootstrap_data(request, course_id, user_id):
+    """
+        Course info and student data in a single request (one access check & course load)
+    """
+    user_id = int(user_id)
+    access = get_access_context(request, course_id)
+    user = access.get_user(user_id)
+    if( not _has_page_access(access)
+        or (user_id != request.user.id and not access.is_staff()) ):
         raise Http404()
+    course = access.get_course(user)
+    course_info_etag, course_last_modified = _get_course_info_version(course)
+    student_data_etag, student_last_modified = grades.get_student_data_version(user, course)
+    response = _conditional_response(
+        request,
+        cache.make_etag('bootstrap', course_info_etag, student_data_etag) if student_data_etag else None,
+        _latest(course_last_modified, student_last_modified),
+        lambda: _get_bootstrap_entry(request, access, user, student_data_etag)
+    )
+    access.log_counters('bootstrap')
+    return response
 
-    grade_cutoff = min(course.grade_cutoffs.values())
-    # Create dict with category weights (% 0. -> 1.) and drop_count
-    category_config = {
-        assignment_type.upper() : {
-            'weight'    : weight,
-            'drop_count': grader.drop_count,
-            'min_count' : grader.min_count
-        }
-        for grader, assignment_type, weight in course.grader.subgraders
-    }
-    # Student grades information
-    course_grade = CourseGradeFactory().read(user, course)
-
-    # Get category detail and problem scores by subsection
-    category_scores_detail = _get_category_scores_detail(course_grade, course_key)
-
-    # Certificate
-    enrollment_mode, _ = CourseEnrollment.enrollment_mode_for_user(user, course_key)
-    certificate_data = _get_certificate_data(user, course, enrollment_mode, course_grade)
-
-    # Student final grade scaled
-    student_grade_scaled = _grade_percent_scaled(course_grade.percent, grade_cutoff)
-    # Category average grades
-    student_category_grades = filter(_prominent_section_filter, course_grade.summary['section_breakdown'])
-    # Student data summary
-    student_data = {
-        'username'              : user.username,
-        'final_grade_percent'   : course_grade.percent,
-        'final_grade_scaled'    : student_grade_scaled,
-        'passed'                : course_grade.passed,
-        'certificate_data'      : certificate_data,
-        'category_grades'       : [
-            {
-                'grade_percent' : grade['percent'],
-                'grade_scaled'  : _grade_percent_scaled(grade['percent'], grade_cutoff),
-                'category'      : grade['category'].title(),
-                'weight'        : category_config[grade['category'].upper()]['weight'],
-                'drop_count'    : category_config[grade['category'].upper()]['drop_count'],
-                'min_count'     : category_config[grade['category'].upper()]['min_count'],
-                'detail'        : category_scores_detail[grade['category'].upper()] if grade['category'].upper() in category_scores_detail else []
-            }
-            for grade in student_category_grades
-        ]
-    }
-    data = json.dumps(student_data, default=json_util.default)
-    return HttpResponse(data)
+def _get_bootstrap_json(request, access, user, etag=None):
+    """
+        {"course_info": ..., "student_data": ...} (access must be already checked)
+    """
+    return _get_bootstrap_entry(request, access, user, etag)[0]
 
+def _get_bootstrap_entry(request, access, user, etag=None):
+    """
+        (bootstrap json payload, student data scores_expire)
+    """
+    student_data, expires = _get_student_data_entry(user, access.get_course(user), etag=etag)
+    data = '{{"course_info": {}, "student_data": {}}}'.format(
+        _get_course_info_json(request, access.course),
+        student_data
+    )
+    return data, expires
+
+def _get_student_data_json(user, course, summary=False, etag=None):
+    """
+        Student data json payload (cached).
+        summary: categories without subsections detail (see get_category_detail)
+    """
+    return _get_student_data_entry(user, course, summary, etag)[0]
+
+def _get_student_data_entry(user, course, summary=False, etag=None):
+    """
+        (student data json payload, scores_expire): the payload is valid until the next
+        problem scores visibility change (None: no pending change).
+        etag: student_data ETag of the request (see grades.get_student_data_version)
+    """
+    variant = 'summary' if summary else 'full'
+    with instrumentation.phase('cache'):
+        data, expires = cache.get_student_data_entry(course, user.id, variant, etag)
+    if data is not None:
+        return data, expires
+    if snapshots.is_enabled():
+        with instrumentation.phase('snapshot'):
+            snapshot, stale = snapshots.get_snapshot(course, user.id)
+        if snapshot is not None:
+            data = snapshots.snapshot_payload(snapshot, stale, summary)
+            expires = None if summary else snapshot.scores_expire
+            if not stale:
+                cache.set_student_data(course, user.id, data, variant, expires, etag)
+                return data, expires
+            if settings.EOL_PROGRESS_TAB_SNAPSHOT_SERVE_STALE:
+                # stale while revalidate
+                tasks.enqueue_student_snapshot(course.id, user.id)
+                # already expired: served without validators (see _conditional_response)
+                return data, timezone.now()
+
+    def compute():
+        data, expires = grades.build_student_data_json(user, course, summary=summary)
+        if snapshots.is_enabled() and not summary:
+            snapshots.save_snapshot(course, user.id, data, expires)
+        with instrumentation.phase('cache'):
+            cache.set_student_data(course, user.id, data, variant, expires, etag)
+        return data, expires
+    # concurrent requests of the same student share the computation
+    return cache.single_flight('student_data.{}.{}.{}'.format(variant, course.id, user.id), compute)
+
+def _get_student_data_compact_json(user, course, since=None, structure_version=None, etag=None):
+    """
+        (compact student data json payload (see compact.py), scores_expire), only changed
+        subsections when the client sends its payload version (since)
+    """
+    with instrumentation.phase('cache'):
+        data, expires = cache.get_student_data_entry(course, user.id, compact.FORMAT, etag)
+    if data is None:
+        data, expires = cache.single_flight(
+            'student_data.{}.{}.{}'.format(compact.FORMAT, course.id, user.id),
+            lambda: _build_student_data_compact_json(user, course, etag)
+        )
+    if since is None and structure_version is None:
+        return data, expires
+    payload = compact.client_payload(json.loads(data), course.id, user.id, since, structure_version)
+    with instrumentation.phase('serialize'):
+        return serializers.dumps(payload), expires
+
+def _build_student_data_compact_json(user, course, etag=None):
+    """
+        Compute and cache the compact payload (with structure, without client versions)
+    """
+    now = timezone.now()
+    structure = get_course_structure(course)
+    with instrumentation.phase('grades'):
+        course_grade = CourseGradeFactory().read(user, course)
+    student_data = grades.get_student_data(user, course, course_grade, summary=True)
+    expires = grades.get_scores_expiry(course_grade, now)
+    with instrumentation.phase('compact'):
+        payload = compact.build_payload(
+            student_data, course_grade, structure, cache.get_course_version(course),
+            lambda show_correctness, due: grades.show_problem_scores(show_correctness, due, now)
+        )
+        payload['scores_expire'] = expires
+        compact.save_version(course.id, user.id, payload)
+    with instrumentation.phase('serialize'):
+        data = serializers.dumps(payload)
+    with instrumentation.phase('cache'):
+        cache.set_student_data(course, user.id, data, compact.FORMAT, expires, etag)
+    return data, expires
+
+@instrumentation.instrumented('category_detail')
+def get_category_detail(request, course_id, user_id, category):
+    """
+        Subsections (and problem scores) of one category, paginated by subsection.
+        Params: page (default 1), page_size (default EOL_PROGRESS_TAB_DETAIL_PAGE_SIZE)
+    """
+    user_id = int(user_id)
+    access = get_access_context(request, course_id)
+    user = access.get_user(user_id)
+    course = access.get_course(user)
+    if( not _has_page_access(access)
+        or (user_id != request.user.id and not access.is_staff()) ):
+        raise Http404()
+    try:
+        page_number = int(request.GET.get('page', 1))
+        page_size = min(int(request.GET.get('page_size', settings.EOL_PROGRESS_TAB_DETAIL_PAGE_SIZE)), settings.EOL_PROGRESS_TAB_DETAIL_MAX_PAGE_SIZE)
+    except ValueError:
+        return HttpResponseBadRequest('Invalid page/page_size')
+    if page_size < 1:
+        return HttpResponseBadRequest('Invalid page_size')
+
+    category = category.upper()
+    data = cache.get_student_data(course, user.id)
+    detail = None
+    if data is not None:
+        # full payload already computed (only grader categories)
+        detail = next(
+            (grade['detail'] for grade in json.loads(data)['category_grades'] if grade['category'].upper() == category),
+            None
+        )
+    if detail is None:
+        with instrumentation.phase('grades'):
+            course_grade = CourseGradeFactory().read(user, course)
+        with instrumentation.phase('detail'):
+            detail = grades.get_category_scores_detail(course_grade, course.id, get_course_structure(course), category).get(category, [])
+    paginator = Paginator(detail, page_size)
+    if page_number < 1 or (page_number > paginator.num_pages):
+        raise Http404()
+    page = paginator.page(page_number)
+    access.log_counters('category_detail')
+    return JsonPayloadResponse({
+        'category'  : category.title(),
+        'count'     : paginator.count,
+        'page'      : page_number,
+        'num_pages' : paginator.num_pages,
+        'results'   : list(page.object_list),
+    })
+
+def get_bulk_student_data(request, course_id):
+    """
+        Staff only. Stream student data (NDJSON, one student per line) of
+        enrolled students filtered by user_ids (comma separated), cohort and/or enrollment mode.
+    """
+    access = get_access_context(request, course_id)
+    if not access.is_staff():
+        raise Http404()
+    params = request.POST if request.method == 'POST' else request.GET
+    try:
+        user_ids = [int(user_id) for user_id in params.get('user_ids', '').split(',') if user_id.strip()]
+    except ValueError:
+        return HttpResponseBadRequest('Invalid user_ids')
+    users = grades.get_course_users(access.course_key, user_ids, params.get('cohort'), params.get('mode'))
+    course = access.course
+    access.log_counters('bulk_student_data')
+    response = StreamingHttpResponse(
+        (
+            serializers.dumps(data) + '\n'
+            for user, data in grades.iter_student_data(course, users)
+        ),
+        content_type='application/x-ndjson'
+    )
+    return response
+
+def export_scaled_grades(request, course_id):
+    """
+        Staff only. Stream final and category scaled grades of all active enrollments.
+        Params:
+            format: csv (default) or ndjson
+            after: resume export after this user id (rows are ordered by user id)
+            batch_size: users per grade batch
+    """
+    access = get_access_context(request, course_id)
+    if not access.is_staff():
+        raise Http404()
+    export_format = request.GET.get('format', 'csv')
+    try:
+        after = int(request.GET.get('after', 0))
+        batch_size = int(request.GET.get('batch_size', settings.EOL_PROGRESS_TAB_BULK_BATCH_SIZE))
+    except ValueError:
+        return HttpResponseBadRequest('Invalid after/batch_size')
+    if export_format not in grades.SCALED_GRADES_FORMATS or batch_size < 1:
+        return HttpResponseBadRequest('Invalid format/batch_size')
+    course = access.course
+    users = grades.get_course_users(access.course_key).filter(pk__gt=after)
+    rows = grades.iter_scaled_grades(course, users, batch_size)
+    content_type, serializer = grades.SCALED_GRADES_FORMATS[export_format]
+    response = StreamingHttpResponse(serializer(rows, course), content_type=content_type)
+    response['Content-Disposition'] = 'attachment; filename="scaled_grades_{}.{}"'.format(
+        text_type(course.id).replace(':', '_').replace('+', '_'), export_format)
+    access.log_counters('export_scaled_grades')
+    return response
+
+@instrumentation.instrumented('course_info')
 def get_course_info(request, course_id):
     """
         Get course info related to dates and grades
     """
-    if(not _has_page_access(request.user, course_id)):
-        raise Http404()
-    course_key = CourseKey.from_string(course_id)
-    course = get_course_with_access(request.user, "load", course_key)
+    access = get_access_context(request, course_id)
+    with instrumentation.phase('access'):
+        if(not _has_page_access(access)):
+            raise Http404()
+        course = access.course
+    etag, last_modified = _get_course_info_version(course)
+    response = _conditional_response(request, etag, last_modified, lambda: (_get_course_info_json(request, course), None))
+    access.log_counters('course_info')
+    return response
+
+@instrumentation.instrumented('overview')
+def get_progress_overview(request):
+    """
+        Final scaled grade, pass and certificate status of the request user in all the active
+        enrollments with the progress tab enabled. Courses are computed concurrently (see overview.py),
+        courses not computed in time are returned with status 'timeout' (or 'error') and no grades.
+    """
+    user = request.user
+    course_keys = CourseEnrollment.objects.filter(
+        user=user,
+        is_active=True
+    ).order_by('created').values_list('course_id', flat=True)
+    courses = []
+    for course_key, status, course_overview in overview.map_courses(
+        lambda course_key: _get_course_overview(user, course_key),
+        course_keys
+    ):
+        if status == overview.OK and course_overview is None:
+            continue # tab not enabled
+        courses.append(dict(course_overview or {'course_id': text_type(course_key)}, status=status))
+    response = JsonPayloadResponse(serializers.dumps({'courses': courses}))
+    patch_cache_control(response, private=True, max_age=0, must_revalidate=True)
+    return response
+
+def _get_course_overview(user, course_key):
+    """
+        Course grades summary of the user (cached summary student_data), None if the tab is not enabled
+    """
+    course = get_course_by_id(course_key)
+    if not EolProgressTab.is_enabled(course, user):
+        return None
+    student_data = json.loads(_get_student_data_json(user, course, summary=True))
+    return {
+        'course_id'             : text_type(course_key),
+        'display_name'          : course.display_name_with_default,
+        'final_grade_percent'   : student_data['final_grade_percent'],
+        'final_grade_scaled'    : student_data['final_grade_scaled'],
+        'passed'                : student_data['passed'],
+        'certificate_status'    : student_data['certificate_data'].get('status'),
+    }
 
+@instrumentation.instrumented('grading_policy')
+def get_grading_policy(request, course_id):
+    """
+        Course grading policy (grader categories, cutoffs & grade scale) to recompute
+        the grades of what-if scenarios on the client (see grading.compute_course_grade)
+    """
+    access = get_access_context(request, course_id)
+    with instrumentation.phase('access'):
+        if(not _has_page_access(access)):
+            raise Http404()
+        course = access.course
+    etag, last_modified = _get_course_info_version(course)
+    response = _conditional_response(
+        request, cache.make_etag('grading_policy', etag), last_modified, lambda: (_get_grading_policy_json(course), None))
+    access.log_counters('grading_policy')
+    return response
+
+def _get_grading_policy_json(course):
+    """
+        Grading policy json payload (changes only on course publish or grade scale change)
+    """
+    structure = get_course_structure(course)
+    return serializers.dumps(build_grading_policy(course, get_subsections_by_format(structure), get_grade_scale()))
+
+def _conditional_response(request, etag, last_modified, get_data):
+    """
+        304 Not Modified if the client version matches (If-None-Match/If-Modified-Since),
+        otherwise build the payload with get_data() -> (payload, expires).
+        Browsers must revalidate (private, see _patch_cache_control).
+    """
+    if etag is None:
+        data, expires = get_data()
+        response = JsonPayloadResponse(data)
+        _patch_cache_control(response, expires)
+        return response
+    last_modified_timestamp = calendar.timegm(last_modified.utctimetuple()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified_timestamp)
+    expires = None
+    if response is None:
+        data, expires = get_data()
+        response = JsonPayloadResponse(data)
+        if expires is not None and expires <= timezone.now():
+            # stale payload (snapshot being refreshed): the ETag is of the current version, a
+            # revalidation must not get a 304 and keep it
+            _patch_cache_control(response, expires)
+            return response
+    response['ETag'] = etag
+    if last_modified_timestamp is not None:
+        response['Last-Modified'] = http_date(last_modified_timestamp)
+    _patch_cache_control(response, expires, response.status_code == 304)
+    return response
+
+def _patch_cache_control(response, expires=None, revalidate=False):
+    """
+        Private responses, reused by the browser up to EOL_PROGRESS_TAB_MAX_AGE seconds but
+        never after expires (next problem scores visibility change). revalidate: max-age=0
+    """
+    max_age = 0 if revalidate else settings.EOL_PROGRESS_TAB_MAX_AGE
+    if expires is not None:
+        max_age = max(min(max_age, int((expires - timezone.now()).total_seconds())), 0)
+    patch_cache_control(response, private=True, max_age=max_age, must_revalidate=True)
+
+def _latest(*dates):
+    """
+        Latest not None date
+    """
+    dates = [date for date in dates if date is not None]
+    return max(dates) if dates else None
+
+def _get_course_info_version(course):
+    """
+        course_info ETag & Last-Modified: changes only on course publish (or grade scale change)
+    """
+    last_modified = getattr(course, 'subtree_edited_on', None) or getattr(course, 'edited_on', None)
+    return cache.make_etag('course_info', course.id, cache.get_course_version(course), get_grade_scale(), last_modified), last_modified
+
+def _get_course_info_json(request, course):
+    """
+        Course info json payload
+    """
     grade_cutoff = min(course.grade_cutoffs.values())
     min_grade_approval = _grade_percent_scaled(grade_cutoff, grade_cutoff)
     course_start_date, course_end_date = _get_course_dates(course)
@@ -154,126 +493,76 @@ def get_course_info(request, course_id):
         'display_name'      : course.display_name_with_default
     }
 
-    data = json.dumps(course_info, default=json_util.default)
-    return HttpResponse(data)
+    return serializers.dumps(course_info)
 
-
-def _has_page_access(user, course_id):
+def get_grade_statistics(request, course_id):
     """
-        Check if tab is enabled and user is enrolled
-    """ 
-    course_key = CourseKey.from_string(course_id)
-    course = get_course_with_access(user, "load", course_key)
-
-    if bool(has_access(user, 'staff', course)):
-        return True # Allow page access to staff
-    
-    tabs = get_course_tab_list(user, course)
-    tabs_list = [tab.tab_id for tab in tabs]
-    if 'eol_progress_tab' not in tabs_list:
-        return False
-
-    return User.objects.filter(
-        courseenrollment__course_id=course_key,
-        courseenrollment__is_active=1,
-        pk = user.id
-    ).exists()
-
-def _get_category_scores_detail(course_grade, course_key):
-    """
-        Get subsections by category_grade with their respective problem scores
-    """
-    graded_subsections_by_format = course_grade.graded_subsections_by_format
-    category_scores_detail = {}
-
-    # subsection by format (category_grades)
-    for key, values in graded_subsections_by_format.items():
-        # a category_grade can be in more than one subsection
-        for subsection in itervalues(values):
-            show_problem_scores_value = _show_problem_scores(subsection.show_correctness, subsection.due)
-            subsection_data = {
-                'subsection_display_name'   : subsection.display_name,
-                'url'                       : _get_subsection_url(subsection.location, course_key),
-                'total_earned'              : subsection.graded_total.earned, # only graded scores
-                'total_possible'            : subsection.graded_total.possible, # only graded scores
-                'total_percent'             : around(subsection.graded_total.earned / subsection.graded_total.possible, decimals=2),
-                'due'                       : _format_date(subsection.due),
-                'attempted'                 : subsection.graded_total.first_attempted is not None,
-                'show_problem_scores'       : show_problem_scores_value,
-                'problem_scores'            : [
-                    {
-                        'earned'            : score.earned,
-                        'possible'          : score.possible
-                    }
-                    for score in subsection.problem_scores.values() if score.graded # only graded scores
-                ] if show_problem_scores_value else []
-            }
-            category_scores_detail.setdefault(subsection.format.upper(),[]).append(subsection_data)
-    return category_scores_detail
-
-
-def _show_problem_scores(show_correctness, due):
-    """
-        Show problem scores
-            show_correctness values:
-                'always'
-                'past_due'
-                'never'
-    """
-    if show_correctness == 'always':
-        return True
-    elif show_correctness == 'past_due':
-        return due is None or timezone.now() > due
-    # show_correctness == 'never'
-    return False
-
-def _get_subsection_url(location, course_key):
-    """
-        URL Redirect to specific location in the course
-    """
-    return reverse(
-        'jump_to', 
-        kwargs=dict(
-            course_id=text_type(course_key),
-            location=text_type(location)
-        )
-    )
-
-def _get_certificate_data(user, course, enrollment_mode, course_grade):
-    """
-        Get student certificate url and messages.
-    """
-    certificate_data = get_cert_data(user, course, enrollment_mode, course_grade)
-    if certificate_data:
-        request_method = "GET"
-        if certificate_data.cert_web_view_url:
-            url = certificate_data.cert_web_view_url
-            button_msg = "Ver Certificado"
-        elif certificate_data.cert_status == CertificateStatuses.downloadable and certificate_data.download_url:
-            url = certificate_data.download_url
-            button_msg = "Descargar Certificado"
-        elif certificate_data.cert_status == CertificateStatuses.requesting:
-            url = reverse('generate_user_cert', args=[text_type(course.id)])
-            button_msg = "Solicitar Certificado"
-            request_method = "POST"
-        else:
-            url = "#"
-            button_msg = "Certificado No Disponible"
-        return {
-            'url'           : url,
-            'title'         : text_type(certificate_data.title),
-            'msg'           : text_type(certificate_data.msg),
-            'button_msg'    : button_msg,
-            'button_method' : request_method
-        }
+        Distribution of final and category scaled grades.
+        Staff always; students only if EOL_PROGRESS_TAB_STATS_STUDENT_VISIBLE (anonymized).
+    """
+    access = get_access_context(request, course_id)
+    if(not _has_page_access(access)):
+        raise Http404()
+    is_staff = access.is_staff()
+    if not is_staff and not configuration_helpers.get_value('EOL_PROGRESS_TAB_STATS_STUDENT_VISIBLE', settings.EOL_PROGRESS_TAB_STATS_STUDENT_VISIBLE):
+        raise Http404()
+    statistics = stats.get_grade_statistics(access.course)
+    if not is_staff:
+        statistics = stats.anonymize(statistics)
+    access.log_counters('grade_statistics')
+    return JsonPayloadResponse(statistics)
+
+@require_POST
+def start_regrade(request, course_id):
+    """
+        Staff only. Enqueue a grade recompute of one student (user_id) or the whole course.
+        Returns the task_id to poll with get_regrade_status.
+    """
+    access = get_access_context(request, course_id)
+    if not access.is_staff():
+        raise Http404()
+    user_id = request.POST.get('user_id')
+    if user_id:
+        try:
+            user_ids = list(grades.get_course_users(access.course_key, [int(user_id)]).values_list('id', flat=True))
+        except ValueError:
+            return HttpResponseBadRequest('Invalid user_id')
+        if not user_ids:
+            return HttpResponseBadRequest('user_id without an active enrollment')
     else:
-        return { }
+        user_ids = list(grades.get_course_users(access.course_key).values_list('id', flat=True))
+    task_id = tasks.start_regrade(access.course_key, user_ids)
+    return JsonPayloadResponse({'task_id': task_id, 'total': len(user_ids)})
 
-def _prominent_section_filter(elem):
+def get_regrade_status(request, course_id, task_id):
     """
-        Filter only average grades
+        Staff only. Regrade progress (total, done, failed, status).
+        When a single student regrade finishes the fresh student data is included.
     """
-    return 'prominent' in elem
+    access = get_access_context(request, course_id)
+    if not access.is_staff():
+        raise Http404()
+    progress = cache.get_regrade_progress(task_id)
+    if progress is None or progress['course_id'] != text_type(access.course_key):
+        raise Http404()
+    finished = progress['done'] + progress['failed'] >= progress['total']
+    status = {
+        'task_id'   : task_id,
+        'total'     : progress['total'],
+        'done'      : progress['done'],
+        'failed'    : progress['failed'],
+        'status'    : 'finished' if finished else 'in_progress',
+    }
+    if finished and progress['user_id'] is not None and progress['done'] == 1:
+        user = access.get_user(progress['user_id'])
+        status['student_data'] = json.loads(_get_student_data_json(user, access.get_course(user)))
+    return JsonPayloadResponse(status)
+
+def _has_page_access(access):
+    """
+        Check if tab is enabled, user is enrolled and can skip the entrance exam
+    """ 
+    return access.has_page_access()
 
 def _get_course_dates(course):
     """
@@ -289,17 +578,8 @@ def _get_course_dates(course):
 
     return course_start_date, course_end_date
 
-def _format_date(date):
-    if not isinstance(date, string_types) and date is not None:
-        date = date.strftime('%Y-%m-%dT%H:%M:%S%z')
-    return date
-
-def _grade_percent_scaled(grade_percent, grade_cutoff):
+def _grade_percent_scaled(grade_percent, grade_cutoff, scale=None):
     """
-        Scale grade percent by grade cutoff. Grade between 1.0 - 7.0
+        Scale grade percent by grade cutoff. Grade between 1.0 - 7.0 (site grade scale)
     """
-    if grade_percent == 0.:
-        return 1.
-    if grade_percent < grade_cutoff:
-        return min(round(10. * (3. / grade_cutoff * grade_percent + 1.)) / 10., 3.9)
-    return round((3. / (1. - grade_cutoff) * grade_percent + (7. - (3. / (1. - grade_cutoff)))) * 10.) / 10.
+    return grade_percent_scaled(grade_percent, grade_cutoff, scale or get_grade_scale())
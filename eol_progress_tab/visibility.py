@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+from django.conf import settings
+from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
+from openedx.core.djangoapps.theming.helpers import get_current_site
+
+from . import cache
+
+import logging
+logger = logging.getLogger(__name__)
+
+TAB_TYPE = 'eol_progress_tab'
+
+
+def _get_site_id():
+    site = get_current_site()
+    return getattr(site, 'id', None)
+
+
+def is_site_enabled():
+    """
+        EOL_PROGRESS_TAB_ENABLED of the current site configuration.
+        Cached per site until the site configuration is saved.
+    """
+    site_id = _get_site_id()
+    enabled = cache.get_site_value(site_id, 'site_enabled')
+    if enabled is None:
+        enabled = bool(configuration_helpers.get_value('EOL_PROGRESS_TAB_ENABLED', False))
+        cache.set_site_value(site_id, 'site_enabled', enabled, settings.EOL_PROGRESS_TAB_VISIBILITY_TIMEOUT)
+    return enabled
+
+
+def is_tab_visible(course):
+    """
+        Check if the progress tab is enabled on the site and displayed in the course
+        (included in course tabs and not hidden by 'eol_visible'), the course level part of
+        get_course_tab_list without evaluating every course tab.
+        User checks (enrollment, staff and entrance exam) are done by the caller (see access.ProgressTabAccess).
+        Cached per site, course version and site configuration generation.
+    """
+    site_id = _get_site_id()
+    name = 'tab_visible.{}.{}'.format(site_id, cache.get_site_generation(site_id))
+    visible = cache.get_course_value(course, name)
+    if visible is None:
+        visible = _resolve_tab_visibility(course)
+        cache.set_course_value(course, name, visible, settings.EOL_PROGRESS_TAB_VISIBILITY_TIMEOUT)
+    return visible
+
+
+def _resolve_tab_visibility(course):
+    """
+        Progress tab configured in the course and not hidden, and enabled on the site
+    """
+    tab = next((tab for tab in course.tabs if tab.type == TAB_TYPE), None)
+    if tab is None or tab.is_hidden:
+        return False
+    return is_site_enabled()
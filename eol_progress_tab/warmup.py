@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+from django.conf import settings
+from six import text_type
+
+from courseware.courses import get_course_by_id
+from lms.djangoapps.grades.models import PersistentCourseGrade
+from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
+
+from .structure import get_course_structure
+from .grades import get_course_users, iter_batches, iter_student_data
+
+import time
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+def get_recent_students(course_key, limit):
+    """
+        User ids of the students with the latest grade updates (most recently active), active enrollments only
+    """
+    user_ids = PersistentCourseGrade.objects.filter(
+        course_id=course_key
+    ).order_by('-modified').values_list('user_id', flat=True)[:limit]
+    return list(get_course_users(course_key, list(user_ids)).values_list('id', flat=True))
+
+
+def warm_up_course(course_key, students=0, rate=None, batch_size=None):
+    """
+        Pre-populate the course caches after a publish: course descriptor, block structure
+        (course grades), graded subsections structure and, optionally, the student_data
+        payloads of the `students` most recently active students.
+        rate: max students per second (sleeps between batches, keeps workers available)
+        Returns the number of student payloads warmed.
+    """
+    rate = settings.EOL_PROGRESS_TAB_WARMUP_RATE if rate is None else rate
+    batch_size = batch_size or settings.EOL_PROGRESS_TAB_BULK_BATCH_SIZE
+    course = get_course_by_id(course_key)
+    get_block_structure_manager(course_key).get_collected()
+    get_course_structure(course)
+    warmed = 0
+    if students > 0:
+        user_ids = get_recent_students(course_key, students)
+        for batch in iter_batches(iter(user_ids), batch_size):
+            started = time.time()
+            for __ in iter_student_data(course, get_course_users(course_key, batch), batch_size):
+                warmed += 1
+            if rate:
+                # rate limit: a batch can't take less than len(batch) / rate seconds
+                time.sleep(max(0, len(batch) / float(rate) - (time.time() - started)))
+    logger.info("EolProgressTab - Course caches warmed up: %s (%s students)", text_type(course_key), warmed)
+    return warmed
@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+"""
+    Load-test harness of the progress tab views with an in-memory stand-in of the
+    Open edX grading stack (see run.py)
+"""
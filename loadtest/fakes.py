@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+"""
+    In-memory stand-in of the Open edX modules imported by the progress tab:
+    modulestore, course descriptors, CourseGradeFactory (large deterministic grade
+    structures), get_course_with_access, get_cert_data, site configuration...
+    install() must run before django.setup() and before importing eol_progress_tab.
+"""
+
+from collections import OrderedDict, namedtuple
+from datetime import timedelta
+from importlib import import_module
+
+import random
+import sys
+import threading
+import types
+
+FORMATS = ('Homework', 'Lab', 'Quiz', 'Control', 'Midterm Exam', 'Final Exam')
+# site configuration values (configuration_helpers.get_value)
+SITE_CONFIGURATION = {'EOL_PROGRESS_TAB_ENABLED': True}
+
+Score = namedtuple('Score', ['earned', 'possible', 'graded'])
+AggregatedScore = namedtuple('AggregatedScore', ['earned', 'possible', 'first_attempted'])
+CertData = namedtuple('CertData', ['cert_status', 'title', 'msg', 'download_url', 'cert_web_view_url'])
+Grader = namedtuple('Grader', ['drop_count', 'min_count'])
+CourseGrader = namedtuple('CourseGrader', ['subgraders'])
+Tab = namedtuple('Tab', ['type', 'tab_id', 'is_hidden'])
+
+
+def _now():
+    from django.utils import timezone
+    return timezone.now()
+
+
+class Sequential(object):
+    """
+        Graded subsection descriptor (modulestore item)
+    """
+
+    def __init__(self, location, display_name, assignment_type, due, show_correctness):
+        self.location = location
+        self.display_name = display_name
+        self.format = assignment_type
+        self.due = due
+        self.show_correctness = show_correctness
+        self.graded = True
+        self.visible_to_staff_only = False
+        self.group_access = {}
+
+
+class Chapter(object):
+    """
+        Course section with the graded subsections
+    """
+
+    def __init__(self, location, sequentials):
+        self.location = location
+        self.sequentials = sequentials
+        self.visible_to_staff_only = False
+        self.group_access = {}
+
+    def get_children(self):
+        return list(self.sequentials)
+
+
+class Course(object):
+    """
+        Course descriptor with `subsections` graded subsections of `problems` problems,
+        distributed over FORMATS (half of the due dates in the past)
+    """
+
+    def __init__(self, course_key, subsections, problems):
+        now = _now()
+        self.id = course_key
+        self.location = course_key.make_usage_key('course', 'course')
+        self.display_name_with_default = 'Load test {}x{}'.format(subsections, problems)
+        self.grade_cutoffs = {'Pass': 0.5}
+        self.grader = CourseGrader([
+            (Grader(drop_count=1, min_count=subsections // len(FORMATS)), assignment_type, 1. / len(FORMATS))
+            for assignment_type in FORMATS
+        ])
+        self.start = now - timedelta(days=subsections // 2 + 1)
+        self.end = now + timedelta(days=subsections)
+        self.advertised_start = None
+        self.start_date_is_still_default = False
+        self.course_version = 'loadtest'
+        self.edited_on = self.subtree_edited_on = self.start
+        self.tabs = [Tab('eol_progress_tab', 'eol_progress_tab', False)]
+        self.problems = problems
+        self.sequentials = [
+            Sequential(
+                course_key.make_usage_key('sequential', 'sequential_{}'.format(index)),
+                'Subsection {}'.format(index),
+                FORMATS[index % len(FORMATS)],
+                self.start + timedelta(days=index),
+                ('always', 'past_due')[index % 2]
+            )
+            for index in range(subsections)
+        ]
+
+    def get_children(self):
+        return [Chapter(self.id.make_usage_key('chapter', 'chapter'), self.sequentials)]
+
+
+class ModuleStore(object):
+    def __init__(self):
+        self.courses = {}
+
+    def add_course(self, course):
+        self.courses[course.id] = course
+
+    def get_course(self, course_key, depth=0, **kwargs):  # pylint: disable=unused-argument
+        return self.courses.get(course_key)
+
+
+MODULESTORE = ModuleStore()
+
+
+def modulestore():
+    return MODULESTORE
+
+
+def get_course_by_id(course_key, depth=0):  # pylint: disable=unused-argument
+    from django.http import Http404
+    course = MODULESTORE.get_course(course_key)
+    if course is None:
+        raise Http404()
+    return course
+
+
+def get_course_with_access(user, action, course_key, depth=0, check_if_enrolled=False, check_survey_complete=True):  # pylint: disable=unused-argument
+    return get_course_by_id(course_key)
+
+
+def has_access(user, action, obj, course_key=None):  # pylint: disable=unused-argument
+    return user.is_staff
+
+
+class SubsectionGrade(object):
+    def __init__(self, sequential, problem_scores, first_attempted):
+        self.location = sequential.location
+        self.display_name = sequential.display_name
+        self.format = sequential.format
+        self.due = sequential.due
+        self.show_correctness = sequential.show_correctness
+        self.problem_scores = problem_scores
+        self.graded_total = AggregatedScore(
+            sum(score.earned for score in problem_scores.values()),
+            sum(score.possible for score in problem_scores.values()),
+            first_attempted
+        )
+
+
+class CourseGrade(object):
+    def __init__(self, percent, passed, summary, graded_subsections_by_format):
+        self.percent = percent
+        self.passed = passed
+        self.summary = summary
+        self.graded_subsections_by_format = graded_subsections_by_format
+
+
+def build_course_grade(user_id, course):
+    """
+        Deterministic grade of a user (same structure as lms CourseGrade: subsections by format,
+        problem scores and section_breakdown with category averages)
+    """
+    rng = random.Random(user_id)
+    skill = rng.uniform(.2, 1.)
+    now = _now()
+    graded_subsections_by_format = OrderedDict()
+    section_breakdown = []
+    for sequential in course.sequentials:
+        attempted = sequential.due < now
+        problem_scores = OrderedDict(
+            (
+                course.id.make_usage_key('problem', '{}_{}'.format(sequential.location.block_id, index)),
+                Score(float(attempted and rng.random() < skill), 1., True)
+            )
+            for index in range(course.problems)
+        )
+        subsection = SubsectionGrade(sequential, problem_scores, now if attempted else None)
+        graded_subsections_by_format.setdefault(sequential.format, OrderedDict())[sequential.location] = subsection
+        section_breakdown.append({
+            'category'  : sequential.format,
+            'label'     : sequential.display_name,
+            'percent'   : subsection.graded_total.earned / subsection.graded_total.possible,
+            'detail'    : sequential.display_name,
+        })
+    percent = 0.
+    for grader, assignment_type, weight in course.grader.subgraders:
+        percents = [
+            subsection.graded_total.earned / subsection.graded_total.possible
+            for subsection in graded_subsections_by_format.get(assignment_type, {}).values()
+        ]
+        category_percent = sum(percents) / len(percents) if percents else 0.
+        percent += category_percent * weight
+        section_breakdown.append({
+            'category'  : assignment_type,
+            'label'     : '{} Avg'.format(assignment_type),
+            'percent'   : category_percent,
+            'detail'    : '{} Average = {:.0%}'.format(assignment_type, category_percent),
+            'prominent' : True,
+        })
+    percent = round(percent, 2)
+    return CourseGrade(
+        percent,
+        percent >= min(course.grade_cutoffs.values()),
+        {'percent': percent, 'section_breakdown': section_breakdown},
+        graded_subsections_by_format
+    )
+
+
+class CourseGradeFactory(object):
+    """
+        Grades are built once per user and course (like persisted grades) and shared by threads
+    """
+    _grades = {}
+    _lock = threading.Lock()
+
+    def read(self, user=None, course=None, collected_block_structure=None, course_key=None, create_if_needed=True):  # pylint: disable=unused-argument
+        course = course or get_course_by_id(course_key)
+        key = (user.id, course.id)
+        grade = self._grades.get(key)
+        if grade is None:
+            grade = build_course_grade(user.id, course)
+            with self._lock:
+                self._grades[key] = grade
+        return grade
+
+    def iter(self, users, course=None, collected_block_structure=None, course_key=None, force_update=False):  # pylint: disable=unused-argument
+        for user in users:
+            yield user, self.read(user, course, course_key=course_key), None
+
+    def update(self, user, course=None, course_key=None, **kwargs):  # pylint: disable=unused-argument
+        return self.read(user, course, course_key=course_key)
+
+
+def get_cert_data(student, course, enrollment_mode, course_grade=None):  # pylint: disable=unused-argument
+    """
+        Downloadable certificate for passing students
+    """
+    if course_grade is None or not course_grade.passed:
+        return None
+    return CertData(
+        'downloadable',
+        'Your certificate is available',
+        'You can keep working for a higher grade, or request your certificate now.',
+        '/certificates/{}/{}'.format(student.id, course.id),
+        None
+    )
+
+
+class CertificateStatuses(object):
+    downloadable = 'downloadable'
+    requesting = 'requesting'
+    unavailable = 'unavailable'
+
+
+def round_away_from_zero(number, digits=0):
+    """
+        openedx.core.lib.grade_utils.round_away_from_zero
+    """
+    multiplier = 10.0 ** digits
+    if number >= 0:
+        return float(int((number * multiplier) + 0.5)) / multiplier
+    return float(int((number * multiplier) - 0.5)) / multiplier
+
+
+def get_value(name, default=None, site=None):  # pylint: disable=unused-argument
+    return SITE_CONFIGURATION.get(name, default)
+
+
+def _module(name, **attributes):
+    """
+        Register (or update) a fake module and its parents in sys.modules
+    """
+    module = sys.modules.get(name)
+    if module is None:
+        module = types.ModuleType(name)
+        module.__path__ = []
+        sys.modules[name] = module
+        parent, __, child = name.rpartition('.')
+        if parent:
+            setattr(_module(parent), child, module)
+    module.__dict__.update(attributes)
+    return module
+
+
+def _models_module(name, *model_names):
+    """
+        Fake module whose models are loaded from loadtest.models on first access (after django.setup)
+    """
+    def __getattr__(attribute):
+        if attribute in model_names:
+            return getattr(import_module('loadtest.models'), attribute)
+        raise AttributeError(attribute)
+    return _module(name, __getattr__=__getattr__)
+
+
+def _installed(name):
+    try:
+        import_module(name)
+    except ImportError:
+        return False
+    return True
+
+
+def _shared_task(*args, **kwargs):  # pylint: disable=unused-argument
+    """
+        celery.shared_task replacement (eager)
+    """
+    def decorator(function):
+        function.delay = function
+        function.apply_async = lambda args=(), kwargs=None, **options: function(*args, **(kwargs or {}))
+        return function
+    return decorator
+
+
+def install():
+    """
+        Register the fake Open edX modules (and celery/pymongo when not installed)
+    """
+    from django.dispatch import Signal
+    from django.views.generic import View
+
+    class EdxFragmentView(View):
+        pass
+
+    class Fragment(object):
+        def __init__(self, content=None):
+            self.content = content
+
+    class SignalHandler(object):
+        course_published = Signal()
+
+    class EnrolledTab(object):
+        def __init__(self, tab_dict):
+            self.tab_dict = tab_dict
+
+        @classmethod
+        def is_enabled(cls, course, user=None):  # pylint: disable=unused-argument
+            return user is not None and user.is_authenticated
+
+        def to_json(self):
+            return {'type': self.type}
+
+    _module('courseware.access', has_access=has_access)
+    _module('courseware.courses', get_course_by_id=get_course_by_id, get_course_with_access=get_course_with_access)
+    _module('courseware.entrance_exams', user_can_skip_entrance_exam=lambda user, course: True)
+    _module('courseware.tabs', EnrolledTab=EnrolledTab)
+    _module('courseware.masquerade', setup_masquerade=lambda request, course_key, staff_access, **kwargs: (None, request.user))
+    _module('lms.djangoapps.courseware.courses',
+            get_course_about_section=lambda request, course, section_key: '4 hours per week',
+            get_course_by_id=get_course_by_id,
+            get_studio_url=lambda course, page: None)
+    _module('lms.djangoapps.courseware.permissions', MASQUERADE_AS_STUDENT='courseware.masquerade_as_student')
+    _module('lms.djangoapps.courseware.views.views', get_cert_data=get_cert_data)
+    _models_module('lms.djangoapps.certificates.models', 'GeneratedCertificate', 'CertificateWhitelist')
+    _module('lms.djangoapps.certificates.models', CertificateStatuses=CertificateStatuses)
+    _module('lms.djangoapps.grades.api',
+            prefetch_course_and_subsection_grades=lambda course_key, users: None,
+            clear_prefetched_course_and_subsection_grades=lambda course_key: None)
+    _module('lms.djangoapps.grades.config', should_persist_grades=lambda course_key: False)
+    _module('lms.djangoapps.grades.course_grade_factory', CourseGradeFactory=CourseGradeFactory)
+    _models_module(
+        'lms.djangoapps.grades.models',
+        'PersistentCourseGrade', 'PersistentSubsectionGrade', 'PersistentSubsectionGradeOverride'
+    )
+    _models_module('student.models', 'CourseEnrollment')
+    _module('course_modes.models', CourseMode=type('CourseMode', (object,), {
+        'is_eligible_for_certificate': classmethod(lambda cls, mode_slug, status=None: mode_slug != 'audit'),
+    }))
+    _models_module('openedx.core.djangoapps.course_groups.models', 'CourseUserGroup')
+    _models_module('openedx.core.djangoapps.site_configuration.models', 'SiteConfiguration')
+    _module('openedx.core.djangoapps.site_configuration.helpers', get_value=get_value)
+    _module('openedx.core.lib.grade_utils', round_away_from_zero=round_away_from_zero)
+    _module('openedx.core.djangoapps.theming.helpers', get_current_site=lambda: None)
+    _module('openedx.core.djangoapps.plugin_api.views', EdxFragmentView=EdxFragmentView)
+    _module('web_fragments.fragment', Fragment=Fragment)
+    _module('xmodule.block_metadata_utils', display_name_with_default=lambda block: block.display_name)
+    _module('xmodule.modulestore.django', modulestore=modulestore, SignalHandler=SignalHandler)
+    _module('xmodule.tabs', TabFragmentViewMixin=type('TabFragmentViewMixin', (object,), {}))
+    if not _installed('celery'):
+        _module('celery', shared_task=_shared_task)
+    if not _installed('crum'):
+        _module('crum', get_current_request=lambda: None, set_current_request=lambda request=None: None)
+    if not _installed('pymongo'):
+        _module('pymongo.monitoring', CommandListener=object, register=lambda listener: None)
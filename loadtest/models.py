@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+    Minimal tables of the Open edX models queried by the progress tab
+    (same names and fields used by the plugin, exposed through the fake modules)
+"""
+
+from django.contrib.auth.models import User
+from django.db import models
+from opaque_keys.edx.django.models import CourseKeyField
+
+
+class CourseEnrollment(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    mode = models.CharField(max_length=100, default='audit')
+    is_active = models.BooleanField(default=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        app_label = 'loadtest'
+        unique_together = (('user', 'course_id'),)
+
+    @classmethod
+    def enrollment_mode_for_user(cls, user, course_id):
+        enrollment = cls.objects.filter(user=user, course_id=course_id).values_list('mode', 'is_active').first()
+        return enrollment or (None, None)
+
+
+class CourseUserGroup(models.Model):
+    COHORT = 'cohort'
+
+    users = models.ManyToManyField(User, related_name='course_groups')
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    name = models.CharField(max_length=255)
+    group_type = models.CharField(max_length=20, default=COHORT)
+
+    class Meta:
+        app_label = 'loadtest'
+
+
+class GeneratedCertificate(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    mode = models.CharField(max_length=32, default='honor')
+    status = models.CharField(max_length=32, default='unavailable')
+    modified_date = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = 'loadtest'
+
+
+class CertificateWhitelist(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    whitelist = models.BooleanField(default=False)
+
+    class Meta:
+        app_label = 'loadtest'
+
+
+class PersistentCourseGrade(models.Model):
+    user_id = models.IntegerField(db_index=True)
+    course_id = CourseKeyField(max_length=255)
+    percent_grade = models.FloatField()
+    letter_grade = models.CharField(max_length=255, blank=True)
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = 'loadtest'
+
+
+class PersistentSubsectionGrade(models.Model):
+    user_id = models.IntegerField()
+    course_id = CourseKeyField(max_length=255)
+    usage_key = models.CharField(max_length=255)
+    earned_graded = models.FloatField()
+    possible_graded = models.FloatField()
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = 'loadtest'
+
+
+class PersistentSubsectionGradeOverride(models.Model):
+    grade = models.OneToOneField(PersistentSubsectionGrade, related_name='override', on_delete=models.CASCADE)
+    earned_graded_override = models.FloatField(null=True, blank=True)
+    possible_graded_override = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        app_label = 'loadtest'
+
+
+class SiteConfiguration(models.Model):
+    site_id = models.IntegerField(null=True)
+    enabled = models.BooleanField(default=True)
+
+    class Meta:
+        app_label = 'loadtest'
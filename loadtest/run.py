@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+    Load test of the progress tab endpoints without an Open edX installation.
+
+    The views of eol_progress_tab run on a minimal Django project (sqlite, locmem cache)
+    with the grading stack replaced by in-memory fakes (loadtest/fakes.py). Concurrent
+    clients request every endpoint; throughput, latency percentiles (p50/p95/p99) and
+    peak memory allocated per request (tracemalloc, sequential pass) are reported.
+
+    Requirements (plain Linux machine, Python 3.8):
+        > pip install "django>=2.2,<3" six numpy edx-opaque-keys [orjson]
+
+    Run from the repository root:
+        > python -m loadtest.run --subsections 200 --problems 10 --students 50 --clients 8 --requests 500
+        > python -m loadtest.run --endpoints student_data,student_data_compact --cache --output loadtest.json
+        > python -m loadtest.run --endpoints overview --courses 6 --cache
+"""
+from __future__ import print_function
+
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+COURSE_ID = 'course-v1:eol+loadtest+2021'
+# edx-platform lms/envs/common.py
+COURSE_KEY_PATTERN = r'(?P<course_key_string>[^/+]+(/|\+)[^/+]+(/|\+)[^/?]+)'
+COURSE_ID_PATTERN = COURSE_KEY_PATTERN.replace('course_key_string', 'course_id')
+USAGE_ID_PATTERN = r'(?P<usage_id>(?:i4x://?[^/]+/[^/]+/[^/]+/[^@]+(?:@[^/]+)?)|(?:[^/]+))'
+
+
+def configure(args):
+    """
+        Django settings: plugin settings (settings/common.py) over a minimal project
+    """
+    from django.conf import settings
+    from eol_progress_tab.settings.common import plugin_settings
+
+    plugin = SimpleNamespace()
+    plugin_settings(plugin)
+    plugin.EOL_PROGRESS_TAB_CACHE_TIMEOUT = 3600 if args.cache else 0
+    plugin.EOL_PROGRESS_TAB_FAST_JSON = not args.std_json
+    settings.configure(
+        DEBUG=False,
+        SECRET_KEY='loadtest',
+        ALLOWED_HOSTS=['*'],
+        ROOT_URLCONF='loadtest.urls',
+        USE_TZ=True,
+        INSTALLED_APPS=[
+            'django.contrib.auth',
+            'django.contrib.contenttypes',
+            'django.contrib.sessions',
+            'loadtest',
+            'eol_progress_tab',
+        ],
+        MIDDLEWARE=[
+            'django.contrib.sessions.middleware.SessionMiddleware',
+            'django.contrib.auth.middleware.AuthenticationMiddleware',
+        ],
+        DATABASES={
+            'default': {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': os.path.join(tempfile.mkdtemp(prefix='eol_progress_tab_loadtest'), 'db.sqlite3'),
+            }
+        },
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+        SESSION_ENGINE='django.contrib.sessions.backends.cache',
+        PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+        COURSE_ID_PATTERN=COURSE_ID_PATTERN,
+        USAGE_ID_PATTERN=USAGE_ID_PATTERN,
+        LOGGING_CONFIG=None,
+        **vars(plugin)
+    )
+
+
+def create_data(args):
+    """
+        Fake courses in the modulestore (endpoints use the first one), students enrolled in all of them (real tables)
+    """
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from opaque_keys.edx.keys import CourseKey
+    from loadtest import fakes
+    from loadtest.models import CourseEnrollment
+
+    call_command('migrate', run_syncdb=True, verbosity=0)
+    course_keys = [CourseKey.from_string(COURSE_ID)] + [
+        CourseKey.from_string('course-v1:eol+loadtest{}+2021'.format(index)) for index in range(1, args.courses)
+    ]
+    for course_key in course_keys:
+        fakes.MODULESTORE.add_course(fakes.Course(course_key, args.subsections, args.problems))
+    users = []
+    for index in range(args.students):
+        user = User.objects.create_user('student_{}'.format(index), 'student_{}@loadtest.edu'.format(index), 'loadtest')
+        for course_key in course_keys:
+            CourseEnrollment.objects.create(user=user, course_id=course_key, mode='honor')
+        users.append(user)
+    return course_keys[0], users
+
+
+def get_endpoints(course_key):
+    """
+        {endpoint name: function(user) -> url}
+    """
+    from django.urls import reverse
+    from loadtest.fakes import FORMATS
+
+    def student_url(name, query=''):
+        return lambda user: reverse(name, kwargs={'course_id': course_key, 'user_id': user.id}) + query
+
+    return {
+        'course_info'           : lambda user: reverse('eol_progress_tab_course_info', kwargs={'course_id': course_key}),
+        'student_data'          : student_url('eol_progress_tab_student_data'),
+        'student_data_summary'  : student_url('eol_progress_tab_student_data', '?summary=1'),
+        'student_data_compact'  : student_url('eol_progress_tab_student_data', '?format=compact'),
+        'bootstrap'             : student_url('eol_progress_tab_bootstrap'),
+        'category_detail'       : lambda user: reverse(
+            'eol_progress_tab_category_detail',
+            kwargs={'course_id': course_key, 'user_id': user.id, 'category': FORMATS[0]}
+        ) + '?page=1',
+        'grading_policy'        : lambda user: reverse('eol_progress_tab_grading_policy', kwargs={'course_id': course_key}),
+        'overview'              : lambda user: reverse('eol_progress_tab_overview'),
+    }
+
+
+def _percentile(values, percent):
+    import numpy
+    return float(numpy.percentile(values, percent)) if values else None
+
+
+def _login(user):
+    from django.test import Client
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def run_endpoint(url_for, users, clients, requests):
+    """
+        `requests` requests split over `clients` concurrent clients (students in round robin)
+    """
+    from django.db import close_old_connections
+
+    def worker(index):
+        sessions = {}  # logged in client of each student (per thread)
+        latencies, errors = [], 0
+        for number in range(index, requests, clients):
+            user = users[number % len(users)]
+            if user.id not in sessions:
+                sessions[user.id] = _login(user)
+            started = time.perf_counter()
+            response = sessions[user.id].get(url_for(user))
+            if response.streaming:
+                b''.join(response.streaming_content)
+            latencies.append((time.perf_counter() - started) * 1000.)
+            if response.status_code != 200:
+                errors += 1
+        close_old_connections()
+        return latencies, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        results = list(executor.map(worker, range(clients)))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(latency for worker_latencies, __ in results for latency in worker_latencies)
+    return {
+        'requests'      : len(latencies),
+        'errors'        : sum(errors for __, errors in results),
+        'throughput'    : len(latencies) / elapsed if elapsed else None,  # requests per second
+        'p50_ms'        : _percentile(latencies, 50),
+        'p95_ms'        : _percentile(latencies, 95),
+        'p99_ms'        : _percentile(latencies, 99),
+    }
+
+
+def measure_memory(url_for, users, samples):
+    """
+        Peak memory allocated by one request (KiB, median of sequential samples)
+    """
+    client = _login(users[0])
+    peaks = []
+    for __ in range(samples):
+        tracemalloc.start()
+        response = client.get(url_for(users[0]))
+        if response.streaming:
+            b''.join(response.streaming_content)
+        __, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peaks.append(peak / 1024.)
+    return _percentile(peaks, 50)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Progress tab endpoints load test (in-memory Open edX stand-in)')
+    parser.add_argument('--subsections', type=int, default=100, help='Graded subsections of the course')
+    parser.add_argument('--problems', type=int, default=10, help='Problems per subsection')
+    parser.add_argument('--students', type=int, default=20)
+    parser.add_argument('--courses', type=int, default=1, help='Courses of each student (overview endpoint)')
+    parser.add_argument('--clients', type=int, default=4, help='Concurrent clients')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint')
+    parser.add_argument('--memory-samples', type=int, default=5)
+    parser.add_argument('--endpoints', help='Comma separated endpoint names (default: all)')
+    parser.add_argument('--cache', action='store_true', help='Enable the student_data cache (default: every request computes)')
+    parser.add_argument('--std-json', action='store_true', help='Serialize with json instead of orjson')
+    parser.add_argument('--output', help='Write results as json')
+    args = parser.parse_args(argv)
+
+    configure(args)
+    from loadtest import fakes
+    fakes.install()
+    import django
+    django.setup()
+
+    course_key, users = create_data(args)
+    endpoints = get_endpoints(course_key)
+    names = args.endpoints.split(',') if args.endpoints else list(endpoints)
+    unknown = set(names) - set(endpoints)
+    if unknown:
+        parser.error('Unknown endpoints: {}'.format(', '.join(sorted(unknown))))
+
+    results = {}
+    print('{:<22} {:>8} {:>6} {:>10} {:>9} {:>9} {:>9} {:>10}'.format(
+        'endpoint', 'requests', 'errors', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms', 'peak KiB'))
+    for name in names:
+        result = run_endpoint(endpoints[name], users, args.clients, args.requests)
+        result['peak_kib'] = measure_memory(endpoints[name], users, args.memory_samples)
+        results[name] = result
+        print('{:<22} {requests:>8} {errors:>6} {throughput:>10.1f} {p50_ms:>9.2f} {p95_ms:>9.2f} {p99_ms:>9.2f} {peak_kib:>10.1f}'.format(
+            name, **result))
+    print('max RSS: {:.1f} MiB'.format(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.))
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({
+                'python'    : platform.python_version(),
+                'config'    : vars(args),
+                'results'   : results,
+            }, output, indent=2)
+    return results
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -8,11 +8,14 @@ setuptools.setup(
     description="Eol Student Progress Tab",
     long_description="Student progress tab with scaled grades",
     url="https://eol.uchile.cl",
-    packages=setuptools.find_packages(),
+    packages=setuptools.find_packages(exclude=['loadtest', 'loadtest.*']),
     entry_points={
         "lms.djangoapp": [
             "eol_progress_tab = eol_progress_tab.apps:EolProgressTabConfig",
         ],
+        "cms.djangoapp": [
+            "eol_progress_tab = eol_progress_tab.apps:EolProgressTabCmsConfig",
+        ],
         "openedx.course_tab": [
             "eol_progress_tab = eol_progress_tab.plugins:EolProgressTab",
         ]